@@ -1,8 +1,10 @@
 """
 Orquestador de Agentes - Coordina el flujo entre múltiples agentes.
 """
-from typing import Optional, Dict
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Dict, Any
 import json
+import time
 import asyncio
 from langchain_core.messages import SystemMessage, HumanMessage
 from backend.config.logging_config import get_logger
@@ -13,10 +15,47 @@ from backend.agents.sales_agent import SalesAgent
 from backend.domain.agent_schemas import (
     AgentState,
     AgentResponse,
+    AgentStreamEvent,
     IntentClassification,
     UserStyleProfile,
+    StyleReevaluationPolicy,
+    TurnAnalysis,
 )
 from backend.llm.provider import LLMProvider
+from backend.services.classification_cache import ClassificationCache
+from backend.nlp.intent_model import LocalIntentClassifier
+from backend.nlp.lexicon import get_lexicon
+from backend.services.metrics import LatencyTracker
+
+# Mapeo intención → agente (compartido por todos los clasificadores)
+INTENT_TO_AGENT = {
+    "search": "retriever",
+    "persuasion": "sales",
+    "checkout": "checkout",
+    "info": "retriever",  # Retriever usa RAG para FAQs
+}
+
+VALID_INTENTS = ["search", "persuasion", "checkout", "info"]
+VALID_STYLES = ["cuencano", "juvenil", "formal", "neutral"]
+
+
+@dataclass
+class _SpeculativeSearch:
+    """Búsqueda SQL lanzada en paralelo a la clasificación de intención."""
+
+    started_at: float
+    task: Optional[asyncio.Task] = None
+    finished_at: Optional[float] = None
+    handed_off_at: Optional[float] = None
+
+
+@dataclass
+class _RoutedTurn:
+    """Resultado del ruteo de un turno (antes de ejecutar el agente)."""
+
+    agent_name: str
+    early_response: Optional[AgentResponse] = None
+    speculation: Optional[_SpeculativeSearch] = None
 
 
 class AgentOrchestrator:
@@ -37,6 +76,12 @@ class AgentOrchestrator:
         sales_agent: SalesAgent,
         llm_provider: LLMProvider,
         use_llm_detection: bool = True,  # ✨ NUEVO: Usar LLM para detección
+        use_turn_analysis: bool = True,  # Estilo + intención en una sola llamada LLM
+        style_policy: Optional[StyleReevaluationPolicy] = None,
+        intent_model: Optional[LocalIntentClassifier] = None,
+        intent_model_threshold: float = 0.75,
+        classification_cache: Optional[ClassificationCache] = None,
+        speculative_search: bool = True,
     ):
         self.agents: Dict[str, BaseAgent] = {
             "retriever": retriever_agent,
@@ -44,13 +89,39 @@ class AgentOrchestrator:
         }
         self.llm_provider = llm_provider
         self.use_llm_detection = use_llm_detection
+        self.use_turn_analysis = use_turn_analysis
+        self.style_policy = style_policy or StyleReevaluationPolicy()
+        # Nivel local de la cascada de intención (None = solo LLM/keywords)
+        self.intent_model = intent_model
+        self.intent_model_threshold = intent_model_threshold
+        # Caché de clasificaciones del LLM (exacto + semántico opcional)
+        self.classification_cache = classification_cache
+        # Búsqueda de productos en paralelo a la clasificación LLM
+        self.speculative_search = speculative_search
         self.logger = get_logger("orchestrator")
 
+        # Métricas de latencia de detección (para estimar el ahorro del modo combinado)
+        self.intent_llm_latency = LatencyTracker()
+        self.style_llm_latency = LatencyTracker()
+        self.turn_analysis_latency = LatencyTracker()
+        self.llm_calls_saved = 0
+        self.estimated_latency_saved_ms = 0.0
+        self.local_intent_latency = LatencyTracker()
+        self.local_intent_predictions = 0
+        self.local_intent_escalations = 0
+        self.speculation_started = 0
+        self.speculation_used = 0
+        self.speculation_wasted = 0
+        self.speculation_saved_latency = LatencyTracker()
+        self.stream_first_token_latency = LatencyTracker()
+
         detection_method = "LLM Zero-shot" if use_llm_detection else "Keywords"
         self.logger.info(
             "orchestrator_initialized",
             agent_count=len(self.agents),
             detection_method=detection_method,
+            turn_analysis=use_llm_detection and use_turn_analysis,
+            local_intent_model=intent_model.version if intent_model else None,
             agents_available=list(self.agents.keys())
         )
 
@@ -74,52 +145,286 @@ class AgentOrchestrator:
         - Loop detectado → Rompe ciclo
         - Error crítico → Respuesta de emergencia
         """
+        speculation: Optional[_SpeculativeSearch] = None
         try:
-            # Inicializar o actualizar estado
-            state = session_state or AgentState(user_query=query)
-            state.user_query = query
-            
-            # ✅ BUGFIX: Asignar user_id al estado si se proporcionó
-            if user_id:
-                state.user_id = user_id
-
-            # Logger con contexto
-            log = self.logger.bind(
-                session_id=getattr(state, 'session_id', 'unknown'),
+            state, log = self._begin_turn(query, session_state, user_id)
+
+            routed = await self._route_turn(state, log)
+            speculation = routed.speculation
+            if routed.early_response is not None:
+                return routed.early_response
+
+            return await self._execute_agent(
+                routed.agent_name, state, log, speculation
+            )
+
+        except Exception as e:
+            # Error crítico en orchestrator - respuesta de emergencia
+            self.logger.error(
+                "orchestrator_critical_failure",
                 query=query[:100],
-                query_length=len(query),
-                has_history=bool(getattr(state, 'conversation_history', [])),
-                checkout_stage=getattr(state, 'checkout_stage', None)
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True
             )
 
-            log.info(
-                "query_received",
-                user_style=getattr(state, 'user_style', None),
-                detected_intent=getattr(state, 'detected_intent', None)
+            # Crear estado mínimo si no existe
+            emergency_state = session_state or AgentState(user_query=query)
+            emergency_state.user_query = query
+
+            return AgentResponse(
+                agent_name="orchestrator",
+                message=(
+                    "Disculpa, tuve un problema técnico. "
+                    "¿Puedes intentar de nuevo con una pregunta diferente?"
+                ),
+                state=emergency_state,
+                should_transfer=False,
+                metadata={"error": "orchestrator_failure", "error_message": str(e)}
             )
+        finally:
+            if speculation is not None:
+                self._finish_speculative_search(speculation)
+
+    # PERFIL DE ESTILO (STICKY + DECAIMIENTO)
+
+    def _style_needs_evaluation(self, state: AgentState) -> bool:
+        """
+        Decide si el detector de estilo debe correr en este turno.
 
-            # DETECCIÓN DE STOP INTENT (ANTES de procesar con agentes)
-            stop_intent_detected, stop_message = self._detect_stop_intent(state)
-            if stop_intent_detected:
-                log = self.logger.bind(
-                    session_id=getattr(state, 'session_id', None),
-                    query=query[:50]
+        El perfil persiste en la sesión: en vez de re-detectar en cada mensaje
+        (lo que pasaba siempre con usuarios "neutral"), solo se re-evalúa según
+        la StyleReevaluationPolicy (cada N mensajes o con confianza baja).
+        """
+        profile = state.style_profile
+
+        if profile is None:
+            if state.user_style and state.user_style != "neutral":
+                # Sesión previa al perfil (o estilo fijado por el Agente 2):
+                # se respeta como ya evaluado
+                state.style_profile = UserStyleProfile(
+                    style=state.user_style,
+                    confidence=1.0,
+                    source="session",
+                    sample_count=1,
+                    evaluations=1,
                 )
+                return False
+            return True
+
+        profile.register_message()
+        needs = profile.needs_reevaluation(self.style_policy)
+        if not needs:
+            self.logger.debug(
+                "style_profile_reused",
+                style=profile.style,
+                effective_confidence=round(profile.effective_confidence(self.style_policy), 2),
+                messages_since_evaluation=profile.messages_since_evaluation,
+                evaluations=profile.evaluations,
+            )
+        return needs
+
+    async def stream_query(
+        self, query: str, session_state: Optional[AgentState] = None, user_id: Optional[str] = None
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """
+        Versión streaming de process_query.
+
+        Emite primero un evento "metadata" (agente elegido, intención, estilo)
+        apenas termina el ruteo. Si responde el SalesAgent con una pregunta
+        general, el mensaje llega token a token (astream); en el resto de
+        casos llega en un solo evento "token". Cierra con "done", que trae
+        el AgentResponse final para persistir sesión e historial.
+        """
+        speculation: Optional[_SpeculativeSearch] = None
+        started = time.perf_counter()
+        log = self.logger
+        try:
+            state, log = self._begin_turn(query, session_state, user_id)
+
+            routed = await self._route_turn(state, log)
+            speculation = routed.speculation
+
+            yield AgentStreamEvent(
+                type="metadata",
+                agent=routed.agent_name,
+                intent=state.detected_intent,
+                user_style=state.user_style,
+            )
+
+            sales_agent = self.agents.get("sales")
+            if routed.early_response is not None:
+                response = routed.early_response
+            elif (
+                routed.agent_name == "sales"
+                and isinstance(sales_agent, SalesAgent)
+                and sales_agent.can_stream(state)
+            ):
+                response = None
+                first_token = True
+                async for item in sales_agent.stream_pregunta_general(state):
+                    if isinstance(item, AgentResponse):
+                        response = item
+                        continue
+                    if first_token:
+                        first_token = False
+                        self.stream_first_token_latency.record(
+                            (time.perf_counter() - started) * 1000
+                        )
+                    yield AgentStreamEvent(type="token", delta=item)
+
                 log.info(
-                    "stop_intent_detected",
-                    query_full=query,
-                    stop_message=stop_message[:50]
+                    "query_streamed",
+                    final_agent=response.agent_name,
+                    response_length=len(response.message),
+                    total_ms=round((time.perf_counter() - started) * 1000, 1)
                 )
-                return AgentResponse(
-                    agent_name="orchestrator",
-                    message=stop_message,
-                    state=state,
-                    should_transfer=False,
-                    metadata={"stop_intent": True}
+                yield AgentStreamEvent(type="done", agent=response.agent_name, response=response)
+                return
+            else:
+                response = await self._execute_agent(
+                    routed.agent_name, state, log, speculation
+                )
+
+            self.stream_first_token_latency.record((time.perf_counter() - started) * 1000)
+            yield AgentStreamEvent(type="token", delta=response.message)
+            yield AgentStreamEvent(type="done", agent=response.agent_name, response=response)
+
+        except Exception as e:
+            log.error(
+                "orchestrator_stream_failure",
+                query=query[:100],
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True
+            )
+            yield AgentStreamEvent(
+                type="error",
+                error=str(e),
+                delta=(
+                    "Disculpa, tuve un problema técnico. "
+                    "¿Puedes intentar de nuevo con una pregunta diferente?"
+                ),
+            )
+        finally:
+            if speculation is not None:
+                self._finish_speculative_search(speculation)
+
+    def _begin_turn(
+        self, query: str, session_state: Optional[AgentState], user_id: Optional[str]
+    ):
+        """Inicializa el estado del turno y el logger con contexto."""
+        # Inicializar o actualizar estado
+        state = session_state or AgentState(user_query=query)
+        state.user_query = query
+        state.intent_classification = None
+
+        # ✅ BUGFIX: Asignar user_id al estado si se proporcionó
+        if user_id:
+            state.user_id = user_id
+
+        # Logger con contexto
+        log = self.logger.bind(
+            session_id=getattr(state, 'session_id', 'unknown'),
+            query=query[:100],
+            query_length=len(query),
+            has_history=bool(getattr(state, 'conversation_history', [])),
+            checkout_stage=getattr(state, 'checkout_stage', None)
+        )
+
+        log.info(
+            "query_received",
+            user_style=getattr(state, 'user_style', None),
+            detected_intent=getattr(state, 'detected_intent', None)
+        )
+
+        return state, log
+
+    async def _route_turn(self, state: AgentState, log) -> _RoutedTurn:
+        """
+        Stop intent + detección de estilo/intención → agente a ejecutar.
+
+        Si el turno termina aquí (despedida) retorna early_response. La búsqueda
+        especulativa (si se lanzó) viaja en el resultado para que el llamador
+        la consuma o la cancele.
+        """
+        query = state.user_query
+
+        # DETECCIÓN DE STOP INTENT (ANTES de procesar con agentes)
+        stop_intent_detected, stop_message = self._detect_stop_intent(state)
+        if stop_intent_detected:
+            return _RoutedTurn(
+                agent_name="orchestrator",
+                early_response=self._build_stop_response(
+                    state, query, stop_message, source="keywords"
+                ),
+            )
+
+        needs_style = self._style_needs_evaluation(state)
+        needs_intent = state.checkout_stage is None
+        current_agent_name = "sales"
+        speculation: Optional[_SpeculativeSearch] = None
+
+        # Cascada: modelo local → caché de clasificaciones → LLM
+        known_intent = None
+        if needs_intent:
+            known_intent = self._classify_intent_local(state)
+            if known_intent is None and self.classification_cache is not None:
+                known_intent = await self.classification_cache.get(state)
+
+        # Si el LLM va a clasificar y el query parece búsqueda, el SQL arranca ya
+        if needs_intent and known_intent is None:
+            speculation = await self._start_speculative_search(state)
+
+        # Modo "turn analysis": estilo + intención + stop intent en UNA llamada
+        if (
+            self.use_llm_detection
+            and self.use_turn_analysis
+            and needs_style
+            and needs_intent
+            and known_intent is None
+        ):
+            try:
+                analysis = await self._analyze_turn_llm(state)
+
+                self._apply_style_profile(state, analysis.style)
+                state.detected_intent = analysis.intent.intent
+                state.intent_classification = analysis.intent
+                await self._cache_classification(state, analysis.intent)
+                current_agent_name = analysis.intent.suggested_agent
+                log.info(
+                    "turn_analyzed",
+                    style=state.user_style,
+                    intent=analysis.intent.intent,
+                    suggested_agent=analysis.intent.suggested_agent,
+                    confidence=round(analysis.intent.confidence, 2),
+                    llm_fields=analysis.llm_fields,
+                    latency_ms=round(analysis.latency_ms, 1),
                 )
 
+                if analysis.stop_intent:
+                    return _RoutedTurn(
+                        agent_name="orchestrator",
+                        early_response=self._build_stop_response(
+                            state,
+                            query,
+                            self._farewell_message(state.user_style),
+                            source="turn_analysis",
+                        ),
+                        speculation=speculation,
+                    )
+            except Exception as e:
+                log.error(
+                    "turn_analysis_failed",
+                    error=str(e),
+                    fallback="sales"
+                )
+                state.user_style = state.user_style or "neutral"
+                state.detected_intent = "persuasion"
+                current_agent_name = "sales"
+        else:
             # Detectar estilo de usuario si no está definido
-            if not state.user_style or state.user_style == "neutral":
+            if needs_style:
                 try:
                     # Usar detección LLM o Keywords según configuración
                     if self.use_llm_detection:
@@ -127,11 +432,12 @@ class AgentOrchestrator:
                     else:
                         style_profile = await self._detect_user_style_keywords(state)
 
-                    state.user_style = style_profile.style
+                    self._apply_style_profile(state, style_profile)
                     log.info(
                         "style_detected",
                         style=state.user_style,
-                        confidence=round(style_profile.confidence, 2),
+                        confidence=round(state.style_profile.confidence, 2),
+                        evaluations=state.style_profile.evaluations,
                         method="llm" if self.use_llm_detection else "keywords"
                     )
                 except Exception as e:
@@ -140,24 +446,30 @@ class AgentOrchestrator:
                         error=str(e),
                         fallback="neutral"
                     )
-                    state.user_style = "neutral"
+                    state.user_style = (
+                        state.style_profile.style if state.style_profile else "neutral"
+                    )
 
             # Detectar intención si no está en checkout
-            if state.checkout_stage is None:
+            if needs_intent:
                 try:
-                    # Usar detección LLM o Keywords según configuración
-                    if self.use_llm_detection:
+                    # Modelo local/caché → LLM o Keywords según configuración
+                    if known_intent is not None:
+                        intent = known_intent
+                    elif self.use_llm_detection:
                         intent = await self._classify_intent_llm(state)
+                        await self._cache_classification(state, intent)
                     else:
                         intent = await self._classify_intent_keywords(state)
 
                     state.detected_intent = intent.intent
+                    state.intent_classification = intent
                     log.info(
                         "intent_detected",
                         intent=intent.intent,
                         suggested_agent=intent.suggested_agent,
                         confidence=round(intent.confidence, 2),
-                        method="llm" if self.use_llm_detection else "keywords"
+                        method=intent.source
                     )
                     current_agent_name = intent.suggested_agent
                 except Exception as e:
@@ -168,167 +480,276 @@ class AgentOrchestrator:
                     )
                     current_agent_name = "sales"
                     state.detected_intent = "persuasion"
-            # Note: Checkout flow removed - frontend uses direct GraphQL createOrder
+        # Note: Checkout flow removed - frontend uses direct GraphQL createOrder
+
+        return _RoutedTurn(agent_name=current_agent_name, speculation=speculation)
+
+    async def _execute_agent(
+        self,
+        current_agent_name: str,
+        state: AgentState,
+        log,
+        speculation: Optional[_SpeculativeSearch] = None,
+    ) -> AgentResponse:
+        """Ejecuta el agente seleccionado y resuelve transferencias entre agentes."""
+        # Validar que el agente existe
+        if current_agent_name not in self.agents:
+            log.error(
+                "agent_not_found",
+                requested_agent=current_agent_name,
+                fallback="sales",
+                available_agents=list(self.agents.keys())
+            )
+            current_agent_name = "sales"
+
+        # Seleccionar y ejecutar agente con try/except
+        try:
+            agent = self.agents[current_agent_name]
+            log.info(
+                "agent_selected",
+                agent=current_agent_name,
+                intent=state.detected_intent,
+                style=state.user_style
+            )
+            if speculation is not None and current_agent_name == "retriever":
+                speculation.handed_off_at = time.perf_counter()
+                response = await agent.process(state, prefetched=speculation.task)
+            else:
+                response = await agent.process(state)
+            log.info(
+                "agent_processed",
+                agent=current_agent_name,
+                should_transfer=response.should_transfer,
+                transfer_to=response.transfer_to if response.should_transfer else None,
+                response_length=len(response.message)
+            )
+        except Exception as e:
+            log.error(
+                "agent_execution_failed",
+                agent=current_agent_name,
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True
+            )
+            # Respuesta de fallback
+            response = AgentResponse(
+                agent_name=current_agent_name,
+                message=(
+                    "Disculpa, tuve un problema técnico. "
+                    "¿Puedes reformular tu pregunta?"
+                ),
+                state=state,
+                should_transfer=False,
+                metadata={"error": str(e)}
+            )
+
+        # Manejar transferencias entre agentes con detección de loops
+        max_transfers = 3
+        transfer_count = 0
+        transfer_history = []  # Para detectar loops
+
+        while response.should_transfer and transfer_count < max_transfers:
+            transfer_count += 1
+
+            # Crear clave de transferencia para detectar loops
+            transfer_key = f"{current_agent_name}->{response.transfer_to}"
+
+            # Detectar loop: misma transferencia 2+ veces
+            if transfer_history.count(transfer_key) >= 2:
+                log.warning(
+                    "transfer_loop_detected",
+                    transfer_key=transfer_key,
+                    history=transfer_history,
+                    count=transfer_history.count(transfer_key)
+                )
+                break
+
+            transfer_history.append(transfer_key)
+
+            log.info(
+                "agent_transfer",
+                transfer_number=transfer_count,
+                from_agent=current_agent_name,
+                to_agent=response.transfer_to,
+                transfer_chain=" -> ".join(transfer_history)
+            )
 
-            # Validar que el agente existe
-            if current_agent_name not in self.agents:
+            # Validar que el agente destino existe
+            next_agent_name = response.transfer_to
+            if next_agent_name not in self.agents:
                 log.error(
-                    "agent_not_found",
-                    requested_agent=current_agent_name,
-                    fallback="sales",
+                    "transfer_target_not_found",
+                    requested_agent=next_agent_name,
                     available_agents=list(self.agents.keys())
                 )
-                current_agent_name = "sales"
+                break
 
-            # Seleccionar y ejecutar agente con try/except
+            next_agent = self.agents[next_agent_name]
+            current_agent_name = next_agent_name
+
+            # Procesar con nuevo agente con try/except
             try:
-                agent = self.agents[current_agent_name]
+                response = await next_agent.process(response.state)
                 log.info(
-                    "agent_selected",
-                    agent=current_agent_name,
-                    intent=state.detected_intent,
-                    style=state.user_style
-                )
-                response = await agent.process(state)
-                log.info(
-                    "agent_processed",
-                    agent=current_agent_name,
-                    should_transfer=response.should_transfer,
-                    transfer_to=response.transfer_to if response.should_transfer else None,
-                    response_length=len(response.message)
+                    "transfer_completed",
+                    to_agent=next_agent_name,
+                    should_transfer=response.should_transfer
                 )
             except Exception as e:
                 log.error(
-                    "agent_execution_failed",
-                    agent=current_agent_name,
+                    "transfer_failed",
+                    to_agent=next_agent_name,
                     error=str(e),
                     error_type=type(e).__name__,
                     exc_info=True
                 )
-                # Respuesta de fallback
-                response = AgentResponse(
-                    agent_name=current_agent_name,
-                    message=(
-                        "Disculpa, tuve un problema técnico. "
-                        "¿Puedes reformular tu pregunta?"
-                    ),
-                    state=state,
-                    should_transfer=False,
-                    metadata={"error": str(e)}
-                )
+                # Detener transferencias en caso de error
+                break
+
+        # Logs finales
+        if transfer_count >= max_transfers:
+            log.warning(
+                "max_transfers_reached",
+                max_transfers=max_transfers,
+                final_agent=response.agent_name
+            )
 
-            # Manejar transferencias entre agentes con detección de loops
-            max_transfers = 3
-            transfer_count = 0
-            transfer_history = []  # Para detectar loops
+        if transfer_history:
+            log.info(
+                "transfer_flow_completed",
+                transfer_chain=" -> ".join(transfer_history),
+                final_agent=response.agent_name,
+                total_transfers=transfer_count
+            )
 
-            while response.should_transfer and transfer_count < max_transfers:
-                transfer_count += 1
+        log.info(
+            "query_completed",
+            final_agent=response.agent_name,
+            has_transfers=bool(transfer_history),
+            response_length=len(response.message)
+        )
 
-                # Crear clave de transferencia para detectar loops
-                transfer_key = f"{current_agent_name}->{response.transfer_to}"
+        return response
 
-                # Detectar loop: misma transferencia 2+ veces
-                if transfer_history.count(transfer_key) >= 2:
-                    log.warning(
-                        "transfer_loop_detected",
-                        transfer_key=transfer_key,
-                        history=transfer_history,
-                        count=transfer_history.count(transfer_key)
-                    )
-                    break
+    def _apply_style_profile(self, state: AgentState, detected: UserStyleProfile) -> None:
+        """Combina la detección con el perfil persistido y actualiza el estado."""
+        if state.style_profile is None:
+            state.style_profile = detected.model_copy(
+                update={"sample_count": 1, "evaluations": 1, "messages_since_evaluation": 0}
+            )
+        else:
+            state.style_profile = state.style_profile.merge(detected, self.style_policy)
+        state.user_style = state.style_profile.style
 
-                transfer_history.append(transfer_key)
+    # BÚSQUEDA ESPECULATIVA
 
-                log.info(
-                    "agent_transfer",
-                    transfer_number=transfer_count,
-                    from_agent=current_agent_name,
-                    to_agent=response.transfer_to,
-                    transfer_chain=" -> ".join(transfer_history)
-                )
+    async def _start_speculative_search(
+        self, state: AgentState
+    ) -> Optional[_SpeculativeSearch]:
+        """
+        Lanza la búsqueda SQL del RetrieverAgent mientras el LLM clasifica.
 
-                # Validar que el agente destino existe
-                next_agent_name = response.transfer_to
-                if next_agent_name not in self.agents:
-                    log.error(
-                        "transfer_target_not_found",
-                        requested_agent=next_agent_name,
-                        available_agents=list(self.agents.keys())
-                    )
-                    break
+        Solo si el pre-análisis por keywords dice "search" y no es una FAQ
+        (las FAQs van a RAG, no a SQL). Si al final la intención no enruta
+        al retriever, la tarea se cancela y cuenta como desperdiciada.
+        """
+        retriever = self.agents.get("retriever")
+        if not (self.speculative_search and self.use_llm_detection and retriever):
+            return None
 
-                next_agent = self.agents[next_agent_name]
-                current_agent_name = next_agent_name
+        pre_pass = await self._classify_intent_keywords(state)
+        if pre_pass.intent != "search" or retriever._is_faq_query(state.user_query):
+            return None
 
-                # Procesar con nuevo agente con try/except
-                try:
-                    response = await next_agent.process(response.state)
-                    log.info(
-                        "transfer_completed",
-                        to_agent=next_agent_name,
-                        should_transfer=response.should_transfer
-                    )
-                except Exception as e:
-                    log.error(
-                        "transfer_failed",
-                        to_agent=next_agent_name,
-                        error=str(e),
-                        error_type=type(e).__name__,
-                        exc_info=True
-                    )
-                    # Detener transferencias en caso de error
-                    break
+        speculation = _SpeculativeSearch(started_at=time.perf_counter())
 
-            # Logs finales
-            if transfer_count >= max_transfers:
-                log.warning(
-                    "max_transfers_reached",
-                    max_transfers=max_transfers,
-                    final_agent=response.agent_name
-                )
+        async def run():
+            try:
+                return await retriever.prefetch_products(state.user_query)
+            finally:
+                speculation.finished_at = time.perf_counter()
+
+        speculation.task = asyncio.create_task(run())
+        self.speculation_started += 1
+        return speculation
+
+    def _finish_speculative_search(self, speculation: _SpeculativeSearch) -> None:
+        """Registra si la especulación se usó (y cuánto ahorró) o se desperdició."""
+        task = speculation.task
+        if speculation.handed_off_at is None:
+            self.speculation_wasted += 1
+            if task.done():
+                if not task.cancelled():
+                    task.exception()  # Evita "exception was never retrieved"
+            else:
+                task.cancel()
+            self.logger.debug("speculative_search_wasted")
+            return
+
+        if not task.done():
+            task.cancel()
+        self.speculation_used += 1
+        # Ahorro = trabajo SQL que ya estaba hecho cuando el retriever arrancó
+        overlap_end = min(
+            speculation.finished_at or speculation.handed_off_at,
+            speculation.handed_off_at,
+        )
+        self.speculation_saved_latency.record((overlap_end - speculation.started_at) * 1000)
+
+    async def _cache_classification(
+        self, state: AgentState, intent: IntentClassification
+    ) -> None:
+        """Guarda la clasificación del LLM en caché (nunca rompe el flujo)."""
+        if self.classification_cache is None:
+            return
+        try:
+            await self.classification_cache.put(state, intent)
+        except Exception as e:
+            self.logger.warning("classification_cache_put_failed", error=str(e))
 
-            if transfer_history:
-                log.info(
-                    "transfer_flow_completed",
-                    transfer_chain=" -> ".join(transfer_history),
-                    final_agent=response.agent_name,
-                    total_transfers=transfer_count
-                )
+    # CLASIFICADOR LOCAL (NIVEL 1 DE LA CASCADA)
 
-            log.info(
-                "query_completed",
-                final_agent=response.agent_name,
-                has_transfers=bool(transfer_history),
-                response_length=len(response.message)
-            )
+    def _classify_intent_local(
+        self, state: AgentState
+    ) -> Optional[IntentClassification]:
+        """
+        Clasifica con el modelo local entrenado (TF-IDF + lineal).
 
-            return response
+        Retorna None (escalar al LLM) si no hay modelo, si la confianza queda
+        por debajo del umbral o si el modelo predice una etiqueta desconocida.
+        """
+        if self.intent_model is None:
+            return None
 
+        started = time.perf_counter()
+        try:
+            intent, confidence = self.intent_model.predict(
+                state.user_query, has_search_results=bool(state.search_results)
+            )
         except Exception as e:
-            # Error crítico en orchestrator - respuesta de emergencia
-            self.self.logger.error(
-                "orchestrator_critical_failure",
-                query=query[:100],
-                error=str(e),
-                error_type=type(e).__name__,
-                exc_info=True
+            self.logger.error("local_intent_failed", error=str(e))
+            return None
+        finally:
+            self.local_intent_latency.record((time.perf_counter() - started) * 1000)
+
+        self.local_intent_predictions += 1
+        if intent not in VALID_INTENTS or confidence < self.intent_model_threshold:
+            self.local_intent_escalations += 1
+            self.logger.debug(
+                "local_intent_escalated",
+                intent=intent,
+                confidence=round(confidence, 3),
+                threshold=self.intent_model_threshold,
             )
+            return None
 
-            # Crear estado mínimo si no existe
-            emergency_state = session_state or AgentState(user_query=query)
-            emergency_state.user_query = query
-
-            return AgentResponse(
-                agent_name="orchestrator",
-                message=(
-                    "Disculpa, tuve un problema técnico. "
-                    "¿Puedes intentar de nuevo con una pregunta diferente?"
-                ),
-                state=emergency_state,
-                should_transfer=False,
-                metadata={"error": "orchestrator_failure", "error_message": str(e)}
-            )
+        return IntentClassification(
+            intent=intent,
+            confidence=confidence,
+            suggested_agent=INTENT_TO_AGENT[intent],
+            reasoning=f"Modelo local v{self.intent_model.version}",
+            source="local_model",
+        )
 
     # DETECCIÓN INTELIGENTE CON LLM ZERO-SHOT
 
@@ -369,11 +790,10 @@ IMPORTANTE:
 - Si dice "NO busco X", NO es search
 - Considera negaciones y el tono
 
-Responde SOLO con un JSON válido en este formato:
+Responde SOLO con un JSON válido en este formato (sin explicación):
 {
   "intent": "search" | "persuasion" | "checkout" | "info",
-  "confidence": 0.0 a 1.0,
-  "reasoning": "Breve explicación de por qué elegiste esta intención"
+  "confidence": 0.0 a 1.0
 }"""
 
             # Construir contexto
@@ -408,39 +828,22 @@ Responde SOLO con un JSON válido en este formato:
 
             self.logger.debug("Llamando a LLM para clasificar intención...")
 
-            response = await asyncio.wait_for(
-                self.llm_provider.model.ainvoke(messages),
-                timeout=5.0,  # 5 segundos máximo
-            )
-
-            # Parsear respuesta JSON
-            response_text = response.content.strip()
-
-            # Limpiar markdown si existe
-            if response_text.startswith("```json"):
-                response_text = response_text.split("```json")[1]
-            if response_text.endswith("```"):
-                response_text = response_text.rsplit("```", 1)[0]
+            started = time.perf_counter()
+            # Perfil "classify": modelo rápido, temperatura 0, timeout 5s
+            response = await self.llm_provider.ainvoke(messages, call_site="intent")
+            self.intent_llm_latency.record((time.perf_counter() - started) * 1000)
 
-            result = json.loads(response_text.strip())
+            result = self._parse_llm_json(response.content)
 
             # Validar campos
             intent = result.get("intent", "persuasion")
-            if intent not in ["search", "persuasion", "checkout", "info"]:
+            if intent not in VALID_INTENTS:
                 self.logger.warning(f"Intención inválida del LLM: {intent}")
                 intent = "persuasion"
 
             confidence = float(result.get("confidence", 0.8))
             reasoning = result.get("reasoning", "LLM classification")
 
-            # Mapear intención a agente
-            intent_to_agent = {
-                "search": "retriever",
-                "persuasion": "sales",
-                "checkout": "checkout",
-                "info": "retriever",  # Retriever usa RAG para FAQs
-            }
-
             self.logger.info(
                 f"LLM clasificó como '{intent}' (confianza: {confidence:.2f}): {reasoning}"
             )
@@ -448,8 +851,9 @@ Responde SOLO con un JSON válido en este formato:
             return IntentClassification(
                 intent=intent,
                 confidence=confidence,
-                suggested_agent=intent_to_agent[intent],
+                suggested_agent=INTENT_TO_AGENT[intent],
                 reasoning=reasoning,
+                source="llm",
             )
 
         except asyncio.TimeoutError:
@@ -512,11 +916,10 @@ IMPORTANTE:
 - Un solo mensaje puede no ser suficiente, considera el contexto
 - Si no hay señales claras, es "neutral"
 
-Responde SOLO con un JSON válido en este formato:
+Responde SOLO con un JSON válido en este formato (sin explicación):
 {
   "style": "cuencano" | "juvenil" | "formal" | "neutral",
-  "confidence": 0.0 a 1.0,
-  "reasoning": "Explicación breve de los indicadores detectados"
+  "confidence": 0.0 a 1.0
 }"""
 
             # Recopilar mensajes del usuario
@@ -546,25 +949,15 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
 
             self.logger.debug("Llamando a LLM para detectar estilo...")
 
-            response = await asyncio.wait_for(
-                self.llm_provider.model.ainvoke(messages),
-                timeout=5.0,
-            )
+            started = time.perf_counter()
+            response = await self.llm_provider.ainvoke(messages, call_site="style")
+            self.style_llm_latency.record((time.perf_counter() - started) * 1000)
 
-            # Parsear respuesta JSON
-            response_text = response.content.strip()
-
-            # Limpiar markdown
-            if response_text.startswith("```json"):
-                response_text = response_text.split("```json")[1]
-            if response_text.endswith("```"):
-                response_text = response_text.rsplit("```", 1)[0]
-
-            result = json.loads(response_text.strip())
+            result = self._parse_llm_json(response.content)
 
             # Validar campos
             style = result.get("style", "neutral")
-            if style not in ["cuencano", "juvenil", "formal", "neutral"]:
+            if style not in VALID_STYLES:
                 self.logger.warning(f"Estilo inválido del LLM: {style}")
                 style = "neutral"
 
@@ -580,6 +973,7 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
                 confidence=confidence,
                 detected_patterns=[reasoning],
                 sample_messages=user_messages[-3:],
+                source="llm",
             )
 
         except asyncio.TimeoutError:
@@ -599,6 +993,215 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
             )
             return await self._detect_user_style_keywords(state)
 
+    async def _analyze_turn_llm(self, state: AgentState) -> TurnAnalysis:
+        """
+        Analiza el turno completo (estilo + intención + stop intent) con UNA
+        sola llamada al LLM, en lugar de dos round trips secuenciales.
+
+        Fallback por campo: si el LLM no devuelve un campo válido, ese campo
+        se completa con el detector de keywords correspondiente. Si la llamada
+        falla por completo, todos los campos salen de keywords.
+        """
+        system_prompt = """Eres un analizador de conversaciones para un sistema de ventas de calzado deportivo.
+
+Analiza el mensaje del usuario y determina TRES cosas a la vez:
+
+A) INTENCIÓN (una de 4):
+1. **search**: Buscar o explorar productos ("busco Nike", "hay talla 42?")
+2. **persuasion**: Dudas, objeciones o recomendaciones ("están caros", "cual es mejor?")
+3. **checkout**: Quiere comprar o confirmar ("los quiero", "confirmo", "procede")
+4. **info**: Información general ("horarios?", "hacen envíos?", "garantía?")
+- Si el usuario ya vio productos, favorece persuasion/checkout
+- Si dice "NO busco X", NO es search
+
+B) ESTILO DE COMUNICACIÓN (uno de 4):
+1. **cuencano**: Modismos ecuatorianos ("ayayay", "ve", "full", "chevere", "pana")
+2. **juvenil**: Casual, jerga ("che", "bro", "tipo", "re", "copado")
+3. **formal**: Profesional, trato de usted ("usted", "por favor", "quisiera")
+4. **neutral**: Estándar, sin marcadores claros
+
+C) STOP INTENT: true si el usuario quiere terminar o abandonar la conversación
+   ("mejor no", "luego veo", "chao", "olvídalo"), false en otro caso.
+
+Responde SOLO con un JSON válido en este formato (sin explicación):
+{
+  "intent": "search" | "persuasion" | "checkout" | "info",
+  "intent_confidence": 0.0 a 1.0,
+  "style": "cuencano" | "juvenil" | "formal" | "neutral",
+  "style_confidence": 0.0 a 1.0,
+  "stop_intent": true | false
+}"""
+
+        # Mensajes previos del usuario (para estilo) y contexto (para intención)
+        user_messages = [
+            msg["content"]
+            for msg in state.conversation_history[-5:]
+            if msg["role"] == "user"
+        ]
+        user_messages.append(state.user_query)
+
+        context_parts = [f'Query del usuario: "{state.user_query}"']
+        if state.search_results and len(state.search_results) > 0:
+            context_parts.append(
+                f"\nCONTEXTO: El usuario ya vio {len(state.search_results)} productos."
+            )
+        if state.conversation_history:
+            recent = state.conversation_history[-3:]
+            history_text = "\n".join(
+                [f"- {msg['role']}: {msg['content']}" for msg in recent]
+            )
+            context_parts.append(f"\nHISTORIAL RECIENTE:\n{history_text}")
+        if len(user_messages) > 1:
+            previous = "\n".join(
+                [f'{i+1}. "{msg}"' for i, msg in enumerate(user_messages[:-1])]
+            )
+            context_parts.append(f"\nMENSAJES PREVIOS DEL USUARIO:\n{previous}")
+
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content="\n".join(context_parts)),
+        ]
+
+        result: Dict[str, Any] = {}
+        started = time.perf_counter()
+        try:
+            self.logger.debug("Llamando a LLM para análisis combinado del turno...")
+            response = await self.llm_provider.ainvoke(
+                messages, call_site="turn_analysis"
+            )
+            result = self._parse_llm_json(response.content)
+        except asyncio.TimeoutError:
+            self.logger.warning("LLM timeout en análisis de turno, usando keywords")
+        except json.JSONDecodeError as e:
+            self.logger.warning(f"Error parseando JSON del LLM: {e}, usando keywords")
+        except Exception as e:
+            self.logger.error(
+                f"Error en análisis de turno LLM: {str(e)}, usando keywords",
+                exc_info=True,
+            )
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        llm_fields = []
+
+        # Intención (fallback: keywords)
+        intent_value = result.get("intent")
+        if intent_value in VALID_INTENTS:
+            intent = IntentClassification(
+                intent=intent_value,
+                confidence=float(result.get("intent_confidence", 0.8)),
+                suggested_agent=INTENT_TO_AGENT[intent_value],
+                reasoning="LLM turn analysis",
+                source="turn_analysis",
+            )
+            llm_fields.append("intent")
+        else:
+            intent = await self._classify_intent_keywords(state)
+
+        # Estilo (fallback: keywords)
+        style_value = result.get("style")
+        if style_value in VALID_STYLES:
+            style = UserStyleProfile(
+                style=style_value,
+                confidence=float(result.get("style_confidence", 0.8)),
+                detected_patterns=["LLM turn analysis"],
+                sample_messages=user_messages[-3:],
+                source="turn_analysis",
+            )
+            llm_fields.append("style")
+        else:
+            style = await self._detect_user_style_keywords(state)
+
+        # Stop intent (fallback: el detector de keywords ya corrió antes)
+        stop_value = result.get("stop_intent")
+        if isinstance(stop_value, bool):
+            stop_intent = stop_value
+            llm_fields.append("stop_intent")
+        else:
+            stop_intent = False
+
+        # Reportar el ahorro: el modo clásico habría hecho una llamada más
+        if result:
+            self.turn_analysis_latency.record(latency_ms)
+            self.llm_calls_saved += 1
+            # Estimación: latencia promedio de la llamada de estilo evitada
+            # (o la propia llamada combinada si aún no hay muestras)
+            saved_ms = self.style_llm_latency.avg_ms or latency_ms
+            self.estimated_latency_saved_ms += saved_ms
+            self.logger.info(
+                "turn_analysis_completed",
+                latency_ms=round(latency_ms, 1),
+                estimated_saved_ms=round(saved_ms, 1),
+                total_saved_ms=round(self.estimated_latency_saved_ms, 1),
+                llm_fields=llm_fields,
+            )
+
+        return TurnAnalysis(
+            intent=intent,
+            style=style,
+            stop_intent=stop_intent,
+            llm_fields=llm_fields,
+            latency_ms=latency_ms,
+        )
+
+    def _parse_llm_json(self, content: str) -> Dict[str, Any]:
+        """Parsea la respuesta JSON del LLM (limpiando bloques markdown)."""
+        response_text = content.strip()
+
+        # Limpiar markdown si existe
+        if response_text.startswith("```json"):
+            response_text = response_text.split("```json")[1]
+        if response_text.endswith("```"):
+            response_text = response_text.rsplit("```", 1)[0]
+
+        result = json.loads(response_text.strip())
+        if not isinstance(result, dict):
+            raise json.JSONDecodeError("Se esperaba un objeto JSON", response_text, 0)
+        return result
+
+    def get_detection_stats(self) -> Dict[str, Any]:
+        """Métricas de detección: latencias por tipo de llamada y ahorro estimado."""
+        return {
+            "use_llm_detection": self.use_llm_detection,
+            "use_turn_analysis": self.use_turn_analysis,
+            "intent_llm": self.intent_llm_latency.snapshot(),
+            "style_llm": self.style_llm_latency.snapshot(),
+            "turn_analysis": self.turn_analysis_latency.snapshot(),
+            "llm_calls_saved": self.llm_calls_saved,
+            "estimated_latency_saved_ms": round(self.estimated_latency_saved_ms, 1),
+            "local_intent": {
+                "model_version": self.intent_model.version if self.intent_model else None,
+                "threshold": self.intent_model_threshold,
+                "predictions": self.local_intent_predictions,
+                "escalations": self.local_intent_escalations,
+                "escalation_rate": (
+                    round(self.local_intent_escalations / self.local_intent_predictions, 4)
+                    if self.local_intent_predictions
+                    else None
+                ),
+                "latency": self.local_intent_latency.snapshot(),
+            },
+            "speculative_search": {
+                "enabled": self.speculative_search,
+                "started": self.speculation_started,
+                "used": self.speculation_used,
+                "wasted": self.speculation_wasted,
+                "waste_rate": (
+                    round(self.speculation_wasted / self.speculation_started, 4)
+                    if self.speculation_started
+                    else None
+                ),
+                "saved_ms": self.speculation_saved_latency.snapshot(),
+            },
+            "stream_first_token": self.stream_first_token_latency.snapshot(),
+            "classification_cache": (
+                self.classification_cache.get_stats() if self.classification_cache else None
+            ),
+            "llm_provider": {
+                "cache": self.llm_provider.get_cache_stats(),
+                "limiter": self.llm_provider.get_limiter_stats(),
+            },
+        }
+
     # DETECCIÓN DE STOP INTENT (CANCELACIÓN)
 
     def _detect_stop_intent(self, state: AgentState) -> tuple[bool, str]:
@@ -608,49 +1211,45 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
         Returns:
             (stop_detected: bool, farewell_message: str)
         """
-        query_lower = state.user_query.lower().strip()
-
-        # Patrones de cancelación/salida
-        stop_patterns = [
-            "mejor no",
-            "mejor no gracias",
-            "luego veo",
-            "después veo",
-            "chao",
-            "adiós",
-            "adios",
-            "nos vemos",
-            "hasta luego",
-            "bye",
-            "gracias igual",
-            "gracias igualmente",
-            "ya no",
-            "no importa",
-            "déjalo",
-            "dejalo",
-            "olvídalo",
-            "olvidalo",
-            "no gracias",
-            "está muy caro gracias",
-            "esta muy caro gracias",
-            "muy caro gracias",
-        ]
-
-        # Detectar patrones
-        for pattern in stop_patterns:
-            if pattern in query_lower:
-                # Generar mensaje de despedida según estilo
-                style = state.user_style or "neutral"
-                farewell_messages = {
-                    "cuencano": "Entendido ve. Aquí estaré si cambias de opinión. ¡Buen día!",
-                    "juvenil": "Ok bro, acá estoy por si cambias de idea. ¡Saludos!",
-                    "formal": "Entendido. Quedo a su disposición. ¡Que tenga un buen día!",
-                    "neutral": "Entendido. Aquí estaré si cambias de opinión. ¡Buen día!",
-                }
-                return True, farewell_messages.get(style, farewell_messages["neutral"])
+        # Una sola pasada del léxico compilado (sin tildes, palabras completas)
+        scan = get_lexicon().scan(state.user_query)
+        if scan.has("stop"):
+            return True, self._farewell_message(state.user_style)
 
         return False, ""
 
+    def _farewell_message(self, style: Optional[str]) -> str:
+        """Mensaje de despedida según el estilo del usuario."""
+        farewell_messages = {
+            "cuencano": "Entendido ve. Aquí estaré si cambias de opinión. ¡Buen día!",
+            "juvenil": "Ok bro, acá estoy por si cambias de idea. ¡Saludos!",
+            "formal": "Entendido. Quedo a su disposición. ¡Que tenga un buen día!",
+            "neutral": "Entendido. Aquí estaré si cambias de opinión. ¡Buen día!",
+        }
+        return farewell_messages.get(style or "neutral", farewell_messages["neutral"])
+
+    def _build_stop_response(
+        self, state: AgentState, query: str, stop_message: str, source: str
+    ) -> AgentResponse:
+        """Respuesta de despedida cuando se detecta stop intent."""
+        log = self.logger.bind(
+            session_id=getattr(state, 'session_id', None),
+            query=query[:50]
+        )
+        log.info(
+            "stop_intent_detected",
+            query_full=query,
+            stop_message=stop_message[:50],
+            source=source
+        )
+        return AgentResponse(
+            agent_name="orchestrator",
+            message=stop_message,
+            state=state,
+            should_transfer=False,
+            metadata={"stop_intent": True}
+        )
+
     # DETECCIÓN LEGACY CON KEYWORDS/PATTERNS (FALLBACK)
 
     async def _classify_intent_keywords(
@@ -665,83 +1264,11 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
         - checkout: Comprar, confirmar pedido
         - info: Información general (políticas, horarios, etc.)
         """
-        query_lower = state.user_query.lower()
-
-        # Palabras clave por intención
-        search_keywords = [
-            "buscar",
-            "busco",
-            "mostrar",
-            "muéstrame",
-            "quiero ver",
-            "tienes",
-            "hay",
-            "talla",
-            "color",
-            "marca",
-            "modelo",
-            "catálogo",
-        ]
-
-        checkout_keywords = [
-            "comprar",
-            "cómprame",
-            "dámelos",
-            "dámelo",
-            "envíame",
-            "envía",
-            "quiero",
-            "lo quiero",
-            "los quiero",
-            "confirma",
-            "procede",
-        ]
-
-        info_keywords = [
-            "horario",
-            "hora",
-            "ubicación",
-            "dirección",
-            "garantía",
-            "devolución",
-            "envío",
-            "delivery",
-            "pago",
-            "tarjeta",
-        ]
-
-        persuasion_keywords = [
-            "caro",
-            "precio",
-            "barato",
-            "descuento",
-            "oferta",
-            "recomienda",
-            "mejor",
-            "diferencia",
-            "vale la pena",
-            "duda",
-            "por qué",
-        ]
-
-        # Contar coincidencias
-        search_score = sum(
-            1 for kw in search_keywords if kw in query_lower
-        )
-        checkout_score = sum(
-            1 for kw in checkout_keywords if kw in query_lower
-        )
-        info_score = sum(1 for kw in info_keywords if kw in query_lower)
-        persuasion_score = sum(
-            1 for kw in persuasion_keywords if kw in query_lower
-        )
-
-        # Determinar intención con mayor score
+        # Un único escaneo devuelve el score de todas las intenciones
+        scan = get_lexicon().scan(state.user_query)
         scores = {
-            "search": search_score,
-            "checkout": checkout_score,
-            "info": info_score,
-            "persuasion": persuasion_score,
+            intent: scan.score(f"intent.{intent}")
+            for intent in ("search", "checkout", "info", "persuasion")
         }
 
         max_intent = max(scores, key=scores.get)
@@ -749,13 +1276,10 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
 
         # Si hay resultados de búsqueda previos, favorecer persuasion/checkout
         if state.search_results and len(state.search_results) > 0:
-            if checkout_score > 0 or any(
-                word in query_lower
-                for word in ["sí", "si", "ok", "dale", "bueno"]
-            ):
+            if scores["checkout"] > 0 or scan.has("intent.affirmation"):
                 max_intent = "checkout"
                 max_score = 3
-            elif persuasion_score > 0 or max_score == 0:
+            elif scores["persuasion"] > 0 or max_score == 0:
                 max_intent = "persuasion"
                 max_score = 2
 
@@ -764,21 +1288,14 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
             max_intent = "persuasion"
             max_score = 1
 
-        # Mapear intención a agente
-        intent_to_agent = {
-            "search": "retriever",
-            "persuasion": "sales",
-            "checkout": "checkout",
-            "info": "retriever",  # Retriever usa RAG para FAQs (políticas, horarios, etc.)
-        }
-
         confidence = min(max_score / 3.0, 1.0)  # Normalizar a 0-1
 
         return IntentClassification(
             intent=max_intent,
             confidence=confidence,
-            suggested_agent=intent_to_agent[max_intent],
+            suggested_agent=INTENT_TO_AGENT[max_intent],
             reasoning=f"Keyword matches: {max_intent}={max_score}",
+            source="keywords",
         )
 
     async def _detect_user_style_keywords(
@@ -801,69 +1318,35 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
         ]
         user_messages.append(state.user_query)
 
-        combined_text = " ".join(user_messages).lower()
-
-        # Patrones por estilo
-        cuencano_patterns = [
-            "ayayay",
-            " ve ",
-            " ve,",
-            " ve?",
-            "full",
-            "chevere",
-            "lindo",
-            "pana",
-        ]
-        juvenil_patterns = [
-            "che",
-            "bro",
-            "tipo",
-            " re ",
-            "mal",
-            "onda",
-            "copado",
-        ]
-        formal_patterns = [
-            "usted",
-            "señor",
-            "señora",
-            "por favor",
-            "disculpe",
-            "agradezco",
-        ]
-
-        # Contar matches
-        cuencano_count = sum(
-            1 for pattern in cuencano_patterns if pattern in combined_text
-        )
-        juvenil_count = sum(
-            1 for pattern in juvenil_patterns if pattern in combined_text
-        )
-        formal_count = sum(
-            1 for pattern in formal_patterns if pattern in combined_text
-        )
+        scan = get_lexicon().scan(" ".join(user_messages))
+        cuencano_count = scan.score("style.cuencano")
+        juvenil_count = scan.score("style.juvenil")
+        formal_count = scan.score("style.formal")
 
         # Determinar estilo dominante
         if cuencano_count >= 2:
             return UserStyleProfile(
                 style="cuencano",
                 confidence=min(cuencano_count / 3.0, 1.0),
-                detected_patterns=cuencano_patterns[:cuencano_count],
+                detected_patterns=scan.matched("style.cuencano"),
                 sample_messages=user_messages[-3:],
+                source="keywords",
             )
         elif juvenil_count >= 2:
             return UserStyleProfile(
                 style="juvenil",
                 confidence=min(juvenil_count / 3.0, 1.0),
-                detected_patterns=juvenil_patterns[:juvenil_count],
+                detected_patterns=scan.matched("style.juvenil"),
                 sample_messages=user_messages[-3:],
+                source="keywords",
             )
         elif formal_count >= 1:
             return UserStyleProfile(
                 style="formal",
                 confidence=min(formal_count / 2.0, 1.0),
-                detected_patterns=formal_patterns[:formal_count],
+                detected_patterns=scan.matched("style.formal"),
                 sample_messages=user_messages[-3:],
+                source="keywords",
             )
         else:
             return UserStyleProfile(
@@ -871,6 +1354,7 @@ Determina el estilo predominante basándote en el tono, vocabulario y estructura
                 confidence=1.0,
                 detected_patterns=[],
                 sample_messages=user_messages[-3:],
+                source="keywords",
             )
 
     def get_agent(self, agent_name: str) -> Optional[BaseAgent]:
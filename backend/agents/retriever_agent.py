@@ -1,14 +1,21 @@
 """
 Agente Buscador - Recuperación rápida de productos mediante SQL.
 """
-from typing import List, Any
+import asyncio
+import re
+from typing import Any, Awaitable, List, Optional, Tuple
 from loguru import logger
 
 from backend.agents.base import BaseAgent
 from backend.domain.agent_schemas import AgentState, AgentResponse
+from backend.domain.product_schemas import ProductSearchFilters
+from backend.nlp.lexicon import SEARCH_STOPWORDS, fold_accents, get_lexicon
+from backend.nlp.query_parser import QueryParser
 from backend.services.product_service import ProductService
 from backend.services.rag_service import RAGService
 
+_WORD_RE = re.compile(r"\w+")
+
 
 class RetrieverAgent(BaseAgent):
     """
@@ -22,11 +29,78 @@ class RetrieverAgent(BaseAgent):
     """
 
     def __init__(
-        self, product_service: ProductService, rag_service: RAGService
+        self,
+        product_service: ProductService,
+        rag_service: RAGService,
+        query_parser: Optional[QueryParser] = None,
     ):
         super().__init__(agent_name="retriever")
         self.product_service = product_service
         self.rag_service = rag_service
+        # Marcas/categorías del catálogo para extraer filtros sin LLM; sin
+        # vocabulario (hasta que lo cargue start_vocabulary_refresh) solo
+        # reconoce precio, talla, color, oferta y categorías por sinónimo
+        self.query_parser = query_parser or QueryParser()
+        self._vocabulary: Optional[Tuple[List[str], List[str]]] = None
+        self._vocabulary_task: Optional[asyncio.Task] = None
+
+    def start_vocabulary_refresh(
+        self,
+        interval: float,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 60.0,
+    ) -> asyncio.Task:
+        """
+        Carga marcas y categorías del catálogo en segundo plano (sin bloquear
+        el arranque) y las vuelve a leer cada `interval` s para tomar marcas
+        nuevas. Si la DB no responde se reintenta con backoff exponencial.
+        Con interval <= 0 se carga una sola vez.
+        """
+        self._vocabulary_task = asyncio.create_task(
+            self._refresh_vocabulary(interval, retry_delay, max_retry_delay)
+        )
+        return self._vocabulary_task
+
+    async def stop_vocabulary_refresh(self) -> None:
+        if self._vocabulary_task is not None:
+            self._vocabulary_task.cancel()
+            try:
+                await self._vocabulary_task
+            except asyncio.CancelledError:
+                pass
+            self._vocabulary_task = None
+
+    async def _refresh_vocabulary(
+        self, interval: float, retry_delay: float, max_retry_delay: float
+    ) -> None:
+        delay = retry_delay
+        while True:
+            try:
+                self._update_query_parser(*await self.product_service.get_search_vocabulary())
+            except Exception as e:
+                logger.error(
+                    f"No se pudo cargar el vocabulario de búsqueda: {e}. "
+                    f"Reintento en {delay:.0f}s"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_retry_delay)
+                continue
+
+            delay = retry_delay
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    def _update_query_parser(self, brands: List[str], categories: List[str]) -> None:
+        """Recompila el parser solo si cambió el vocabulario (swap atómico)."""
+        vocabulary = (sorted(brands), sorted(categories))
+        if vocabulary == self._vocabulary:
+            return
+        self.query_parser = QueryParser(brands=brands, categories=categories)
+        self._vocabulary = vocabulary
+        logger.info(
+            f"🔤 Vocabulario de búsqueda: {len(brands)} marcas, {len(categories)} categorías"
+        )
 
     def can_handle(self, state: AgentState) -> bool:
         """
@@ -38,25 +112,14 @@ class RetrieverAgent(BaseAgent):
         if state.detected_intent == "search":
             return True
 
-        # Palabras clave que indican búsqueda
-        search_keywords = [
-            "buscar",
-            "mostrar",
-            "quiero ver",
-            "tienes",
-            "hay",
-            "talla",
-            "color",
-            "marca",
-            "precio",
-            "catálogo",
-            "modelos",
-        ]
+        # Palabras clave que indican búsqueda (léxico compilado)
+        return get_lexicon().scan(state.user_query).has("retriever.search")
 
-        query_lower = state.user_query.lower()
-        return any(keyword in query_lower for keyword in search_keywords)
-
-    async def process(self, state: AgentState) -> AgentResponse:
+    async def process(
+        self,
+        state: AgentState,
+        prefetched: Optional[Awaitable[Tuple[List[Any], List[str]]]] = None,
+    ) -> AgentResponse:
         """
         Procesa búsquedas usando RAG (FAQs) o SQL (productos).
 
@@ -83,12 +146,15 @@ class RetrieverAgent(BaseAgent):
         logger.info("🛍️ Detectada búsqueda de productos → Buscando en SQL")
         
         try:
-            # Extraer términos de búsqueda (palabras significativas)
-            search_terms = self._extract_search_terms(state.user_query)
-            logger.debug(f"Términos de búsqueda extraídos: {search_terms}")
+            # Extraer términos de búsqueda y filtros (marca, precio, talla...)
+            search_terms, filters = self._parse_query(state.user_query)
+            logger.debug(f"Términos de búsqueda extraídos: {search_terms} (filtros: {filters})")
+            if filters is not None and filters.size:
+                # El inventario no tiene tallas: se guarda para el checkout/vendedor
+                state.conversation_slots["size"] = filters.size
 
             # Validar que hay términos
-            if not search_terms:
+            if not search_terms and filters is None:
                 logger.warning("No se pudieron extraer términos de búsqueda")
                 message = self._get_no_terms_message(state)
                 return self._create_response(
@@ -99,21 +165,11 @@ class RetrieverAgent(BaseAgent):
                     error="no_search_terms",
                 )
 
-            # Buscar productos con error handling
-            products = []
-            search_errors = []
-
-            for term in search_terms:
-                try:
-                    found = await self.product_service.search_by_name(term)
-                    products.extend(found)
-                except Exception as e:
-                    logger.error(
-                        f"Error buscando término '{term}': {str(e)}",
-                        exc_info=True
-                    )
-                    search_errors.append(term)
-                    continue
+            # Buscar productos (o usar la búsqueda especulativa ya lanzada)
+            if prefetched is not None:
+                products, search_errors = await prefetched
+            else:
+                products, search_errors = await self._search_terms(search_terms, filters)
 
             # Si todas las búsquedas fallaron
             if search_errors and not products:
@@ -224,6 +280,59 @@ class RetrieverAgent(BaseAgent):
             partial_errors=len(search_errors),
         )
 
+    async def prefetch_products(self, query: str) -> Tuple[List[Any], List[str]]:
+        """
+        Búsqueda SQL de productos para un query, sin tocar el estado.
+
+        El orquestador la lanza en paralelo a la clasificación de intención
+        (búsqueda especulativa) y luego se la pasa a process() como prefetched.
+        """
+        return await self._search_terms(*self._parse_query(query))
+
+    def _parse_query(self, query: str) -> Tuple[List[str], Optional[ProductSearchFilters]]:
+        """
+        Términos de texto y filtros estructurados de la query (None si no hay
+        filtros). Sin nada reconocible, cae a las palabras significativas.
+        """
+        parsed = self.query_parser.parse(query)
+        if not parsed.terms and not parsed.has_filters:
+            return self._extract_search_terms(query), None
+        return parsed.terms, (parsed.filters if parsed.has_filters else None)
+
+    async def _search_terms(
+        self,
+        search_terms: List[str],
+        filters: Optional[ProductSearchFilters] = None,
+    ) -> Tuple[List[Any], List[str]]:
+        """
+        Busca todos los términos (con filtros) en una sola consulta SQL rankeada.
+        Retorna (productos, términos con error).
+        """
+        products = []
+        search_errors = []
+
+        try:
+            products = await self.product_service.search_terms(search_terms, filters)
+        except Exception as e:
+            logger.error(
+                f"Error buscando términos {search_terms}: {str(e)}",
+                exc_info=True
+            )
+            search_errors = list(search_terms)
+
+        # Sin coincidencias exactas: reintentar tolerando errores de tipeo
+        # ("addidas", "nyke") antes de derivar a SalesAgent
+        if not products and not search_errors and search_terms:
+            query = " ".join(search_terms)
+            try:
+                products = await self.product_service.search_fuzzy(query, filters=filters)
+            except Exception as e:
+                logger.error(f"Error en búsqueda difusa '{query}': {str(e)}")
+            if products:
+                logger.info(f"🔤 Búsqueda difusa: {len(products)} productos para '{query}'")
+
+        return products, search_errors
+
     def _is_faq_query(self, query: str) -> bool:
         """
         Detecta si la pregunta es sobre información general (FAQs).
@@ -234,27 +343,12 @@ class RetrieverAgent(BaseAgent):
         - Formas de pago y envío
         - Información de la tienda
         """
-        query_lower = query.lower()
-        
-        faq_keywords = [
-            # Políticas
-            "política", "devolución", "devolver", "garantía", "cambio",
-            # Horarios y ubicación
-            "horario", "hora", "abre", "cierra", "ubicación", "dirección",
-            "dónde", "donde está", "sucursal", "local",
-            # Pagos y envíos  
-            "pago", "pagar", "tarjeta", "efectivo", "transferencia",
-            "envío", "envio", "delivery", "entrega", "domicilio",
-            # Info general
-            "cómo funciona", "qué hacen", "quiénes son", "quién",
-            "contacto", "teléfono", "whatsapp", "email",
-        ]
-        
-        return any(keyword in query_lower for keyword in faq_keywords)
+        return get_lexicon().scan(query).has("retriever.faq")
     
     async def _handle_faq_query(self, state: AgentState) -> AgentResponse:
         """
-        Maneja preguntas FAQ usando RAG (búsqueda semántica en ChromaDB).
+        Maneja preguntas FAQ: primero el lookup directo de faqs.csv y, si no
+        hay coincidencia, RAG (búsqueda semántica en ChromaDB).
         
         Args:
             state: Estado de la conversación
@@ -263,11 +357,36 @@ class RetrieverAgent(BaseAgent):
             AgentResponse con respuesta de RAG o mensaje de error
         """
         try:
-            # Buscar en RAG (ChromaDB con embeddings)
-            rag_results = await self.rag_service.search(
-                query=state.user_query,
-                k=3  # Top 3 resultados más relevantes
-            )
+            # 1. Lookup directo por patterns de faqs.csv (sin red)
+            faq_match = self.rag_service.match_faq(state.user_query)
+            if faq_match is not None:
+                logger.info(
+                    f"✅ FAQ resuelta sin búsqueda: {faq_match.category} "
+                    f"({faq_match.method}, confianza: {faq_match.confidence})"
+                )
+                state.detected_intent = "info"
+                state.conversation_slots["last_faq_category"] = faq_match.category
+                return self._create_response(
+                    message=self._style_faq_answer(faq_match.response, state),
+                    state=state,
+                    should_transfer=False,
+                    metadata={
+                        "rag_source": "faq_matcher",
+                        "rag_category": faq_match.category,
+                        "rag_score": faq_match.confidence,
+                        "faq_match": faq_match.method,
+                    }
+                )
+            
+            # 2. Buscar en RAG (ChromaDB con embeddings), si el índice ya está listo
+            if not self.rag_service.ready:
+                logger.warning("Índice RAG inicializando: solo lookup léxico de FAQs")
+                rag_results = []
+            else:
+                rag_results = await self.rag_service.search(
+                    query=state.user_query,
+                    k=3  # Top 3 resultados más relevantes
+                )
             
             if not rag_results or len(rag_results) == 0:
                 logger.warning("RAG no encontró resultados relevantes")
@@ -284,7 +403,8 @@ class RetrieverAgent(BaseAgent):
             
             logger.info(
                 f"✅ RAG encontró respuesta: {best_result.category} "
-                f"(score: {best_result.relevance_score}, source: {best_result.source})"
+                f"(score {best_result.score_method}: {best_result.relevance_score}, "
+                f"source: {best_result.source})"
             )
             
             # Formatear respuesta según estilo del usuario
@@ -302,6 +422,7 @@ class RetrieverAgent(BaseAgent):
                     "rag_source": best_result.source,
                     "rag_category": best_result.category,
                     "rag_score": best_result.relevance_score,
+                    "rag_score_method": best_result.score_method,
                 }
             )
             
@@ -318,15 +439,18 @@ class RetrieverAgent(BaseAgent):
     
     def _format_faq_response(self, rag_result, state: AgentState) -> str:
         """Formatea la respuesta de RAG según el estilo del usuario."""
-        # Extraer la respuesta del contenido RAG
-        content = rag_result.content
-        
-        # Si viene del FAQ, extraer solo la respuesta (después de "Respuesta:")
-        if "Respuesta:" in content:
-            response_text = content.split("Respuesta:", 1)[1].strip()
+        # Las FAQs traen la respuesta canónica en la metadata
+        if rag_result.response:
+            response_text = rag_result.response
+        elif "Respuesta:" in rag_result.content:
+            response_text = rag_result.content.split("Respuesta:", 1)[1].strip()
         else:
-            response_text = content
+            response_text = rag_result.content
         
+        return self._style_faq_answer(response_text, state)
+    
+    def _style_faq_answer(self, response_text: str, state: AgentState) -> str:
+        """Adapta una respuesta de FAQ al estilo del usuario."""
         style = state.user_style or "neutral"
         
         # Adaptar tono según estilo
@@ -470,39 +594,13 @@ class RetrieverAgent(BaseAgent):
         Extrae términos significativos de búsqueda.
         Filtra stopwords y palabras cortas.
         """
-        stopwords = {
-            "el",
-            "la",
-            "de",
-            "que",
-            "y",
-            "un",
-            "una",
-            "en",
-            "a",
-            "los",
-            "las",
-            "del",
-            "por",
-            "para",
-            "con",
-            "me",
-            "mi",
-            "tu",
-            "hay",
-            "tiene",
-            "tienes",
-            "quiero",
-            "busco",
-            "mostrar",
-            "ver",
-        }
-
-        words = query.lower().split()
+        # Se conserva la palabra original (con tildes) para el ILIKE, pero
+        # la comparación con stopwords se hace sobre la forma normalizada
+        words = _WORD_RE.findall(query.lower())
         significant_words = [
             word
             for word in words
-            if len(word) > 2 and word not in stopwords
+            if len(word) > 2 and fold_accents(word) not in SEARCH_STOPWORDS
         ]
 
         # Si no hay palabras significativas, usar todas
@@ -5,7 +5,7 @@ NUEVO FLUJO: El Agente 2 envía un guión con códigos de barras.
 Este agente recibe los productos, compara, analiza descuentos/promociones,
 y persuade cuál es la mejor opción para el usuario.
 """
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Union
 import asyncio
 from loguru import logger
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -14,6 +14,7 @@ from backend.agents.base import BaseAgent
 from backend.domain.agent_schemas import AgentState, AgentResponse
 from backend.domain.guion_schemas import GuionEntrada
 from backend.llm.provider import LLMProvider
+from backend.nlp.lexicon import get_lexicon
 from backend.services.rag_service import RAGService
 from backend.services.product_service import ProductService
 from backend.services.product_comparison_service import ProductComparisonService
@@ -66,17 +67,8 @@ class SalesAgent(BaseAgent):
         if state.detected_intent in ["persuasion", "info", "recomendacion"]:
             return True
 
-        # Palabras clave de comparación/recomendación
-        persuasion_keywords = [
-            "cual es mejor", "cual me recomiendas", "que diferencia",
-            "cual elegir", "no se cual", "comparar", "versus",
-            "por que este", "vale la pena", "mejor opcion",
-            "descuento", "oferta", "promocion", "mas barato",
-            "ahorro", "rebaja"
-        ]
-
-        query_lower = state.user_query.lower()
-        return any(keyword in query_lower for keyword in persuasion_keywords)
+        # Palabras clave de comparación/recomendación (léxico compilado)
+        return get_lexicon().scan(state.user_query).has("sales.persuasion")
 
     async def process(self, state: AgentState) -> AgentResponse:
         """
@@ -213,13 +205,65 @@ class SalesAgent(BaseAgent):
         Procesa preguntas generales cuando no hay guion.
         Usa RAG para FAQs y el LLM para responder.
         """
+        messages = await self._build_mensajes_pregunta_general(state)
+        
+        # Llamar al LLM
+        try:
+            response = await self.llm_provider.ainvoke(messages, call_site="general")
+            mensaje = response.content.strip()
+        except asyncio.TimeoutError:
+            mensaje = self._get_timeout_message(state)
+        
+        return self._finalizar_pregunta_general(state, mensaje)
+
+    def can_stream(self, state: AgentState) -> bool:
+        """Solo las preguntas generales se generan token a token (el guion no)."""
+        return not (hasattr(state, 'guion_agente2') and state.guion_agente2)
+
+    async def stream_pregunta_general(
+        self, state: AgentState
+    ) -> AsyncIterator[Union[str, AgentResponse]]:
+        """
+        Versión streaming de _procesar_pregunta_general (usa astream del proveedor).
+
+        Emite cada fragmento de texto a medida que el LLM lo genera y, al
+        final, el AgentResponse completo (con el historial ya actualizado).
+        El timeout aplica a la espera de CADA fragmento, no a la respuesta total.
+        """
+        messages = await self._build_mensajes_pregunta_general(state)
+
+        partes: List[str] = []
+        chunk_timeout = self.llm_provider.profile_for("general").timeout
+        stream = self.llm_provider.astream(messages, call_site="general").__aiter__()
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=chunk_timeout)
+                except StopAsyncIteration:
+                    break
+                texto = chunk.content if isinstance(chunk.content, str) else ""
+                if texto:
+                    partes.append(texto)
+                    yield texto
+        except asyncio.TimeoutError:
+            logger.warning("⏱️ [LLM TIMEOUT] Stream interrumpido")
+            if not partes:
+                fallback = self._get_timeout_message(state)
+                partes.append(fallback)
+                yield fallback
+        finally:
+            await stream.aclose()
+
+        yield self._finalizar_pregunta_general(state, "".join(partes).strip())
+
+    async def _build_mensajes_pregunta_general(self, state: AgentState) -> list:
+        """System prompt + contexto RAG (si aplica) + pregunta del usuario."""
         # Construir system prompt
         system_prompt = self._build_system_prompt_simple(state)
         
         # Consultar RAG si es necesario
         contexto_rag = ""
-        if any(palabra in state.user_query.lower() for palabra in 
-               ["política", "devolución", "garantía", "envío", "hora"]):
+        if get_lexicon().scan(state.user_query).has("sales.rag"):
             try:
                 rag_results = await self.rag_service.get_context_for_query(
                     state.user_query, max_results=2
@@ -228,23 +272,19 @@ class SalesAgent(BaseAgent):
             except Exception as e:
                 logger.warning(f"RAG no disponible: {e}")
         
-        # Construir mensajes
-        messages = [
+        # Turnos antiguos ya compactados (el historial crudo está acotado)
+        if state.conversation_summary:
+            contexto_rag = (
+                f"Resumen de la conversación:\n{state.conversation_summary}\n\n{contexto_rag}"
+            )
+        
+        return [
             SystemMessage(content=system_prompt),
             HumanMessage(content=f"{contexto_rag}\n\nPregunta: {state.user_query}")
         ]
-        
-        # Llamar al LLM
-        try:
-            response = await asyncio.wait_for(
-                self.llm_provider.model.ainvoke(messages),
-                timeout=10.0
-            )
-            mensaje = response.content.strip()
-        except asyncio.TimeoutError:
-            mensaje = self._get_timeout_message(state)
-        
-        # Actualizar historial
+
+    def _finalizar_pregunta_general(self, state: AgentState, mensaje: str) -> AgentResponse:
+        """Actualiza el historial y arma la respuesta final."""
         state = self._add_to_history(state, "user", state.user_query)
         state = self._add_to_history(state, "assistant", mensaje)
         
@@ -293,10 +333,7 @@ class SalesAgent(BaseAgent):
         logger.debug(f"📝 [LLM USER CONTEXT]\n{contexto_producto}")
 
         try:
-            response = await asyncio.wait_for(
-                self.llm_provider.model.ainvoke(messages),
-                timeout=10.0
-            )
+            response = await self.llm_provider.ainvoke(messages, call_site="recommendation")
             mensaje_generado = response.content.strip()
 
             # Log de salida del LLM
@@ -443,10 +480,7 @@ Responde en 2-3 oraciones mencionando los productos disponibles y pregunta cuál
         ]
         
         try:
-            response = await asyncio.wait_for(
-                self.llm_provider.model.ainvoke(messages),
-                timeout=8.0
-            )
+            response = await self.llm_provider.ainvoke(messages, call_site="format_productos")
             return response.content.strip()
         except:
             # Fallback simple
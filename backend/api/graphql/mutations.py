@@ -31,6 +31,7 @@ from backend.api.graphql.types import (
     RecomendacionResponse,
     ProductComparisonType,
     ContinuarConversacionResponse,
+    KnowledgeBaseReloadResponse,
 )
 from backend.services.user_service import UserService, UserAlreadyExistsError, UserNotFoundError
 from backend.services.order_service import OrderService, OrderServiceError, InsufficientStockError, ProductNotFoundError
@@ -39,7 +40,9 @@ from backend.services.product_comparison_service import ProductComparisonService
 from backend.services.session_service import SessionService
 from backend.services.chat_history_service import ChatHistoryService
 from backend.services.elevenlabs_service import ElevenLabsService
+from backend.services.rag_service import RAGService
 from backend.llm.provider import LLMProvider
+from backend.nlp.lexicon import get_lexicon
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from backend.domain.order_schemas import OrderCreate, OrderDetailCreate
 from backend.domain.agent_schemas import AgentState
@@ -246,6 +249,67 @@ class BusinessMutation:
                 error="internal_error"
             )
     
+    # ========================================================================
+    # BASE DE CONOCIMIENTO (ADMIN)
+    # ========================================================================
+    
+    @strawberry.mutation
+    @inject
+    async def reload_knowledge_base(
+        self,
+        info: Info,
+        rag_service: Annotated[RAGService, Inject],
+        full: bool = False
+    ) -> KnowledgeBaseReloadResponse:
+        """
+        Recarga el índice RAG desde backend/data/app/ sin cortar las búsquedas.
+        
+        Requiere rol admin. Con full=true re-embebe toda la base.
+        
+        Mutation: mutation { reloadKnowledgeBase { success added removed totalDocuments } }
+        """
+        current_user = get_current_user(info)
+        if not current_user or current_user.get("role") != 1:
+            return KnowledgeBaseReloadResponse(
+                success=False,
+                message="Solo un administrador puede recargar la base de conocimiento",
+                error="unauthorized"
+            )
+        
+        try:
+            plan = await rag_service.reload_index(full=full)
+        except ValueError as e:
+            logger.error(f"Recarga de la base de conocimiento rechazada: {e}")
+            return KnowledgeBaseReloadResponse(
+                success=False,
+                message=str(e),
+                error="invalid_index"
+            )
+        except Exception as e:
+            logger.error(f"Error recargando la base de conocimiento: {e}", exc_info=True)
+            return KnowledgeBaseReloadResponse(
+                success=False,
+                message="Error interno del servidor",
+                error="internal_error"
+            )
+        
+        total = rag_service.get_stats()["total_documents"]
+        if plan is None:
+            return KnowledgeBaseReloadResponse(
+                success=True,
+                message="La base de conocimiento no tiene cambios",
+                unchanged=total,
+                total_documents=total
+            )
+        return KnowledgeBaseReloadResponse(
+            success=True,
+            message="Base de conocimiento recargada",
+            added=len(plan.to_add),
+            removed=len(plan.to_delete),
+            unchanged=plan.unchanged,
+            total_documents=total
+        )
+    
     # ========================================================================
     # NUEVO: PROCESAMIENTO DE GUION DEL AGENTE 2
     # ========================================================================
@@ -477,7 +541,7 @@ class BusinessMutation:
                     SystemMessage(content=system_prompt),
                     HumanMessage(content=user_prompt)
                 ]
-                response = await llm_provider.model.ainvoke(messages)
+                response = await llm_provider.ainvoke(messages, call_site="guion")
                 mensaje = response.content.strip()
             except Exception as e:
                 logger.warning(f"LLM no disponible para mensaje persuasivo: {e}")
@@ -693,16 +757,11 @@ class BusinessMutation:
             
             session_data = json.loads(session_json)
             
-            # Analizar respuesta del usuario
-            respuesta_lower = respuesta_usuario.lower().strip()
-            
-            # Detectar aprobación
-            palabras_aprobacion = ['si', 'sí', 'yes', 'ok', 'dale', 'va', 'claro', 'perfecto', 'bueno']
-            es_aprobacion = any(palabra in respuesta_lower for palabra in palabras_aprobacion)
-            
-            # Detectar rechazo
-            palabras_rechazo = ['no', 'nop', 'nope', 'nah', 'otra', 'diferente', 'siguiente']
-            es_rechazo = any(palabra in respuesta_lower for palabra in palabras_rechazo)
+            # Analizar respuesta del usuario (un solo escaneo del léxico:
+            # palabras completas, así "bueno" ya no cuenta como rechazo por "no")
+            respuesta_scan = get_lexicon().scan(respuesta_usuario)
+            es_aprobacion = respuesta_scan.has("reply.approval")
+            es_rechazo = respuesta_scan.has("reply.rejection")
             
             # Si es aprobación → Solicitar datos de envío
             if es_aprobacion:
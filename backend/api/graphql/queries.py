@@ -36,11 +36,22 @@ def extract_token_from_request(info: Info) -> Optional[str]:
     Extrae el token JWT del header Authorization si existe.
     Retorna None si no hay token o está mal formado.
     """
+    auth_header = ""
     request = info.context.get("request")
-    if request is None:
-        return None
-    
-    auth_header = request.headers.get("Authorization", "")
+    if request is not None:
+        auth_header = request.headers.get("Authorization", "")
+
+    # Subscriptions por WebSocket: el navegador no puede mandar headers,
+    # el token viaja en el payload de connection_init
+    if not auth_header:
+        connection_params = info.context.get("connection_params") or {}
+        if isinstance(connection_params, dict):
+            auth_header = (
+                connection_params.get("Authorization")
+                or connection_params.get("authorization")
+                or ""
+            )
+
     if not auth_header.startswith("Bearer "):
         return None
     
@@ -0,0 +1,142 @@
+"""
+Suscripciones GraphQL (Streaming).
+El Frontend recibe la respuesta de Alex a medida que se genera.
+"""
+from typing import Annotated, AsyncGenerator
+
+import strawberry
+from aioinject import Inject
+from aioinject.ext.strawberry import inject
+from loguru import logger
+from strawberry.types import Info
+
+from backend.api.graphql.queries import get_current_user
+from backend.api.graphql.types import ChatStreamEvent
+from backend.domain.agent_schemas import AgentStreamEvent
+from backend.services.elevenlabs_service import ElevenLabsService
+from backend.services.search_service import SearchService
+
+
+@strawberry.type
+class BusinessSubscription:
+    """Raiz de todas las suscripciones."""
+
+    # ========================================================================
+    # CHAT/AGENTE (STREAMING)
+    # ========================================================================
+
+    @strawberry.subscription
+    @inject
+    async def semantic_search_stream(
+        self,
+        query: str,
+        search_service: Annotated[SearchService, Inject],
+        elevenlabs_service: Annotated[ElevenLabsService, Inject],
+        info: Info,
+        session_id: str | None = None,
+        with_audio: bool = False
+    ) -> AsyncGenerator[ChatStreamEvent, None]:
+        """
+        Chat con Alex en streaming: los tokens llegan a medida que el LLM los genera.
+
+        Requiere: header Authorization: Bearer <token> (o connectionParams
+        {"Authorization": "Bearer <token>"} en WebSocket)
+
+        Subscription:
+            subscription {
+              semanticSearchStream(query: "Cual me recomiendas?", sessionId: "user123") {
+                event delta agent intent answer error
+              }
+            }
+
+        Eventos:
+            metadata → agente/intención/estilo (antes del primer token)
+            token    → fragmento del mensaje (delta)
+            done     → mensaje completo (answer) ya persistido en el historial;
+                       con withAudio=true incluye audio_url (ElevenLabs)
+            error    → error + mensaje amigable en answer
+        """
+        user = get_current_user(info)
+        if user is None:
+            logger.warning("Intento de acceso sin autenticacion a semantic_search_stream")
+            yield ChatStreamEvent(
+                event="error",
+                session_id=session_id,
+                answer="Debes iniciar sesion para usar el chat.",
+                error="unauthorized"
+            )
+            return
+
+        logger.info(
+            f"GraphQL: Chat con Alex (stream) -> '{query}' "
+            f"(session: {session_id}, usuario={user.get('username')})"
+        )
+
+        try:
+            async for event in search_service.semantic_search_stream(
+                query,
+                session_id=session_id,
+                user_id=user.get('id')
+            ):
+                audio_url = None
+                if event.type == "done" and with_audio and event.response:
+                    audio_url = await _synthesize(elevenlabs_service, event.response.message)
+                yield _to_graphql_event(event, session_id, audio_url)
+
+        except Exception as e:
+            logger.error(
+                f"Error inesperado en semantic_search_stream: '{query[:50]}...': {str(e)}",
+                exc_info=True
+            )
+            yield ChatStreamEvent(
+                event="error",
+                session_id=session_id,
+                answer=(
+                    "Disculpa, tuve un problema tecnico. "
+                    "Nuestro equipo ha sido notificado. "
+                    "Por favor intenta nuevamente."
+                ),
+                error="internal_error"
+            )
+
+
+def _to_graphql_event(
+    event: AgentStreamEvent, session_id: str | None, audio_url: str | None = None
+) -> ChatStreamEvent:
+    """Convierte un evento del orquestador al tipo GraphQL."""
+    if event.type == "done":
+        return ChatStreamEvent(
+            event="done",
+            session_id=session_id,
+            agent=event.agent,
+            intent=event.response.state.detected_intent if event.response else None,
+            user_style=event.response.state.user_style if event.response else None,
+            answer=event.response.message if event.response else None,
+            audio_url=audio_url
+        )
+    if event.type == "error":
+        return ChatStreamEvent(
+            event="error",
+            session_id=session_id,
+            answer=event.delta,
+            error="internal_error"
+        )
+    return ChatStreamEvent(
+        event=event.type,
+        session_id=session_id,
+        agent=event.agent,
+        intent=event.intent,
+        user_style=event.user_style,
+        delta=event.delta
+    )
+
+
+async def _synthesize(elevenlabs_service: ElevenLabsService, text: str) -> str | None:
+    """Genera el audio de la respuesta completa (no bloquea el stream de texto)."""
+    try:
+        audio_bytes = await elevenlabs_service.text_to_speech(text)
+        if audio_bytes:
+            return elevenlabs_service.audio_to_data_url(audio_bytes)
+    except Exception as audio_err:
+        logger.warning(f"⚠️ Error generando audio: {type(audio_err).__name__}: {audio_err}")
+    return None
@@ -235,6 +235,25 @@ class SemanticSearchResponse:
     audio_url: Optional[str] = None
 
 
+@strawberry.type
+class ChatStreamEvent:
+    """
+    Evento del chat en streaming (subscription semanticSearchStream).
+
+    Orden: "metadata" (agente/intención/estilo) → "token" (fragmentos) →
+    "done" (respuesta completa) o "error".
+    """
+    event: str
+    session_id: Optional[str] = None
+    agent: Optional[str] = None
+    intent: Optional[str] = None
+    user_style: Optional[str] = None
+    delta: Optional[str] = None
+    answer: Optional[str] = None
+    error: Optional[str] = None
+    audio_url: Optional[str] = None
+
+
 @strawberry.type
 class ProductRecognitionResponse:
     """Respuesta del reconocimiento de producto por imagen."""
@@ -264,6 +283,18 @@ class AuthResponse:
     error: Optional[str] = None
 
 
+@strawberry.type
+class KnowledgeBaseReloadResponse:
+    """Respuesta de la recarga en caliente de la base de conocimiento."""
+    success: bool
+    message: str
+    added: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    total_documents: int = 0
+    error: Optional[str] = None
+
+
 @strawberry.type
 class ContinuarConversacionResponse:
     """Respuesta de continuar conversación del guion."""
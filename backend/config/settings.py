@@ -24,6 +24,115 @@ class BusinessSettings(BaseSettings):
     # Flags del sistema
     log_level: str = "INFO"
 
+    # Detección de estilo/intención: una sola llamada LLM por turno
+    llm_turn_analysis: bool = Field(default=True, alias="LLM_TURN_ANALYSIS")
+
+    # Clasificador de intención local (nivel 1 de la cascada, antes del LLM)
+    intent_model_enabled: bool = Field(default=True, alias="INTENT_MODEL_ENABLED")
+    intent_model_path: str = Field(default="backend/data/models", alias="INTENT_MODEL_PATH")
+    intent_model_threshold: float = Field(default=0.75, alias="INTENT_MODEL_THRESHOLD")
+
+    # Caché de clasificaciones de intención (LRU en proceso + Redis con TTL)
+    intent_cache_enabled: bool = Field(default=True, alias="INTENT_CACHE_ENABLED")
+    intent_cache_ttl: int = Field(default=86400, alias="INTENT_CACHE_TTL")
+    intent_cache_max_entries: int = Field(default=1024, alias="INTENT_CACHE_MAX_ENTRIES")
+    # Lookup semántico con el modelo de embeddings del RAG (una llamada de embedding por miss)
+    intent_cache_semantic: bool = Field(default=False, alias="INTENT_CACHE_SEMANTIC")
+    intent_cache_similarity: float = Field(default=0.92, alias="INTENT_CACHE_SIMILARITY")
+
+    # Búsqueda SQL especulativa en paralelo a la clasificación de intención
+    speculative_search: bool = Field(default=True, alias="SPECULATIVE_SEARCH")
+
+    # Caché de respuestas del LLM: "none" (default), "memory" o "redis"
+    llm_cache_backend: str = Field(default="none", alias="LLM_CACHE_BACKEND")
+    llm_cache_ttl: int = Field(default=3600, alias="LLM_CACHE_TTL")
+    llm_cache_max_entries: int = Field(default=512, alias="LLM_CACHE_MAX_ENTRIES")
+    # TTL por call site, JSON: {"general": 0, "intent": 43200}
+    llm_cache_call_site_ttls: dict[str, int] = Field(
+        default_factory=dict, alias="LLM_CACHE_CALL_SITE_TTLS"
+    )
+
+    # Cuota hacia Vertex AI (0 = sin límite)
+    llm_max_concurrency: int = Field(default=8, alias="LLM_MAX_CONCURRENCY")
+    llm_requests_per_minute: int = Field(default=0, alias="LLM_REQUESTS_PER_MINUTE")
+    llm_max_retries: int = Field(default=2, alias="LLM_MAX_RETRIES")
+    llm_retry_base_delay: float = Field(default=0.5, alias="LLM_RETRY_BASE_DELAY")
+    llm_max_queue_wait: float = Field(default=0.0, alias="LLM_MAX_QUEUE_WAIT")
+    # Overrides de perfiles de generación, JSON: {"classify": {"model": "gemini-2.5-flash"}}
+    llm_profiles: dict[str, dict] = Field(default_factory=dict, alias="LLM_PROFILES")
+
+    # Historial de conversación acotado (turnos antiguos → conversation_summary)
+    history_max_messages: int = Field(default=12, alias="HISTORY_MAX_MESSAGES")
+    history_token_budget: int = Field(default=1500, alias="HISTORY_TOKEN_BUDGET")
+    history_keep_recent: int = Field(default=6, alias="HISTORY_KEEP_RECENT")
+    history_summary_tokens: int = Field(default=300, alias="HISTORY_SUMMARY_TOKENS")
+    # "extractive" (sin LLM) o "llm" (perfil summarize)
+    history_summary_mode: str = Field(default="extractive", alias="HISTORY_SUMMARY_MODE")
+
+    # Búsqueda de productos: "fts" (tsvector + ts_rank, requiere migrate_db_add_fulltext_search.py) o "ilike"
+    product_search_mode: str = Field(default="fts", alias="PRODUCT_SEARCH_MODE")
+    # Respaldo tolerante a errores de tipeo (pg_trgm, requiere migrate_db_add_trigram_search.py)
+    product_fuzzy_search: bool = Field(default=True, alias="PRODUCT_FUZZY_SEARCH")
+    product_fuzzy_threshold: float = Field(default=0.3, alias="PRODUCT_FUZZY_THRESHOLD")
+    # Catálogo en memoria (BM25) para RetrieverAgent/ProductSearchTool, refrescado por
+    # LISTEN/NOTIFY (migrate_db_add_catalog_notify.py) y polling cada N segundos
+    product_catalog_engine: bool = Field(default=False, alias="PRODUCT_CATALOG_ENGINE")
+    product_catalog_refresh_interval: float = Field(default=30.0, alias="PRODUCT_CATALOG_REFRESH_INTERVAL")
+    # Marcas/categorías del parser de búsquedas: se releen cada N segundos (0 = solo al arrancar)
+    query_vocabulary_refresh_interval: float = Field(default=300.0, alias="QUERY_VOCABULARY_REFRESH_INTERVAL")
+
+    # Búsqueda RAG: búsquedas simultáneas y threads para las consultas a Chroma
+    rag_max_concurrency: int = Field(default=4, alias="RAG_MAX_CONCURRENCY")
+    rag_search_workers: int = Field(default=4, alias="RAG_SEARCH_WORKERS")
+    # Índice vectorial: "chroma" o "numpy" (matriz en memoria, sin SQLite por consulta)
+    rag_vector_backend: str = Field(default="chroma", alias="RAG_VECTOR_BACKEND")
+    # Documentos por llamada de embeddings al indexar la base de conocimiento
+    rag_index_batch_size: int = Field(default=64, alias="RAG_INDEX_BATCH_SIZE")
+    # Construir el índice en segundo plano (el arranque no espera a Vertex AI; ver /health)
+    rag_background_init: bool = Field(default=True, alias="RAG_BACKGROUND_INIT")
+    # Segundos entre chequeos de cambios en backend/data/app/ (0 = sin recarga automática)
+    rag_watch_interval: float = Field(default=0, alias="RAG_WATCH_INTERVAL")
+    # Recuperación: "vector" o "hybrid" (BM25 + vectores con RRF; sin embedding si BM25 es concluyente)
+    rag_search_mode: str = Field(default="vector", alias="RAG_SEARCH_MODE")
+    rag_lexical_threshold: float = Field(default=0.8, alias="RAG_LEXICAL_THRESHOLD")
+    # FAQs respondidas directo desde los patterns de faqs.csv (sin búsqueda semántica)
+    faq_matcher_enabled: bool = Field(default=True, alias="FAQ_MATCHER_ENABLED")
+    faq_match_threshold: float = Field(default=0.75, alias="FAQ_MATCH_THRESHOLD")
+    # Caché de embeddings de queries (LRU + Redis)
+    embedding_cache_enabled: bool = Field(default=True, alias="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_max_entries: int = Field(default=2048, alias="EMBEDDING_CACHE_MAX_ENTRIES")
+    embedding_cache_ttl: int = Field(default=604800, alias="EMBEDDING_CACHE_TTL")
+
+    # Backends offline (load testing / profiling sin red)
+    # LLM_BACKEND: vertex | fake | record | replay
+    # EMBEDDINGS_BACKEND: vertex | hashing | record | replay
+    # TTS_BACKEND: elevenlabs | fake | record | replay
+    llm_backend: str = Field(default="vertex", alias="LLM_BACKEND")
+    embeddings_backend: str = Field(default="vertex", alias="EMBEDDINGS_BACKEND")
+    tts_backend: str = Field(default="elevenlabs", alias="TTS_BACKEND")
+    # Latencias simuladas, JSON: {"kind": "lognormal", "mean_ms": 600, "stddev_ms": 250}
+    fake_llm_latency: dict = Field(
+        default_factory=lambda: {"kind": "lognormal", "mean_ms": 600, "stddev_ms": 250},
+        alias="FAKE_LLM_LATENCY",
+    )
+    fake_llm_chunk_latency: dict = Field(
+        default_factory=lambda: {"kind": "normal", "mean_ms": 30, "stddev_ms": 10},
+        alias="FAKE_LLM_CHUNK_LATENCY",
+    )
+    fake_embeddings_latency: dict = Field(
+        default_factory=lambda: {"kind": "normal", "mean_ms": 80, "stddev_ms": 20},
+        alias="FAKE_EMBEDDINGS_LATENCY",
+    )
+    fake_tts_latency: dict = Field(
+        default_factory=lambda: {"kind": "lognormal", "mean_ms": 1200, "stddev_ms": 400},
+        alias="FAKE_TTS_LATENCY",
+    )
+    fake_tts_audio_bytes: int = Field(default=32000, alias="FAKE_TTS_AUDIO_BYTES")
+    # Cassettes de record/replay (llm.jsonl, embeddings.jsonl, tts.jsonl)
+    cassette_dir: str = Field(default="backend/data/cassettes", alias="CASSETTE_DIR")
+    # Velocidad de reproducción de latencias grabadas (0 = sin espera)
+    cassette_replay_speed: float = Field(default=1.0, alias="CASSETTE_REPLAY_SPEED")
+
     # ElevenLabs TTS
     elevenlabs_api_key: str | None = Field(
         default=None,
@@ -5,6 +5,7 @@ Aquí es donde "fabricamos" y conectamos todos los servicios de la aplicación.
 import functools
 import dotenv
 from collections.abc import Iterable
+from pathlib import Path
 from typing import Any
 
 import aioinject
@@ -13,21 +14,33 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 # Cargar variables de entorno al inicio del container
 dotenv.load_dotenv()
 
+from backend.config import get_business_settings
 from backend.database.session import get_session_factory
-from backend.llm.provider import LLMProvider, create_llm_provider
+from backend.llm.cache import MemoryLLMCache, RedisLLMCache
+from backend.llm.provider import LLMProvider, build_vertex_model, create_llm_provider
+from backend.nlp.intent_model import load_intent_model
+from backend.services.catalog_search import CatalogSearchEngine
 from backend.services.order_service import OrderService
 from backend.services.product_service import ProductService
 from backend.services.search_service import SearchService
 from backend.services.tenant_data_service import TenantDataService
-from backend.services.rag_service import RAGService
+from backend.services.rag_service import RAGService, create_vertex_embeddings
 from backend.services.session_service import SessionService, create_redis_client
 from backend.services.user_service import UserService
 from backend.services.chat_history_service import ChatHistoryService
+from backend.services.classification_cache import ClassificationCache
+from backend.services.embedding_cache import EmbeddingCache
+from backend.services.history_manager import ConversationHistoryManager, make_llm_summarizer
 from backend.services.elevenlabs_service import ElevenLabsService
 from backend.config.redis_config import RedisSettings, get_redis_settings
 from backend.agents.retriever_agent import RetrieverAgent
 from backend.agents.sales_agent import SalesAgent
 from backend.agents.orchestrator import AgentOrchestrator
+from backend.offline.cassette import Cassette
+from backend.offline.chat import FakeChatModel, RecordingChatModel, ReplayChatModel
+from backend.offline.embeddings import HashingEmbeddings, RecordingEmbeddings, ReplayEmbeddings
+from backend.offline.latency import LatencyModel
+from backend.offline.tts import FakeTTSService, RecordingTTSService, ReplayTTSService
 
 import redis.asyncio as redis
 from loguru import logger
@@ -45,7 +58,22 @@ async def create_product_service(
     session_factory: async_sessionmaker[AsyncSession],
 ) -> ProductService:
     """Fabrica el servicio de inventario conectándolo a la DB."""
-    return ProductService(session_factory)
+    settings = get_business_settings()
+    catalog = None
+    if settings.product_catalog_engine:
+        # Se carga en segundo plano; hasta entonces las búsquedas van a la DB
+        catalog = CatalogSearchEngine(
+            session_factory,
+            refresh_interval=settings.product_catalog_refresh_interval,
+        )
+        catalog.start()
+    return ProductService(
+        session_factory,
+        search_mode=settings.product_search_mode.lower(),
+        fuzzy_search=settings.product_fuzzy_search,
+        fuzzy_threshold=settings.product_fuzzy_threshold,
+        catalog=catalog,
+    )
 
 async def create_order_service(
     session_factory: async_sessionmaker[AsyncSession],
@@ -65,20 +93,153 @@ async def create_chat_history_service(
     """Fabrica el servicio de historial de chat conectándolo a la DB."""
     return ChatHistoryService(session_factory)
 
-async def create_llm_provider_instance() -> LLMProvider:
-    """Fabrica el proveedor de IA (Gemini)."""
-    return create_llm_provider()
+async def create_llm_provider_instance(
+    redis_client: redis.Redis,
+) -> LLMProvider:
+    """
+    Fabrica el proveedor de IA (Gemini).
+
+    LLM_CACHE_BACKEND=memory|redis activa la caché de respuestas
+    (con redis sin conexión se usa memoria).
+    """
+    settings = get_business_settings()
+    backend = settings.llm_cache_backend.lower()
+
+    cache = None
+    if backend == "redis" and redis_client is not None:
+        cache = RedisLLMCache(redis_client)
+    elif backend in ("memory", "redis"):
+        cache = MemoryLLMCache(max_entries=settings.llm_cache_max_entries)
 
-async def create_rag_service() -> RAGService:
-    """Fabrica el servicio RAG (búsqueda semántica)."""
-    return RAGService()
+    if cache is not None:
+        logger.info(f"💾 Caché de respuestas LLM habilitada (backend={cache.name})")
+    return create_llm_provider(cache=cache, model_factory=_chat_model_factory(settings))
+
+async def create_rag_service(redis_client: redis.Redis) -> RAGService:
+    """
+    Fabrica el servicio RAG (búsqueda semántica).
+
+    EMBEDDINGS_BACKEND=hashing usa embeddings locales con su propio ChromaDB;
+    record/replay comparten el índice de Vertex AI (los vectores son reales).
+    Los embeddings de queries se cachean (LRU + Redis si está disponible).
+    Con RAG_BACKGROUND_INIT (default) el índice se construye en segundo plano;
+    con RAG_WATCH_INTERVAL > 0 se recarga solo al cambiar los CSVs.
+    """
+    settings = get_business_settings()
+    backend = settings.embeddings_backend.lower()
+    model_name = "text-embedding-004"
+
+    embeddings = None
+    persist_directory = None
+    if backend == "hashing":
+        logger.info("🧪 Embeddings offline (hashing)")
+        embeddings = HashingEmbeddings(
+            latency=LatencyModel.from_config(settings.fake_embeddings_latency)
+        )
+        persist_directory = Path("backend/data/chromadb_hashing")
+        model_name = f"hashing-{embeddings.dimensions}"
+    elif backend == "record":
+        logger.info("📼 Grabando embeddings de Vertex AI")
+        embeddings = RecordingEmbeddings(
+            create_vertex_embeddings(), _offline_cassette(settings, "embeddings"), model_name
+        )
+    elif backend == "replay":
+        logger.info("📼 Reproduciendo embeddings grabados")
+        embeddings = ReplayEmbeddings(
+            _offline_cassette(settings, "embeddings"), model_name, HashingEmbeddings()
+        )
+
+    embedding_cache = None
+    if settings.embedding_cache_enabled:
+        embedding_cache = EmbeddingCache(
+            model_id=model_name,
+            redis_client=redis_client,
+            max_entries=settings.embedding_cache_max_entries,
+            ttl_seconds=settings.embedding_cache_ttl,
+        )
+
+    rag_service = RAGService(
+        embeddings=embeddings,
+        persist_directory=persist_directory,
+        max_concurrency=settings.rag_max_concurrency,
+        search_workers=settings.rag_search_workers,
+        embedding_cache=embedding_cache,
+        vector_backend=settings.rag_vector_backend.lower(),
+        embedding_model=model_name,
+        index_batch_size=settings.rag_index_batch_size,
+        search_mode=settings.rag_search_mode.lower(),
+        lexical_threshold=settings.rag_lexical_threshold,
+        faq_matcher_enabled=settings.faq_matcher_enabled,
+        faq_match_threshold=settings.faq_match_threshold,
+        background_init=settings.rag_background_init,
+    )
+    if settings.rag_background_init:
+        rag_service.start_background_init()
+    if settings.rag_watch_interval > 0:
+        rag_service.start_watching(settings.rag_watch_interval)
+    return rag_service
 
 
 async def create_elevenlabs_service() -> ElevenLabsService:
-    """Fabrica el servicio de Text-to-Speech."""
+    """Fabrica el servicio de Text-to-Speech (TTS_BACKEND=fake|record|replay para offline)."""
+    settings = get_business_settings()
+    backend = settings.tts_backend.lower()
+    latency = LatencyModel.from_config(settings.fake_tts_latency)
+
+    if backend == "fake":
+        logger.info("🧪 TTS offline (fake)")
+        return FakeTTSService(audio_bytes=settings.fake_tts_audio_bytes, latency=latency)
+    if backend == "record":
+        logger.info("📼 Grabando audio de ElevenLabs")
+        return RecordingTTSService(_offline_cassette(settings, "tts"))
+    if backend == "replay":
+        logger.info("📼 Reproduciendo audio grabado")
+        return ReplayTTSService(
+            _offline_cassette(settings, "tts"),
+            voice_id=settings.elevenlabs_voice_id,
+            audio_bytes=settings.fake_tts_audio_bytes,
+            latency=latency,
+        )
     return ElevenLabsService()
 
 
+# === Backends offline ===
+
+
+_cassettes: dict[Path, Cassette] = {}
+
+
+def _offline_cassette(settings, name: str) -> Cassette:
+    """Un cassette por tipo de backend (compartido si se pide más de una vez)."""
+    path = Path(settings.cassette_dir) / f"{name}.jsonl"
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path, speed=settings.cassette_replay_speed)
+    return _cassettes[path]
+
+
+def _chat_model_factory(settings):
+    """Factory de modelos de chat según LLM_BACKEND (None = Vertex AI)."""
+    backend = settings.llm_backend.lower()
+    latency = LatencyModel.from_config(settings.fake_llm_latency)
+    chunk_latency = LatencyModel.from_config(settings.fake_llm_chunk_latency)
+
+    def fake(profile):
+        return FakeChatModel(profile.model, profile.temperature, latency, chunk_latency)
+
+    if backend == "fake":
+        logger.info("🧪 LLM offline (fake)")
+        return fake
+    if backend == "record":
+        logger.info("📼 Grabando respuestas de Vertex AI")
+        cassette = _offline_cassette(settings, "llm")
+        return lambda profile: RecordingChatModel(build_vertex_model(profile), cassette)
+    if backend == "replay":
+        logger.info("📼 Reproduciendo respuestas grabadas")
+        cassette = _offline_cassette(settings, "llm")
+        return lambda profile: ReplayChatModel(cassette, fake(profile))
+    return None
+
+
 # === Redis y Sesiones ===
 
 
@@ -131,6 +292,7 @@ async def create_search_service(
     session_service: SessionService = None,
     chat_history_service: ChatHistoryService = None,
     session_factory: async_sessionmaker[AsyncSession] = None,
+    history_manager: ConversationHistoryManager = None,
 ) -> SearchService:
     """
     Fabrica el 'Cerebro' (SearchService).
@@ -142,7 +304,53 @@ async def create_search_service(
         orchestrator,
         session_service,
         chat_history_service,
-        session_factory
+        session_factory,
+        history_manager,
+    )
+
+
+async def create_history_manager(llm_provider: LLMProvider) -> ConversationHistoryManager:
+    """
+    Fabrica el manager del historial de conversación.
+
+    Con HISTORY_SUMMARY_MODE=llm los turnos antiguos se resumen con el perfil
+    "summarize"; por defecto el resumen es extractivo (sin llamadas al LLM).
+    """
+    settings = get_business_settings()
+    summarizer = None
+    if settings.history_summary_mode == "llm" and llm_provider is not None:
+        summarizer = make_llm_summarizer(llm_provider)
+    return ConversationHistoryManager(
+        max_messages=settings.history_max_messages,
+        token_budget=settings.history_token_budget,
+        keep_recent=settings.history_keep_recent,
+        summary_token_budget=settings.history_summary_tokens,
+        summarizer=summarizer,
+    )
+
+
+async def create_classification_cache(
+    redis_client: redis.Redis,
+    rag_service: RAGService,
+) -> ClassificationCache:
+    """
+    Fabrica la caché de clasificaciones de intención.
+
+    Si Redis no está disponible queda solo el LRU en proceso. El lookup
+    semántico reutiliza el modelo de embeddings del RAG.
+    """
+    settings = get_business_settings()
+    if not settings.intent_cache_enabled:
+        logger.info("Caché de clasificaciones deshabilitada (INTENT_CACHE_ENABLED=false)")
+        return None
+
+    embed_fn = rag_service.embed_query if settings.intent_cache_semantic else None
+    return ClassificationCache(
+        redis_client=redis_client,
+        max_entries=settings.intent_cache_max_entries,
+        ttl_seconds=settings.intent_cache_ttl,
+        embed_fn=embed_fn,
+        similarity_threshold=settings.intent_cache_similarity,
     )
 
 
@@ -154,7 +362,12 @@ async def create_retriever_agent(
     rag_service: RAGService,
 ) -> RetrieverAgent:
     """Fabrica el Agente Buscador (búsqueda SQL rápida)."""
-    return RetrieverAgent(product_service, rag_service)
+    settings = get_business_settings()
+    retriever_agent = RetrieverAgent(product_service, rag_service)
+    # Marcas y categorías del catálogo para extraer filtros de la query; se
+    # cargan en segundo plano para no bloquear el arranque si la DB no responde
+    retriever_agent.start_vocabulary_refresh(settings.query_vocabulary_refresh_interval)
+    return retriever_agent
 
 
 async def create_sales_agent(
@@ -170,17 +383,32 @@ async def create_orchestrator(
     retriever_agent: RetrieverAgent,
     sales_agent: SalesAgent,
     llm_provider: LLMProvider,
+    classification_cache: ClassificationCache = None,
 ) -> AgentOrchestrator:
     """
     Fabrica el Orquestador de Agentes.
 
     Configurado para usar detección inteligente con LLM Zero-shot por defecto.
+    Con LLM_TURN_ANALYSIS=true (default) estilo e intención salen de una sola llamada.
+    Si existe un modelo de intención local (INTENT_MODEL_PATH), se consulta
+    primero y solo se escala al LLM por debajo de INTENT_MODEL_THRESHOLD.
     """
+    settings = get_business_settings()
+    intent_model = (
+        load_intent_model(settings.intent_model_path)
+        if settings.intent_model_enabled
+        else None
+    )
     return AgentOrchestrator(
         retriever_agent,
         sales_agent,
         llm_provider,
         use_llm_detection=True,  # Detección inteligente habilitada
+        use_turn_analysis=settings.llm_turn_analysis,
+        intent_model=intent_model,
+        intent_model_threshold=settings.intent_model_threshold,
+        classification_cache=classification_cache,
+        speculative_search=settings.speculative_search,
     )
 
 
@@ -205,6 +433,8 @@ def providers() -> Iterable[aioinject.Provider[Any]]:
     providers_list.append(aioinject.Singleton(create_llm_provider_instance))
     providers_list.append(aioinject.Singleton(create_rag_service))
     providers_list.append(aioinject.Singleton(create_elevenlabs_service))
+    providers_list.append(aioinject.Singleton(create_classification_cache))
+    providers_list.append(aioinject.Singleton(create_history_manager))
     providers_list.append(aioinject.Singleton(create_search_service))
 
     # 4. Sistema Multi-Agente
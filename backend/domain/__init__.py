@@ -5,6 +5,9 @@ from backend.domain.agent_schemas import (
     AgentResponse,
     IntentClassification,
     UserStyleProfile,
+    StyleReevaluationPolicy,
+    TurnAnalysis,
+    AgentStreamEvent,
 )
 from backend.domain.order_schemas import (
     OrderCreate,
@@ -18,7 +21,7 @@ from backend.domain.order_schemas import (
     CheckoutResponse,
     OrderStatusTransition,
 )
-from backend.domain.product_schemas import ProductStockSchema
+from backend.domain.product_schemas import ProductSearchFilters, ProductStockSchema
 
 __all__ = [
     # Agent schemas
@@ -26,6 +29,9 @@ __all__ = [
     "AgentResponse",
     "IntentClassification",
     "UserStyleProfile",
+    "StyleReevaluationPolicy",
+    "TurnAnalysis",
+    "AgentStreamEvent",
     # Order schemas
     "OrderCreate",
     "OrderSchema",
@@ -39,4 +45,5 @@ __all__ = [
     "OrderStatusTransition",
     # Product schemas
     "ProductStockSchema",
+    "ProductSearchFilters",
 ]
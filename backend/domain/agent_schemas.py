@@ -6,16 +6,114 @@ from pydantic import BaseModel, Field
 from datetime import datetime, timezone
 
 
+class StyleReevaluationPolicy(BaseModel):
+    """
+    Política de re-evaluación del estilo del usuario.
+
+    El estilo se detecta una vez y se mantiene ("sticky"). Solo se vuelve a
+    evaluar cada N mensajes nuevos o cuando la confianza (que decae con cada
+    mensaje sin re-evaluar) cae bajo el umbral, con un tope por sesión.
+    """
+
+    recheck_every_n_messages: int = 4
+    min_confidence: float = 0.6
+    confidence_decay: float = 0.9  # Factor por mensaje desde la última evaluación
+    max_evaluations: int = 3
+
+
+class UserStyleProfile(BaseModel):
+    """Perfil de estilo de comunicación del usuario."""
+
+    style: Literal["cuencano", "formal", "juvenil", "neutral"]
+    confidence: float
+    detected_patterns: List[str] = Field(default_factory=list)
+    sample_messages: List[str] = Field(default_factory=list)
+    source: Optional[str] = None  # "llm", "turn_analysis", "keywords"
+
+    # Estado persistido en la sesión (política de re-evaluación)
+    sample_count: int = 0  # Mensajes del usuario observados por el perfil
+    evaluations: int = 0  # Veces que se ejecutó el detector de estilo
+    messages_since_evaluation: int = 0
+
+    def register_message(self) -> None:
+        """Registra un nuevo mensaje del usuario sin re-evaluar el estilo."""
+        self.sample_count += 1
+        self.messages_since_evaluation += 1
+
+    def effective_confidence(self, policy: StyleReevaluationPolicy) -> float:
+        """Confianza con decaimiento por los mensajes vistos desde la última evaluación."""
+        return self.confidence * (policy.confidence_decay ** self.messages_since_evaluation)
+
+    def needs_reevaluation(self, policy: StyleReevaluationPolicy) -> bool:
+        """Indica si conviene volver a correr el detector de estilo en este turno."""
+        if self.evaluations == 0:
+            return True
+        if self.evaluations >= policy.max_evaluations:
+            return False
+        if self.messages_since_evaluation >= policy.recheck_every_n_messages:
+            return True
+        return (
+            self.messages_since_evaluation > 0
+            and self.effective_confidence(policy) < policy.min_confidence
+        )
+
+    def merge(
+        self, detected: "UserStyleProfile", policy: StyleReevaluationPolicy
+    ) -> "UserStyleProfile":
+        """
+        Combina una nueva detección con el perfil acumulado.
+
+        - Mismo estilo → refuerza la confianza
+        - Estilo distinto → reemplaza solo si la nueva detección es más confiable
+        """
+        if detected.style == self.style:
+            confidence = min(1.0, max(self.confidence, detected.confidence) + 0.1)
+            style = self.style
+            patterns = detected.detected_patterns or self.detected_patterns
+        elif detected.confidence >= self.effective_confidence(policy):
+            confidence = detected.confidence
+            style = detected.style
+            patterns = detected.detected_patterns
+        else:
+            confidence = self.confidence
+            style = self.style
+            patterns = self.detected_patterns
+
+        return UserStyleProfile(
+            style=style,
+            confidence=confidence,
+            detected_patterns=patterns,
+            sample_messages=detected.sample_messages[-3:],
+            source=detected.source,
+            sample_count=self.sample_count,  # register_message() ya contó este turno
+            evaluations=self.evaluations + 1,
+            messages_since_evaluation=0,
+        )
+
+
+class IntentClassification(BaseModel):
+    """Clasificación de intención del usuario."""
+
+    intent: Literal["search", "persuasion", "checkout", "info"]
+    confidence: float
+    reasoning: Optional[str] = None
+    suggested_agent: Literal["retriever", "sales", "checkout"]
+    source: Optional[str] = None  # "local_model", "llm", "turn_analysis", "keywords"
+
+
 class AgentState(BaseModel):
     """Estado compartido de la conversación entre agentes."""
 
     # Conversación
     user_query: str
     conversation_history: List[Dict[str, str]] = Field(default_factory=list)
+    conversation_summary: Optional[str] = None  # Turnos antiguos compactados (ver history_manager)
 
     # Contexto del usuario
     user_style: Optional[Literal["cuencano", "formal", "juvenil", "neutral"]] = "neutral"
+    style_profile: Optional[UserStyleProfile] = None  # Perfil persistido (sticky + decaimiento)
     detected_intent: Optional[Literal["search", "persuasion", "checkout", "info", "recomendacion"]] = None
+    intent_classification: Optional[IntentClassification] = None  # Clasificación del turno actual
 
     # NUEVO: Guion del Agente 2 (procesamiento de entrada multimodal)
     guion_agente2: Optional[Any] = Field(
@@ -76,19 +174,32 @@ class AgentResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
-class IntentClassification(BaseModel):
-    """Clasificación de intención del usuario."""
+class TurnAnalysis(BaseModel):
+    """
+    Análisis combinado de un turno: estilo + intención + stop intent.
 
-    intent: Literal["search", "persuasion", "checkout", "info"]
-    confidence: float
-    reasoning: Optional[str] = None
-    suggested_agent: Literal["retriever", "sales", "checkout"]
+    Se obtiene con UNA sola llamada al LLM. Los campos que el LLM no
+    devuelve (o devuelve inválidos) se completan con los detectores de keywords.
+    """
 
+    intent: IntentClassification
+    style: Optional[UserStyleProfile] = None
+    stop_intent: bool = False
+    llm_fields: List[str] = Field(default_factory=list)  # Campos resueltos por el LLM
+    latency_ms: float = 0.0
 
-class UserStyleProfile(BaseModel):
-    """Perfil de estilo de comunicación del usuario."""
 
-    style: Literal["cuencano", "formal", "juvenil", "neutral"]
-    confidence: float
-    detected_patterns: List[str] = Field(default_factory=list)
-    sample_messages: List[str] = Field(default_factory=list)
+class AgentStreamEvent(BaseModel):
+    """
+    Evento del modo streaming del orquestador.
+
+    Orden: "metadata" (agente/intención/estilo) → "token"* → "done" (o "error").
+    """
+
+    type: Literal["metadata", "token", "done", "error"]
+    agent: Optional[str] = None
+    intent: Optional[str] = None
+    user_style: Optional[str] = None
+    delta: Optional[str] = None
+    response: Optional[AgentResponse] = None  # Solo en "done" / "error"
+    error: Optional[str] = None
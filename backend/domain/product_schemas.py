@@ -31,6 +31,20 @@ class ProductStockSchema(BaseModel):
     is_active: bool
 
 
+class ProductSearchFilters(BaseModel):
+    """Filtros opcionales para ProductService.search_terms."""
+    category: Optional[str] = None
+    brand: Optional[str] = None
+    brands: list[str] = Field(default_factory=list, description="Cualquiera de estas marcas")
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    color: Optional[str] = None
+    # El inventario no guarda tallas: se informa al usuario pero no filtra
+    size: Optional[str] = None
+    in_stock_only: bool = False
+    on_sale_only: bool = False
+
+
 class ProductWithDiscountSchema(BaseModel):
     """Producto completo con información de descuentos."""
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,105 @@
+"""
+Caché de respuestas del LLM (backend/llm/cache.py).
+
+La key es un hash de (modelo, temperatura, mensajes): dos prompts idénticos
+byte a byte comparten respuesta. Backends intercambiables:
+
+- MemoryLLMCache: LRU en proceso con expiración por entrada.
+- RedisLLMCache: compartido entre réplicas, TTL nativo de Redis.
+"""
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import redis.asyncio as redis
+from langchain_core.messages import BaseMessage
+from loguru import logger
+
+
+def make_cache_key(
+    model_name: str, temperature: Optional[float], messages: Sequence[BaseMessage]
+) -> str:
+    """Hash estable de (modelo, temperatura, mensajes)."""
+    payload = {
+        "model": model_name,
+        "temperature": temperature,
+        "messages": [
+            {"type": message.type, "content": message.content}
+            for message in messages
+        ],
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCacheBackend(ABC):
+    """Interfaz de un backend de caché (guarda el texto de la respuesta)."""
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        ...
+
+
+class MemoryLLMCache(LLMCacheBackend):
+    """LRU en proceso con TTL por entrada."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisLLMCache(LLMCacheBackend):
+    """Caché compartido en Redis (los errores de Redis se tratan como miss)."""
+
+    name = "redis"
+
+    def __init__(self, redis_client: redis.Redis, key_prefix: str = "llm_cache"):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+
+    def _make_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self.redis.get(self._make_key(key))
+        except redis.RedisError as e:
+            logger.warning(f"Error de Redis leyendo caché LLM: {e}")
+            return None
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        try:
+            await self.redis.setex(self._make_key(key), ttl_seconds, value)
+        except redis.RedisError as e:
+            logger.warning(f"Error de Redis guardando caché LLM: {e}")
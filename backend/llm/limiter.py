@@ -0,0 +1,85 @@
+"""
+Control de cuota hacia Vertex AI (backend/llm/limiter.py).
+
+Piezas que usa LLMProvider para que una ráfaga de usuarios se convierta en
+una cola acotada en lugar de una cascada de 429 y timeouts:
+
+- TokenBucket: límite de requests por minuto (RPM) con ráfaga = capacidad.
+- is_retryable_error: 429/503/etc. de Vertex AI que vale la pena reintentar.
+- backoff_delay: espera exponencial con jitter completo entre reintentos.
+"""
+import asyncio
+import random
+import time
+from typing import Optional
+
+# Errores transitorios de google.api_core / HTTP que se reintentan
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "DeadlineExceeded",
+    "Aborted",
+}
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMOverloadedError(RuntimeError):
+    """La llamada esperó en cola más que el máximo permitido."""
+
+
+class TokenBucket:
+    """
+    Token bucket para limitar requests por minuto.
+
+    Se recarga a `rate_per_minute / 60` tokens por segundo hasta `capacity`.
+    Los que esperan se atienden en orden (un lock serializa la espera).
+    """
+
+    def __init__(self, rate_per_minute: int, capacity: Optional[int] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second
+        )
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Espera hasta que haya un token disponible y lo consume."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) / self.rate_per_second)
+                self._refill()
+            self._tokens -= 1.0
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """True si el error es transitorio (cuota, servicio no disponible, etc.)."""
+    if isinstance(error, (asyncio.TimeoutError, asyncio.CancelledError)):
+        return False
+    for cls in type(error).__mro__:
+        if cls.__name__ in RETRYABLE_ERROR_NAMES:
+            return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    try:
+        return int(code) in RETRYABLE_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Backoff exponencial con jitter completo: uniform(0, min(max, base * 2^attempt))."""
+    return random.uniform(0.0, min(maximum, base * (2 ** attempt)))
@@ -0,0 +1,95 @@
+"""
+Perfiles de generación por tarea (backend/llm/profiles.py).
+
+No todas las llamadas necesitan el mismo modelo: clasificar una intención es
+un JSON de pocas palabras (temperatura 0, salida corta, modelo barato), mientras
+que un mensaje de venta necesita creatividad y más tokens.
+
+Cada call site se enruta a un perfil (CALL_SITE_PROFILES) y cada perfil define
+modelo, temperatura, tokens máximos de salida y timeout.
+"""
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+FAST_MODEL = "gemini-2.5-flash-lite"
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Parámetros de generación de una tarea."""
+
+    name: str
+    model: str = DEFAULT_MODEL
+    temperature: float = 0.7
+    max_output_tokens: Optional[int] = None
+    timeout: float = 10.0
+    # "application/json" fuerza salida JSON en Vertex AI (sin texto alrededor)
+    response_mime_type: Optional[str] = None
+    # 0 = sin "thinking" (en Gemini 2.5 consume tokens de salida)
+    thinking_budget: Optional[int] = None
+
+
+DEFAULT_PROFILES: Dict[str, GenerationProfile] = {
+    "default": GenerationProfile(name="default"),
+    # Clasificación de intención / análisis de turno: solo enums en JSON
+    "classify": GenerationProfile(
+        name="classify",
+        model=FAST_MODEL,
+        temperature=0.0,
+        max_output_tokens=96,
+        timeout=5.0,
+        response_mime_type="application/json",
+        thinking_budget=0,
+    ),
+    "style": GenerationProfile(
+        name="style",
+        model=FAST_MODEL,
+        temperature=0.0,
+        max_output_tokens=64,
+        timeout=5.0,
+        response_mime_type="application/json",
+        thinking_budget=0,
+    ),
+    # Mensajes de venta: creatividad moderada y respuestas de pocas oraciones
+    "persuade": GenerationProfile(
+        name="persuade",
+        temperature=0.7,
+        max_output_tokens=512,
+        timeout=10.0,
+    ),
+    "summarize": GenerationProfile(
+        name="summarize",
+        temperature=0.2,
+        max_output_tokens=256,
+        timeout=10.0,
+    ),
+}
+
+# Call site → perfil (los call sites no listados usan "default")
+CALL_SITE_PROFILES: Dict[str, str] = {
+    "intent": "classify",
+    "turn_analysis": "classify",
+    "style": "style",
+    "general": "persuade",
+    "recommendation": "persuade",
+    "format_productos": "persuade",
+    "guion": "persuade",
+    "summary": "summarize",
+}
+
+
+def build_profiles(
+    overrides: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> Dict[str, GenerationProfile]:
+    """
+    Perfiles por defecto con overrides parciales.
+
+    Ejemplo (LLM_PROFILES): {"classify": {"model": "gemini-2.5-flash"}}
+    Un nombre nuevo crea un perfil que parte de "default".
+    """
+    profiles = dict(DEFAULT_PROFILES)
+    for name, fields in (overrides or {}).items():
+        base = profiles.get(name, replace(DEFAULT_PROFILES["default"], name=name))
+        profiles[name] = replace(base, **dict(fields))
+    return profiles
@@ -2,24 +2,112 @@
 Proveedor de LLM (backend/llm/provider.py).
 Usa ChatVertexAI como indicaste.
 """
+import asyncio
 import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage
 from langchain_google_vertexai import ChatVertexAI
+from loguru import logger
+
 from backend.config import get_business_settings
+from backend.llm.cache import LLMCacheBackend, make_cache_key
+from backend.llm.limiter import (
+    LLMOverloadedError,
+    TokenBucket,
+    backoff_delay,
+    is_retryable_error,
+)
+from backend.llm.profiles import CALL_SITE_PROFILES, GenerationProfile, build_profiles
+from backend.services.metrics import LatencyTracker
+
+# TTL (segundos) por call site. 0 = no cachear ese call site.
+# Las clasificaciones son deterministas en la práctica; los textos de venta
+# se cachean poco tiempo para no repetir siempre el mismo mensaje.
+DEFAULT_CALL_SITE_TTLS: Dict[str, int] = {
+    "intent": 86400,
+    "style": 86400,
+    "turn_analysis": 86400,
+    "general": 900,
+    "recommendation": 900,
+    "format_productos": 900,
+    "guion": 900,
+}
+
+
+ModelFactory = Callable[[GenerationProfile], Any]
+
+
+def build_vertex_model(profile: GenerationProfile) -> ChatVertexAI:
+    """ChatVertexAI configurado según un perfil de generación."""
+    settings = get_business_settings()
+    return ChatVertexAI(
+        model=profile.model,
+        temperature=profile.temperature,
+        max_output_tokens=profile.max_output_tokens,
+        response_mime_type=profile.response_mime_type,
+        thinking_budget=profile.thinking_budget,
+        project=settings.google_cloud_project,
+        location=settings.google_location,
+    )
+
 
 class LLMProvider:
     # Wrapper para el modelo ChatVertexAI de Google.
-    
 
-    def __init__(self) -> None:
-        settings = get_business_settings()
+
+    def __init__(
+        self,
+        model: Optional[Any] = None,
+        cache: Optional[LLMCacheBackend] = None,
+        default_cache_ttl: int = 3600,
+        call_site_ttls: Optional[Dict[str, int]] = None,
+        max_concurrency: int = 0,
+        requests_per_minute: int = 0,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        max_queue_wait: float = 0.0,
+        profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+        model_factory: Optional[ModelFactory] = None,
+    ) -> None:
+        # Perfiles de generación por tarea; un modelo inyectado se usa para todos.
+        # model_factory permite sustituir Vertex AI (backends offline, record/replay).
+        self.profiles = build_profiles(profiles)
+        self._injected_model = model
+        self._model_factory = model_factory or build_vertex_model
+        self._models: Dict[str, Any] = {}
 
         # Usar ChatVertexAI (usa GOOGLE_APPLICATION_CREDENTIALS de env)
-        self.model = ChatVertexAI(
-            model="gemini-2.5-flash",
-            temperature=0.7,
-            project=settings.google_cloud_project,
-            location=settings.google_location,
-        )
+        self.model = self.model_for("default")
+
+        # Caché de respuestas (opt-in: None = siempre llamada remota)
+        self.cache = cache
+        self.default_cache_ttl = default_cache_ttl
+        self.call_site_ttls = {**DEFAULT_CALL_SITE_TTLS, **(call_site_ttls or {})}
+        # Llamadas en vuelo por key: prompts idénticos concurrentes comparten una sola
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.inflight_shared = 0
+
+        # Control de cuota (0 = sin límite): semáforo de concurrencia + RPM
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self._bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_queue_wait = max_queue_wait
+
+        self.queue_wait_latency = LatencyTracker()
+        self.waiting = 0
+        self.in_flight = 0
+        self.retries = 0
+        self.rejected = 0
 
     def bind_tools(self, tools: list):
         """
@@ -28,10 +116,233 @@ class LLMProvider:
         """
         return self.model.bind_tools(tools)
 
-def create_llm_provider() -> LLMProvider | None:
+    def profile_for(self, call_site: str) -> GenerationProfile:
+        """Perfil de generación que usa un call site."""
+        name = CALL_SITE_PROFILES.get(call_site, call_site)
+        return self.profiles.get(name, self.profiles["default"])
+
+    def model_for(self, profile_name: str) -> Any:
+        """Modelo configurado para un perfil (se construye una vez por perfil)."""
+        if self._injected_model is not None:
+            return self._injected_model
+
+        model = self._models.get(profile_name)
+        if model is None:
+            model = self._model_factory(self.profiles[profile_name])
+            self._models[profile_name] = model
+        return model
+
+    async def ainvoke(
+        self,
+        messages: Sequence[BaseMessage],
+        call_site: str = "default",
+        cache_ttl: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> BaseMessage:
+        """
+        Invoca el modelo del perfil del call site, pasando por la caché.
+
+        El timeout del perfil cubre toda la llamada (cola, reintentos incluidos)
+        y se reporta como asyncio.TimeoutError.
+
+        Args:
+            messages: Mensajes del prompt
+            call_site: Nombre del punto de llamada (define perfil y TTL)
+            cache_ttl: TTL explícito para esta llamada (0 = no cachear)
+            use_cache: False para forzar una llamada remota (bypass)
+        """
+        profile = self.profile_for(call_site)
+        return await asyncio.wait_for(
+            self._ainvoke(profile, list(messages), call_site, cache_ttl, use_cache),
+            timeout=profile.timeout,
+        )
+
+    async def _ainvoke(
+        self,
+        profile: GenerationProfile,
+        messages: list,
+        call_site: str,
+        cache_ttl: Optional[int],
+        use_cache: bool,
+    ) -> BaseMessage:
+        model = self.model_for(profile.name)
+        ttl = self._resolve_ttl(call_site, cache_ttl)
+        if self.cache is None or not use_cache or ttl <= 0:
+            return await self._call_model(model, messages, call_site)
+
+        key = make_cache_key(
+            f"{profile.model}:{profile.max_output_tokens}",
+            profile.temperature,
+            messages,
+        )
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            logger.debug(f"💾 Caché LLM hit ({call_site})")
+            return AIMessage(content=cached, response_metadata={"cache_hit": True})
+
+        # Stampede protection: si ya hay una llamada idéntica en vuelo, se espera esa.
+        # shield(): si un llamador se cancela (timeout), la llamada compartida sigue.
+        task = self._inflight.get(key)
+        if task is None:
+            self.cache_misses += 1
+            task = asyncio.ensure_future(
+                self._invoke_and_store(model, key, messages, ttl, call_site)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release_inflight(key, done))
+        else:
+            self.inflight_shared += 1
+
+        return await asyncio.shield(task)
+
+    async def astream(
+        self, messages: Sequence[BaseMessage], call_site: str = "default"
+    ) -> AsyncIterator[BaseMessage]:
+        """
+        Stream del modelo ocupando un slot de concurrencia durante todo el stream.
+
+        Solo se reintenta si el error llega antes del primer fragmento.
+        """
+        model = self.model_for(self.profile_for(call_site).name)
+        attempt = 0
+        while True:
+            emitted = False
+            try:
+                async with self._slot():
+                    async for chunk in model.astream(list(messages)):
+                        emitted = True
+                        yield chunk
+                return
+            except Exception as e:
+                if emitted or not self._should_retry(e, attempt):
+                    raise
+            await self._backoff(attempt, call_site)
+            attempt += 1
+
+    async def _call_model(self, model: Any, messages: list, call_site: str) -> BaseMessage:
+        """Llamada remota con límite de concurrencia/RPM y reintentos con backoff."""
+        attempt = 0
+        while True:
+            try:
+                async with self._slot():
+                    return await model.ainvoke(messages)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            # El slot se libera durante el backoff para no bloquear a los demás
+            await self._backoff(attempt, call_site)
+            attempt += 1
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Espera turno (RPM + semáforo) y registra el tiempo en cola."""
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            if self.max_queue_wait > 0:
+                await asyncio.wait_for(self._acquire(), timeout=self.max_queue_wait)
+            else:
+                await self._acquire()
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise LLMOverloadedError(
+                f"LLM saturado: más de {self.max_queue_wait}s en cola"
+            ) from None
+        finally:
+            self.waiting -= 1
+        self.queue_wait_latency.record((time.perf_counter() - started) * 1000)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    async def _acquire(self) -> None:
+        if self._bucket is not None:
+            await self._bucket.acquire()
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        return attempt < self.max_retries and is_retryable_error(error)
+
+    async def _backoff(self, attempt: int, call_site: str) -> None:
+        delay = backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+        self.retries += 1
+        logger.warning(
+            f"🔁 LLM reintento {attempt + 1}/{self.max_retries} ({call_site}) "
+            f"en {delay:.2f}s"
+        )
+        await asyncio.sleep(delay)
+
+    async def _invoke_and_store(
+        self, model: Any, key: str, messages: list, ttl: int, call_site: str
+    ) -> BaseMessage:
+        response = await self._call_model(model, messages, call_site)
+        if isinstance(response.content, str) and response.content:
+            await self.cache.set(key, response.content, ttl)
+        return response
+
+    def _release_inflight(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Evita "exception was never retrieved" si nadie esperaba
+
+    def _resolve_ttl(self, call_site: str, cache_ttl: Optional[int]) -> int:
+        if cache_ttl is not None:
+            return cache_ttl
+        return self.call_site_ttls.get(call_site, self.default_cache_ttl)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Métricas de la caché de respuestas."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "backend": self.cache.name if self.cache else None,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "inflight_shared": self.inflight_shared,
+            "hit_rate": round(self.cache_hits / total, 4) if total else None,
+        }
+
+    def get_limiter_stats(self) -> Dict[str, Any]:
+        """Métricas de cola/cuota hacia Vertex AI."""
+        return {
+            "max_concurrency": self.max_concurrency or None,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "queue_wait": self.queue_wait_latency.snapshot(),
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "rpm_tokens_available": (
+                round(self._bucket.available, 2) if self._bucket else None
+            ),
+        }
+
+
+def create_llm_provider(
+    cache: Optional[LLMCacheBackend] = None,
+    model_factory: Optional[ModelFactory] = None,
+) -> LLMProvider | None:
     """Factory para crear el proveedor."""
     try:
-        return LLMProvider()
+        settings = get_business_settings()
+        return LLMProvider(
+            cache=cache,
+            default_cache_ttl=settings.llm_cache_ttl,
+            call_site_ttls=settings.llm_cache_call_site_ttls,
+            max_concurrency=settings.llm_max_concurrency,
+            requests_per_minute=settings.llm_requests_per_minute,
+            max_retries=settings.llm_max_retries,
+            retry_base_delay=settings.llm_retry_base_delay,
+            max_queue_wait=settings.llm_max_queue_wait,
+            profiles=settings.llm_profiles,
+            model_factory=model_factory,
+        )
     except Exception as e:
         print(f"Error al conectar con Vertex AI: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -37,8 +37,8 @@ class ProductSearchTool(BaseTool):
         if not self.product_service:
             return "Error: Servicio de base de datos no conectado."
 
-        # Llamamos a tu servicio real (product_service.py)
-        products = await self.product_service.search_by_name(search_term)
+        # Una sola consulta rankeada (o el catálogo en memoria si está habilitado)
+        products = await self.product_service.search_terms(search_term.split())
         
         logger.info(f"🔍 ProductSearchTool: Encontrados {len(products)} productos")
         for p in products:
@@ -4,6 +4,7 @@ Arranca el servidor web (FastAPI) y la API GraphQL.
 """
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Cargar dotenv primero para leer el .env
@@ -17,6 +18,7 @@ from aioinject.ext.strawberry import AioInjectExtension
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.requests import HTTPConnection
 from loguru import logger
 from strawberry.fastapi import GraphQLRouter
 
@@ -29,20 +31,50 @@ from backend.config.rate_limit_config import limiter, RateLimitConfig
 from backend.api.endPoints.router import api_router
 from backend.api.graphql.queries import BusinessQuery
 from backend.api.graphql.mutations import BusinessMutation
+from backend.api.graphql.subscriptions import BusinessSubscription
+from backend.agents.retriever_agent import RetrieverAgent
 from backend.container import create_business_container
+from backend.services.product_service import ProductService
+from backend.services.rag_service import RAGService
 
 
 def create_app() -> FastAPI:
     """Crea y configura la aplicación FastAPI."""
     
-    # 1. Configuración Básica
+    # 1. Iniciar el Contenedor de Servicios
+    container = create_business_container()
+    logger.info("Contenedor de servicios iniciado correctamente.")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """
+        Crea al arrancar los servicios con tareas en segundo plano (índice RAG,
+        catálogo en memoria, vocabulario de búsqueda) y las cancela al apagar.
+        """
+        async with container.context() as ctx:
+            rag_service = await ctx.resolve(RAGService)
+            product_service = await ctx.resolve(ProductService)
+            retriever_agent = await ctx.resolve(RetrieverAgent)
+        # Los health checks usan esta referencia en vez de resolver en cada probe
+        app.state.rag_service = rag_service
+        try:
+            yield
+        finally:
+            await retriever_agent.stop_vocabulary_refresh()
+            if product_service.catalog is not None:
+                await product_service.catalog.stop()
+            await rag_service.stop()
+            logger.info("Tareas en segundo plano detenidas.")
+
+    # 2. Configuración Básica
     app = FastAPI(
         title="Agente de Ventas API",
         description="API GraphQL para el Asistente de Ventas con IA (Alex).",
         version="1.0.0",
+        lifespan=lifespan,
     )
     
-    # 2. Configurar CORS (IMPORTANTE para el frontend)
+    # 3. Configurar CORS (IMPORTANTE para el frontend)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=[
@@ -56,7 +88,7 @@ def create_app() -> FastAPI:
         allow_headers=["*"],  # Permite todos los headers
     )
     
-    # 3. Configurar Rate Limiting
+    # 4. Configurar Rate Limiting
     app.state.limiter = limiter
     app.add_middleware(SlowAPIMiddleware)
     
@@ -73,20 +105,18 @@ def create_app() -> FastAPI:
             headers={"Retry-After": "60"}
         )
 
-    # 4. Iniciar el Contenedor de Servicios
-    container = create_business_container()
-    logger.info("Contenedor de servicios iniciado correctamente.")
-
     # 5. Configurar GraphQL
     schema = strawberry.Schema(
         query=BusinessQuery,
         mutation=BusinessMutation,
+        subscription=BusinessSubscription,
         extensions=[AioInjectExtension(container=container)],
     )
 
     # 6. Crear routers con rate limiting
     # Configurar contexto para pasar request a los resolvers
-    async def get_context(request: Request):
+    # HTTPConnection (no Request) para que también sirva en WebSocket (subscriptions)
+    async def get_context(request: HTTPConnection):
         return {"request": request}
     
     graphql_app = GraphQLRouter(schema, context_getter=get_context)
@@ -111,12 +141,21 @@ def create_app() -> FastAPI:
     @app.get("/health")
     @limiter.limit(RateLimitConfig.HEALTH_CHECK)
     async def health_check(request: Request):
-        """Endpoint de health check."""
+        """Endpoint de health check (el proceso responde aunque el RAG siga inicializando)."""
+        rag = request.app.state.rag_service.readiness()
         return {
-            "status": "healthy",
+            "status": "healthy" if rag["ready"] else "starting",
             "version": "1.0.0",
-            "rate_limiting": "enabled"
+            "rate_limiting": "enabled",
+            "rag": rag,
         }
+
+    @app.get("/health/ready")
+    @limiter.limit(RateLimitConfig.HEALTH_CHECK)
+    async def readiness_check(request: Request):
+        """Readiness probe: 503 hasta que el índice RAG esté listo."""
+        rag = request.app.state.rag_service.readiness()
+        return JSONResponse(status_code=200 if rag["ready"] else 503, content={"rag": rag})
     
     @app.get("/rate-limits")
     @limiter.limit(RateLimitConfig.ROOT_ENDPOINT)
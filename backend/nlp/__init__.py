@@ -0,0 +1,20 @@
+"""
+Utilidades de procesamiento de lenguaje (sin LLM).
+"""
+from backend.nlp.lexicon import (
+    Lexicon,
+    LexiconScan,
+    fold_accents,
+    get_lexicon,
+    normalize_text,
+    tokenize,
+)
+
+__all__ = [
+    "Lexicon",
+    "LexiconScan",
+    "fold_accents",
+    "get_lexicon",
+    "normalize_text",
+    "tokenize",
+]
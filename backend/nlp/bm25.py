@@ -0,0 +1,102 @@
+"""
+BM25 en memoria + fusión por rango recíproco (RRF).
+
+Para la base de conocimiento (unas decenas de documentos) un índice invertido
+en dicts alcanza: buscar "garantía" o "membresía VIP" no necesita embeddings.
+
+- Tokens: texto normalizado (sin tildes/puntuación), sin stopwords y con un
+  stemming mínimo de plurales ("envíos" → "envio").
+- `coverage()` mide qué parte del peso IDF de la query cubre un documento
+  (≈1.0 si aparecen todos los términos); sirve como confianza léxica.
+"""
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+from backend.nlp.lexicon import tokenize
+
+STOPWORDS = frozenset(
+    """
+    a al algo algun alguna algunas alguno algunos ante con como cual cuales cuando
+    de del desde donde e el ella ellas ellos en entre era es esa esas ese eso esos
+    esta estan estas este esto estos fue ha hay la las le les lo los me mi mis muy
+    no nos o para pero por que se si sin sobre su sus te tengo tiene tienen tu tus
+    un una unas uno unos y ya yo
+    """.split()
+)
+
+
+def _stem(token: str) -> str:
+    if len(token) > 5 and token.endswith("ones"):
+        return token[:-4] + "on"
+    if len(token) > 3 and token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+def analyze(text: str) -> List[str]:
+    """Términos indexables del texto."""
+    return [_stem(token) for token in tokenize(text) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Índice invertido BM25 (Okapi) sobre una lista fija de textos."""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._lengths: List[int] = []
+
+        for position, text in enumerate(texts):
+            terms = analyze(text)
+            self._lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings[term].append((position, tf))
+
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def idf(self, term: str) -> float:
+        n = len(self._lengths)
+        df = len(self._postings.get(term, ()))
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k (posición del texto, score BM25), de mayor a menor."""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(analyze(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for position, tf in postings:
+                norm = 1.0 - self.b + self.b * self._lengths[position] / (self._avg_length or 1.0)
+                scores[position] += idf * tf * (self.k1 + 1.0) / (tf + self.k1 * norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+    def coverage(self, query: str, score: float) -> float:
+        """
+        Score relativo al de un documento de largo promedio que contiene cada
+        término de la query una vez (tope 1.0). Los términos desconocidos
+        también cuentan en el denominador.
+        """
+        reference = sum(self.idf(term) for term in set(analyze(query)))
+        if reference <= 0:
+            return 0.0
+        return min(1.0, score / reference)
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[Hashable]], k: int = 60
+) -> List[Tuple[Hashable, float]]:
+    """Fusiona rankings: score(d) = Σ 1 / (k + rango), rango desde 1."""
+    fused: Dict[Hashable, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
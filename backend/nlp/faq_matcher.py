@@ -0,0 +1,214 @@
+"""
+Matcher de FAQs compilado desde faqs.csv.
+
+Cada fila trae sus `patterns` (regex separados por ";;;") y la `response`
+canónica. Se compilan una sola vez al arrancar y se evalúan sobre el texto
+normalizado (sin tildes), así que la respuesta sale sin embeddings ni red:
+
+1. Exacto: algún regex de la FAQ coincide (confianza 1.0). Si coinciden
+   varias FAQs ("tienen garantía las nike?" → productos y garantía) se elige
+   la del patrón más específico con AMBIGUOUS_CONFIDENCE, por debajo del
+   umbral de RAGService: la búsqueda híbrida decide.
+2. Difuso: las palabras literales del patrón aparecen en la query con algún
+   error de tipeo ("horaio de atencion"). Confianza = 0.9 × similitud media.
+
+Si no hay coincidencia, el llamador cae a la búsqueda semántica.
+"""
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from backend.nlp.lexicon import fold_accents, tokenize
+
+PATTERN_SEPARATOR = ";;;"
+
+# Palabras cortas solo cuentan con coincidencia exacta o por prefijo
+_MIN_FUZZY_LENGTH = 4
+# Confianza cuando coinciden varias FAQs (< FAQ_MATCH_THRESHOLD por defecto, 0.75)
+AMBIGUOUS_CONFIDENCE = 0.6
+_GROUP = re.compile(r"\(([^()]*)\)")
+_ESCAPE = re.compile(r"\\.")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class FAQMatch:
+    """FAQ encontrada para una query."""
+    faq_type: str
+    category: str
+    response: str
+    confidence: float
+    method: str  # "exact" o "fuzzy"
+    pattern: str
+
+
+@dataclass
+class _CompiledPattern:
+    faq: int
+    source: str
+    regex: "re.Pattern[str]"
+    # Slots: cada uno es una lista de frases alternativas (listas de palabras)
+    slots: List[List[List[str]]]
+    anchored: bool
+    specificity: int
+
+
+def _normalize_pattern(pattern: str) -> str:
+    return fold_accents(pattern.strip().lower())
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(_ESCAPE.sub(" ", text))
+
+
+def _slots(pattern: str) -> List[List[List[str]]]:
+    """Palabras literales del regex agrupadas en slots (las alternativas de un grupo comparten slot)."""
+    slots: List[List[List[str]]] = []
+    position = 0
+    for group in _GROUP.finditer(pattern):
+        slots.extend([[word]] for word in _words(pattern[position:group.start()]))
+        alternatives = [_words(option) for option in group.group(1).split("|")]
+        alternatives = [words for words in alternatives if words]
+        if alternatives:
+            slots.append(alternatives)
+        position = group.end()
+    slots.extend([[word]] for word in _words(pattern[position:]))
+    return slots
+
+
+def _similarity(word: str, token: str) -> float:
+    if token == word or token.startswith(word):
+        return 1.0
+    if len(word) < _MIN_FUZZY_LENGTH:
+        return 0.0
+    # El patrón puede ser un prefijo ("abr" → "abren"): comparar también con el recorte
+    return max(
+        SequenceMatcher(None, word, token).ratio(),
+        SequenceMatcher(None, word, token[:len(word)]).ratio(),
+    )
+
+
+class FAQMatcher:
+    """Lookup directo de respuestas de FAQ por patrones exactos y difusos."""
+
+    def __init__(
+        self,
+        faqs: Sequence[Dict[str, str]],
+        fuzzy_cutoff: float = 0.8,
+    ):
+        """
+        Args:
+            faqs: Filas con type, category, patterns y response
+            fuzzy_cutoff: Similitud mínima por palabra para el match difuso
+        """
+        self.faqs = list(faqs)
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._patterns: List[_CompiledPattern] = []
+
+        for index, faq in enumerate(self.faqs):
+            for raw in str(faq.get("patterns") or "").split(PATTERN_SEPARATOR):
+                pattern = _normalize_pattern(raw)
+                if not pattern:
+                    continue
+                try:
+                    regex = re.compile(pattern)
+                except re.error as e:
+                    logger.warning(f"Patrón de FAQ inválido ({faq.get('category')}): {raw!r} ({e})")
+                    continue
+                words = _words(pattern)
+                self._patterns.append(_CompiledPattern(
+                    faq=index,
+                    source=raw.strip(),
+                    regex=regex,
+                    slots=_slots(pattern),
+                    anchored=pattern.startswith("^") and pattern.endswith("$"),
+                    specificity=sum(len(word) for word in words),
+                ))
+
+        logger.info(f"FAQ matcher: {len(self.faqs)} FAQs, {len(self._patterns)} patrones")
+
+    @classmethod
+    def from_csv(cls, path: Path, **kwargs) -> "FAQMatcher":
+        """Compila el matcher desde faqs.csv (vacío si no existe)."""
+        if not path.exists():
+            logger.warning(f"No se encontró {path}, FAQ matcher vacío")
+            return cls([], **kwargs)
+        df = pd.read_csv(path).fillna("")
+        return cls(df.to_dict("records"), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.faqs)
+
+    def match(self, query: str) -> Optional[FAQMatch]:
+        """FAQ para la query, o None (el llamador cae a la búsqueda semántica)."""
+        text = " ".join(tokenize(query))
+        if not text:
+            return None
+        return self._match_exact(text) or self._match_fuzzy(text.split())
+
+    # Internos
+
+    def _build(self, pattern: _CompiledPattern, confidence: float, method: str) -> FAQMatch:
+        faq = self.faqs[pattern.faq]
+        return FAQMatch(
+            faq_type=str(faq.get("type") or "faq"),
+            category=str(faq.get("category") or "general"),
+            response=str(faq.get("response") or ""),
+            confidence=round(confidence, 3),
+            method=method,
+            pattern=pattern.source,
+        )
+
+    def _match_exact(self, text: str) -> Optional[FAQMatch]:
+        best: Dict[int, _CompiledPattern] = {}
+        for pattern in self._patterns:
+            if pattern.regex.search(text):
+                current = best.get(pattern.faq)
+                if current is None or pattern.specificity > current.specificity:
+                    best[pattern.faq] = pattern
+        if not best:
+            return None
+
+        winner = max(best.values(), key=lambda p: p.specificity)
+        return self._build(winner, 1.0 if len(best) == 1 else AMBIGUOUS_CONFIDENCE, "exact")
+
+    def _match_fuzzy(self, tokens: List[str]) -> Optional[FAQMatch]:
+        best: Optional[Tuple[float, _CompiledPattern]] = None
+        for pattern in self._patterns:
+            score = self._fuzzy_score(pattern, tokens)
+            if score is not None and (best is None or score > best[0]):
+                best = (score, pattern)
+        if best is None:
+            return None
+        return self._build(best[1], 0.9 * best[0], "fuzzy")
+
+    def _fuzzy_score(self, pattern: _CompiledPattern, tokens: List[str]) -> Optional[float]:
+        """Similitud media si todos los slots del patrón aparecen en la query."""
+        if not pattern.slots:
+            return None
+
+        scores: List[float] = []
+        used_tokens = 0
+        for alternatives in pattern.slots:
+            slot_best = 0.0
+            slot_words = 0
+            for words in alternatives:
+                ratios = [max(_similarity(word, token) for token in tokens) for word in words]
+                if min(ratios) >= self.fuzzy_cutoff and sum(ratios) / len(ratios) > slot_best:
+                    slot_best = sum(ratios) / len(ratios)
+                    slot_words = len(words)
+            if slot_best == 0.0:
+                return None
+            scores.append(slot_best)
+            used_tokens += slot_words
+
+        # "^hola$" no debe coincidir con "hola, busco zapatillas"
+        if pattern.anchored and used_tokens != len(tokens):
+            return None
+        # Sin ninguna palabra mal escrita ya lo habría resuelto el regex
+        return sum(scores) / len(scores)
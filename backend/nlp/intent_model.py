@@ -0,0 +1,204 @@
+"""
+Clasificador de intención local (CPU) entrenado con el historial de chat.
+
+Primer nivel de la cascada de clasificación: TF-IDF de n-gramas de
+caracteres + regresión logística. Responde en microsegundos y solo se
+escala al LLM cuando la confianza queda por debajo del umbral.
+
+El modelo se entrena offline (ver ``train_intent_classifier.py``) a partir
+de los mensajes USER de ``chat_history`` que el LLM ya etiquetó, y se
+exporta como un artefacto versionado ``intent_classifier_<version>.joblib``.
+"""
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from backend.nlp.lexicon import normalize_text
+
+# Cambiar si cambia la forma de construir las features: invalida artefactos viejos
+FEATURE_SCHEMA_VERSION = 1
+
+ARTIFACT_PREFIX = "intent_classifier_"
+ARTIFACT_SUFFIX = ".joblib"
+
+# Tokens de contexto (el mismo texto significa cosas distintas con o sin productos vistos)
+_CTX_WITH_RESULTS = "__ctx_resultados__"
+_CTX_EMPTY = "__ctx_vacio__"
+
+
+def featurize(query: str, has_search_results: bool) -> str:
+    """Texto de entrada del modelo: token de contexto + query normalizada."""
+    context = _CTX_WITH_RESULTS if has_search_results else _CTX_EMPTY
+    return f"{context} {normalize_text(query)}"
+
+
+@dataclass(frozen=True)
+class IntentSample:
+    """Ejemplo etiquetado para entrenamiento."""
+
+    text: str
+    intent: str
+    has_search_results: bool = False
+
+
+def build_pipeline():
+    """Pipeline sklearn: n-gramas de caracteres + modelo lineal."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([
+        (
+            "tfidf",
+            TfidfVectorizer(
+                analyzer="char_wb",
+                ngram_range=(2, 5),
+                sublinear_tf=True,
+                min_df=1,
+            ),
+        ),
+        (
+            "clf",
+            LogisticRegression(max_iter=1000, class_weight="balanced"),
+        ),
+    ])
+
+
+class LocalIntentClassifier:
+    """Envoltorio del pipeline entrenado + metadatos del artefacto."""
+
+    def __init__(self, pipeline: Any, metadata: Dict[str, Any]):
+        self.pipeline = pipeline
+        self.metadata = metadata
+        self.labels: List[str] = [str(label) for label in pipeline.classes_]
+
+    @property
+    def version(self) -> str:
+        return self.metadata.get("version", "unknown")
+
+    def predict(self, query: str, has_search_results: bool = False) -> Tuple[str, float]:
+        """Devuelve (intención, probabilidad) de la clase más probable."""
+        probabilities = self.pipeline.predict_proba([featurize(query, has_search_results)])[0]
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, output_dir: str | Path) -> Path:
+        """Exporta el artefacto versionado en ``output_dir``."""
+        import joblib
+
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{ARTIFACT_PREFIX}{self.version}{ARTIFACT_SUFFIX}"
+        joblib.dump({"pipeline": self.pipeline, "metadata": self.metadata}, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["LocalIntentClassifier"]:
+        """
+        Carga un artefacto. Si ``path`` es un directorio, usa la versión más reciente.
+
+        Retorna None si no hay artefacto o si fue entrenado con otro esquema
+        de features (el orquestador sigue funcionando solo con el LLM).
+        """
+        import joblib
+
+        artifact_path = resolve_artifact_path(path)
+        if artifact_path is None:
+            return None
+
+        artifact = joblib.load(artifact_path)
+        metadata = artifact.get("metadata", {})
+        if metadata.get("feature_schema") != FEATURE_SCHEMA_VERSION:
+            logger.warning(
+                f"⚠️ Modelo de intención {artifact_path.name} usa feature_schema="
+                f"{metadata.get('feature_schema')} (esperado {FEATURE_SCHEMA_VERSION}), ignorado"
+            )
+            return None
+
+        return cls(artifact["pipeline"], metadata)
+
+
+def resolve_artifact_path(path: str | Path) -> Optional[Path]:
+    """Resuelve un archivo o el artefacto más reciente de un directorio."""
+    candidate = Path(path)
+    if candidate.is_file():
+        return candidate
+    if candidate.is_dir():
+        artifacts = sorted(candidate.glob(f"{ARTIFACT_PREFIX}*{ARTIFACT_SUFFIX}"))
+        return artifacts[-1] if artifacts else None
+    return None
+
+
+def train_intent_classifier(
+    samples: Sequence[IntentSample],
+    test_size: float = 0.2,
+    seed: int = 42,
+) -> Tuple[LocalIntentClassifier, Dict[str, Any]]:
+    """
+    Entrena el clasificador y devuelve (modelo, reporte de evaluación).
+
+    Se reserva ``test_size`` de los ejemplos para medir accuracy antes de
+    re-entrenar con todos los datos para el artefacto final.
+    """
+    if len({sample.intent for sample in samples}) < 2:
+        raise ValueError("Se necesitan ejemplos de al menos 2 intenciones para entrenar")
+
+    texts = [featurize(s.text, s.has_search_results) for s in samples]
+    labels = [s.intent for s in samples]
+
+    report: Dict[str, Any] = {
+        "samples": len(samples),
+        "label_distribution": dict(Counter(labels)),
+    }
+
+    # Evaluación hold-out (solo si hay datos suficientes)
+    indices = list(range(len(samples)))
+    random.Random(seed).shuffle(indices)
+    n_test = int(len(indices) * test_size)
+    if n_test >= 5:
+        test_idx, train_idx = indices[:n_test], indices[n_test:]
+        eval_pipeline = build_pipeline()
+        eval_pipeline.fit([texts[i] for i in train_idx], [labels[i] for i in train_idx])
+        predictions = eval_pipeline.predict([texts[i] for i in test_idx])
+        correct = sum(1 for i, pred in zip(test_idx, predictions) if pred == labels[i])
+        report["holdout_accuracy"] = round(correct / n_test, 4)
+        report["holdout_samples"] = n_test
+
+    pipeline = build_pipeline()
+    pipeline.fit(texts, labels)
+
+    metadata = {
+        "version": datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S"),
+        "feature_schema": FEATURE_SCHEMA_VERSION,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        **report,
+    }
+    return LocalIntentClassifier(pipeline, metadata), report
+
+
+def load_intent_model(path: str | Path) -> Optional[LocalIntentClassifier]:
+    """Carga el modelo al arranque; cualquier problema desactiva el nivel local."""
+    try:
+        model = LocalIntentClassifier.load(path)
+    except ImportError as e:
+        logger.warning(f"⚠️ scikit-learn/joblib no disponible, clasificador local deshabilitado: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"❌ Error cargando modelo de intención desde {path}: {e}")
+        return None
+
+    if model is None:
+        logger.info(f"ℹ️ Sin modelo de intención local en {path}, se usa solo el LLM")
+    else:
+        logger.info(
+            f"✅ Modelo de intención local cargado: v{model.version} "
+            f"({model.metadata.get('samples', '?')} ejemplos, labels={model.labels})"
+        )
+    return model
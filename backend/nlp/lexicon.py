@@ -0,0 +1,276 @@
+"""
+Motor de léxico compilado para los detectores por keywords.
+
+Todas las listas de palabras clave del sistema (intención, estilo, stop intent,
+FAQs, respuestas de aprobación/rechazo) se compilan UNA sola vez en un
+autómata Aho-Corasick. Un único recorrido sobre el texto normalizado devuelve
+todas las categorías encontradas con su score, así que el costo es
+O(len(query)) sin importar cuánto crezcan los vocabularios.
+
+Convenciones del vocabulario:
+- Los términos se normalizan igual que el texto (minúsculas, sin tildes,
+  sin puntuación), así que "catálogo" y "catalogo" son equivalentes.
+- Por defecto un término solo coincide con palabras completas
+  ("che" no coincide dentro de "noche").
+- Un "*" final indica coincidencia por prefijo ("horario*" → "horarios").
+"""
+import functools
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def fold_accents(text: str) -> str:
+    """Elimina tildes y diacríticos ("cómo" → "como", "señor" → "senor")."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas + sin tildes + puntuación como espacios (un solo espacio)."""
+    folded = fold_accents(text.lower())
+    return " ".join(token for token in _NON_ALNUM.split(folded) if token)
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens normalizados del texto."""
+    return normalize_text(text).split()
+
+
+# =============================================================================
+# VOCABULARIOS
+# =============================================================================
+
+VOCABULARIES: Dict[str, List[str]] = {
+    # --- Intención (AgentOrchestrator._classify_intent_keywords) ---
+    "intent.search": [
+        "buscar", "busco", "mostrar", "muestrame", "quiero ver", "tienes",
+        "hay", "talla*", "color*", "marca*", "modelo*", "catalogo*",
+    ],
+    "intent.checkout": [
+        "comprar", "comprame", "damelos", "damelo", "enviame", "envia",
+        "quiero", "lo quiero", "los quiero", "confirma*", "procede*",
+    ],
+    "intent.info": [
+        "horario*", "hora", "horas", "ubicacion*", "direccion*", "garantia*",
+        "devolucion*", "envio*", "delivery", "pago*", "tarjeta*",
+    ],
+    "intent.persuasion": [
+        "caro*", "precio*", "barato*", "descuento*", "oferta*", "recomienda*",
+        "mejor", "diferencia*", "vale la pena", "duda*", "por que",
+    ],
+    "intent.affirmation": ["si", "ok", "dale", "bueno"],
+    # --- Estilo (AgentOrchestrator._detect_user_style_keywords) ---
+    "style.cuencano": ["ayayay", "ve", "full", "chevere", "lindo*", "pana"],
+    "style.juvenil": ["che", "bro", "tipo", "re", "mal", "onda", "copado*"],
+    "style.formal": [
+        "usted*", "senor", "senora", "por favor", "disculpe", "agradezco",
+    ],
+    # --- Stop intent (AgentOrchestrator._detect_stop_intent) ---
+    "stop": [
+        "mejor no", "mejor no gracias", "luego veo", "despues veo", "chao",
+        "adios", "nos vemos", "hasta luego", "bye", "gracias igual",
+        "gracias igualmente", "ya no", "no importa", "dejalo", "olvidalo",
+        "no gracias", "esta muy caro gracias", "muy caro gracias",
+    ],
+    # --- RetrieverAgent ---
+    "retriever.faq": [
+        # Políticas
+        "politica*", "devolucion*", "devolver", "garantia*", "cambio*",
+        # Horarios y ubicación
+        "horario*", "hora", "horas", "abre*", "cierra*", "ubicacion*",
+        "direccion*", "donde", "donde esta", "sucursal*", "local", "locales",
+        # Pagos y envíos
+        "pago*", "pagar", "tarjeta*", "efectivo", "transferencia*",
+        "envio*", "delivery", "entrega*", "domicilio*",
+        # Info general
+        "como funciona", "que hacen", "quienes son", "quien",
+        "contacto", "telefono*", "whatsapp", "email",
+    ],
+    "retriever.search": [
+        "buscar", "mostrar", "quiero ver", "tienes", "hay", "talla*",
+        "color*", "marca*", "precio*", "catalogo*", "modelos",
+    ],
+    # --- SalesAgent ---
+    "sales.persuasion": [
+        "cual es mejor", "cual me recomiendas", "que diferencia", "cual elegir",
+        "no se cual", "comparar", "versus", "por que este", "vale la pena",
+        "mejor opcion", "descuento*", "oferta*", "promocion*", "mas barato",
+        "ahorro", "rebaja*",
+    ],
+    "sales.rag": ["politica*", "devolucion*", "garantia*", "envio*", "hora*"],
+    # --- continuarConversacion (respuesta al guion) ---
+    "reply.approval": [
+        "si", "yes", "ok", "dale", "va", "claro", "perfecto", "bueno",
+    ],
+    "reply.rejection": [
+        "no", "nop", "nope", "nah", "otra", "diferente", "siguiente",
+    ],
+}
+
+# Stopwords para extraer términos de búsqueda (RetrieverAgent._extract_search_terms)
+SEARCH_STOPWORDS = frozenset({
+    "el", "la", "de", "que", "y", "un", "una", "en", "a", "los", "las",
+    "del", "por", "para", "con", "me", "mi", "tu", "hay", "tiene", "tienes",
+    "quiero", "busco", "mostrar", "ver",
+})
+
+
+# =============================================================================
+# AUTÓMATA AHO-CORASICK
+# =============================================================================
+
+@dataclass(frozen=True)
+class _Pattern:
+    category: str
+    term: str
+    length: int
+    prefix: bool
+
+
+class AhoCorasickMatcher:
+    """
+    Autómata Aho-Corasick sobre texto normalizado.
+
+    Reporta todas las coincidencias (incluso solapadas) en una sola pasada,
+    respetando límites de palabra.
+    """
+
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[_Pattern]] = [[]]
+        self._built = False
+
+    def add(self, category: str, term: str) -> None:
+        prefix = term.endswith("*")
+        normalized = normalize_text(term.rstrip("*"))
+        if not normalized:
+            return
+
+        node = 0
+        for char in normalized:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+
+        self._output[node].append(
+            _Pattern(category=category, term=term, length=len(normalized), prefix=prefix)
+        )
+        self._built = False
+
+    def build(self) -> None:
+        """Calcula los enlaces de fallo (BFS) y propaga las salidas."""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[_Pattern]:
+        """Itera las coincidencias sobre un texto YA normalizado."""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        last = len(text) - 1
+        node = 0
+
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            for pattern in output[node]:
+                start = index - pattern.length + 1
+                if start > 0 and text[start - 1] != " ":
+                    continue
+                if not pattern.prefix and index < last and text[index + 1] != " ":
+                    continue
+                yield pattern
+
+
+@dataclass
+class LexiconScan:
+    """Resultado de escanear un texto: términos encontrados por categoría."""
+
+    text: str
+    hits: Dict[str, List[str]] = field(default_factory=dict)
+
+    def score(self, category: str) -> int:
+        """Número de términos distintos de la categoría presentes en el texto."""
+        return len(self.hits.get(category, ()))
+
+    def has(self, category: str) -> bool:
+        return category in self.hits
+
+    def matched(self, category: str) -> List[str]:
+        return list(self.hits.get(category, ()))
+
+    def scores(self, prefix: str = "") -> Dict[str, int]:
+        """Scores de todas las categorías (opcionalmente filtradas por prefijo)."""
+        return {
+            category: len(terms)
+            for category, terms in self.hits.items()
+            if category.startswith(prefix)
+        }
+
+
+class Lexicon:
+    """Conjunto de vocabularios compilados en un solo autómata."""
+
+    def __init__(self, vocabularies: Mapping[str, Iterable[str]]):
+        self.categories = tuple(vocabularies.keys())
+        self._matcher = AhoCorasickMatcher()
+        for category, terms in vocabularies.items():
+            for term in terms:
+                self._matcher.add(category, term)
+        self._matcher.build()
+
+    def scan(self, text: str, normalized: bool = False) -> LexiconScan:
+        """Una pasada sobre el texto: devuelve todas las categorías encontradas."""
+        clean = text if normalized else normalize_text(text)
+        hits: Dict[str, List[str]] = {}
+        for pattern in self._matcher.iter_matches(clean):
+            terms = hits.setdefault(pattern.category, [])
+            if pattern.term not in terms:
+                terms.append(pattern.term)
+        return LexiconScan(text=clean, hits=hits)
+
+    def first_match(
+        self, text: str, categories: Tuple[str, ...]
+    ) -> Optional[str]:
+        """Primera categoría (en el orden dado) presente en el texto."""
+        scan = self.scan(text)
+        for category in categories:
+            if scan.has(category):
+                return category
+        return None
+
+
+@functools.cache
+def get_lexicon() -> Lexicon:
+    """Léxico global, compilado una sola vez por proceso."""
+    return Lexicon(VOCABULARIES)
@@ -0,0 +1,213 @@
+"""
+Parser de búsquedas de producto por reglas y gazetteers (sin LLM).
+
+"Nike para correr de menos de 100 dólares talla 42" →
+    terms=[], brands=["Nike"], category="running", max_price=100, size="42"
+
+- Precio y talla: expresiones regulares sobre el texto sin tildes
+  ("menos de 100", "entre 80 y 120 usd", "$90", "talla 9.5").
+- Marca, categoría, color y oferta: vocabularios compilados en un Lexicon
+  (Aho-Corasick, backend/nlp/lexicon.py). Marcas y categorías salen del
+  catálogo; las categorías suman sinónimos en español ("correr" → running).
+- Lo que no es filtro queda como términos de texto, sin stopwords (las de
+  BM25 y las de búsqueda) ni relleno ("zapatillas", "modelos", "marca"): cada
+  término es obligatorio en la búsqueda SQL, así que "quiero unos nike rojos"
+  no debe exigir "unos". Los números de modelo ("Air Max 90") se conservan,
+  los de precio/talla no.
+"""
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.domain.product_schemas import ProductSearchFilters
+from backend.nlp.bm25 import STOPWORDS
+from backend.nlp.lexicon import SEARCH_STOPWORDS, Lexicon, fold_accents, normalize_text
+
+# Sinónimos por categoría del catálogo
+CATEGORY_SYNONYMS: Dict[str, List[str]] = {
+    "running": ["running", "correr", "corredor*", "trotar", "maraton*", "runner*"],
+    "training": ["training", "entrenar", "entrenamiento*", "gimnasio", "gym", "crossfit"],
+    "basketball": ["basketball", "basquet*", "baloncesto", "basket"],
+    "lifestyle": ["lifestyle", "casual*", "urbano*", "urbana*", "diario"],
+    "outdoor": ["outdoor", "montana", "trekking", "senderismo", "trail"],
+    "accesorios": ["accesorio*", "medias", "calcetines", "limpiador*"],
+}
+
+# Color canónico → alias en español e inglés (se comparan como palabras completas)
+COLOR_ALIASES: Dict[str, List[str]] = {
+    "negro": ["negro", "negra", "negros", "negras", "black"],
+    "blanco": ["blanco", "blanca", "blancos", "blancas", "white"],
+    "rojo": ["rojo", "roja", "rojos", "rojas", "red"],
+    "azul": ["azul", "azules", "blue"],
+    "gris": ["gris", "grises", "grey", "gray"],
+    "verde": ["verde", "verdes", "green"],
+    "rosa": ["rosa", "rosado", "rosada", "rosados", "rosadas", "pink"],
+    "amarillo": ["amarillo", "amarilla", "amarillos", "amarillas", "yellow"],
+}
+
+# Código de color al final del SKU (NIKE-PEGASUS-40-BLK); solo vale como sufijo
+COLOR_SKU_CODES: Dict[str, str] = {
+    "negro": "BLK",
+    "blanco": "WHT",
+    "rojo": "RED",
+    "azul": "BLU",
+    "gris": "GRY",
+    "verde": "GRN",
+}
+
+SALE_TERMS = ["oferta*", "descuento*", "promocion*", "rebaja*", "liquidacion*", "en sale"]
+
+# Sustantivos que no aportan a la búsqueda por texto (todo el catálogo es calzado)
+PRODUCT_NOUNS = ["zapatilla*", "zapato*", "tenis", "calzado*", "sneaker*", "par", "pares"]
+
+# Relleno frecuente en pedidos de búsqueda ("hay modelos de la marca puma")
+FILLER_TERMS = [
+    "modelo*", "marca*", "producto*", "opcion*", "tal", "cosa*", "tipo",
+    "quisiera", "buscando", "necesito", "mostrar*", "muestrame", "venden", "vendes",
+    "favor", "gracias", "hola",
+]
+
+_LEFTOVER_STOPWORDS = STOPWORDS | SEARCH_STOPWORDS
+
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+_CURRENCY = r"(?:\s*(?:dolares|dolar|usd|\$))?"
+_PRICE_RANGE = [
+    re.compile(rf"\bentre\s*\$?\s*{_NUMBER}{_CURRENCY}\s+y\s+\$?\s*{_NUMBER}{_CURRENCY}"),
+    re.compile(rf"\bde\s*\$?\s*{_NUMBER}{_CURRENCY}\s+a\s+\$?\s*{_NUMBER}{_CURRENCY}"),
+]
+_PRICE_MAX = re.compile(
+    r"(?:\bmenos\s+de|\bmenor\s+(?:a|que)|\bhasta|\bmaximo|\bpor\s+debajo\s+de|"
+    rf"\bno\s+mas\s+de|\bbajo|<)\s*\$?\s*{_NUMBER}{_CURRENCY}"
+)
+_PRICE_MIN = re.compile(
+    r"(?:\bmas\s+de|\bmayor\s+(?:a|que)|\bdesde|\bminimo|\bpor\s+encima\s+de|"
+    rf"\barriba\s+de|>)\s*\$?\s*{_NUMBER}{_CURRENCY}"
+)
+# Un monto suelto con moneda ("de 100 dólares", "$90") o tras "de" ("nike de
+# 100") se toma como presupuesto; tras "de" con dos cifras o más ("de 9" no)
+_PRICE_BUDGET = re.compile(
+    rf"\$\s*{_NUMBER}|\b{_NUMBER}\s*(?:dolares|dolar|usd|\$)|\bde\s+\$?\s*(\d{{2,}}(?:[.,]\d+)?)\b{_CURRENCY}"
+)
+_SIZE = re.compile(r"\b(?:talla|numero|num|nro|size|eu|us)\s*(\d{1,2}(?:[.,]5)?)\b")
+
+
+def _amount(value: str) -> Decimal:
+    return Decimal(value.replace(",", "."))
+
+
+@dataclass
+class ParsedQuery:
+    """Búsqueda separada en términos de texto y filtros estructurados."""
+    terms: List[str]
+    filters: ProductSearchFilters = field(default_factory=ProductSearchFilters)
+
+    @property
+    def has_filters(self) -> bool:
+        return self.filters != ProductSearchFilters()
+
+
+class QueryParser:
+    """Extrae marca, categoría, precio, talla, color y oferta de una búsqueda."""
+
+    def __init__(
+        self,
+        brands: Iterable[str] = (),
+        categories: Iterable[str] = (),
+    ):
+        """
+        Args:
+            brands: Marcas del catálogo (tal como están en product_stocks.brand)
+            categories: Categorías del catálogo; vacío = todas las de CATEGORY_SYNONYMS
+        """
+        self.brands = sorted({brand for brand in brands if brand})
+        self.categories = sorted({category for category in categories if category}) or sorted(
+            CATEGORY_SYNONYMS
+        )
+
+        vocabularies: Dict[str, List[str]] = {
+            "sale": SALE_TERMS,
+            "product": PRODUCT_NOUNS,
+            "filler": FILLER_TERMS,
+        }
+        for brand in self.brands:
+            vocabularies[f"brand:{brand}"] = [brand]
+        for category in self.categories:
+            synonyms = CATEGORY_SYNONYMS.get(normalize_text(category), [])
+            vocabularies[f"category:{category}"] = [category, *synonyms]
+        for color, aliases in COLOR_ALIASES.items():
+            vocabularies[f"color:{color}"] = aliases
+
+        self._lexicon = Lexicon(vocabularies)
+
+    def parse(self, query: str) -> ParsedQuery:
+        """Separa la query en términos de texto y ProductSearchFilters."""
+        text = fold_accents(query.lower())
+        values: Dict[str, object] = {}
+
+        text = self._extract_price(text, values)
+        size = _SIZE.search(text)
+        if size:
+            values["size"] = size.group(1).replace(",", ".")
+            text = text[:size.start()] + " " + text[size.end():]
+
+        scan = self._lexicon.scan(text)
+        consumed: List[Tuple[List[str], bool]] = []
+        brands: List[str] = []
+        for category, terms in scan.hits.items():
+            kind, _, value = category.partition(":")
+            if kind == "brand":
+                brands.append(value)
+            elif kind == "category":
+                values.setdefault("category", value)
+            elif kind == "color":
+                values.setdefault("color", value)
+            elif kind == "sale":
+                values["on_sale_only"] = True
+            consumed.extend((normalize_text(term.rstrip("*")).split(), term.endswith("*")) for term in terms)
+        if brands:
+            values["brands"] = sorted(brands)
+
+        words = [
+            word for word in scan.text.split()
+            if len(word) > 1
+            and word not in _LEFTOVER_STOPWORDS
+            and not self._is_consumed(word, consumed)
+        ]
+        return ParsedQuery(terms=list(dict.fromkeys(words)), filters=ProductSearchFilters(**values))
+
+    @staticmethod
+    def _extract_price(text: str, values: Dict[str, object]) -> str:
+        for pattern in _PRICE_RANGE:
+            match = pattern.search(text)
+            if match:
+                low, high = sorted((_amount(match.group(1)), _amount(match.group(2))))
+                values["min_price"], values["max_price"] = low, high
+                return text[:match.start()] + " " + text[match.end():]
+
+        for pattern, key in ((_PRICE_MAX, "max_price"), (_PRICE_MIN, "min_price"), (_PRICE_BUDGET, "max_price")):
+            match = pattern.search(text)
+            if match and key not in values:
+                amount = next(group for group in match.groups() if group)
+                values[key] = _amount(amount)
+                text = text[:match.start()] + " " + text[match.end():]
+        return text
+
+    @staticmethod
+    def _is_consumed(word: str, consumed: List[Tuple[List[str], bool]]) -> bool:
+        for tokens, prefix in consumed:
+            if word in tokens[:-1] or word == tokens[-1]:
+                return True
+            if prefix and word.startswith(tokens[-1]):
+                return True
+        return False
+
+
+def color_aliases(color: str) -> List[str]:
+    """Alias de un color canónico (el propio color si no se conoce)."""
+    return COLOR_ALIASES.get(normalize_text(color), [normalize_text(color)])
+
+
+def color_sku_code(color: str) -> Optional[str]:
+    """Código de SKU del color ("BLK"), o None si no tiene."""
+    return COLOR_SKU_CODES.get(normalize_text(color))
@@ -0,0 +1,26 @@
+"""
+Backends offline para load testing y profiling sin red.
+
+Sustitutos de Vertex AI (chat y embeddings) y ElevenLabs, con latencias
+simuladas y modo record/replay. Se eligen con LLM_BACKEND,
+EMBEDDINGS_BACKEND y TTS_BACKEND (ver container.py).
+"""
+from backend.offline.cassette import Cassette
+from backend.offline.chat import FakeChatModel, RecordingChatModel, ReplayChatModel
+from backend.offline.embeddings import HashingEmbeddings, RecordingEmbeddings, ReplayEmbeddings
+from backend.offline.latency import LatencyModel
+from backend.offline.tts import FakeTTSService, RecordingTTSService, ReplayTTSService
+
+__all__ = [
+    "Cassette",
+    "FakeChatModel",
+    "FakeTTSService",
+    "HashingEmbeddings",
+    "LatencyModel",
+    "RecordingChatModel",
+    "RecordingEmbeddings",
+    "RecordingTTSService",
+    "ReplayChatModel",
+    "ReplayEmbeddings",
+    "ReplayTTSService",
+]
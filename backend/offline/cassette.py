@@ -0,0 +1,86 @@
+"""
+Cassettes de record/replay (JSONL).
+
+Cada línea es {"key", "response", "latency_ms"}: en modo record se guarda la
+respuesta real con su latencia; en replay se devuelve la respuesta y se
+reproduce la latencia grabada (escalada por `speed`; 0 = sin espera).
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+def cassette_key(*parts: Any) -> str:
+    """Key estable a partir de las partes de la request."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Archivo JSONL de respuestas grabadas, indexado en memoria por key."""
+
+    def __init__(self, path: Path | str, speed: float = 1.0):
+        self.path = Path(path)
+        self.speed = speed
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry
+                except (json.JSONDecodeError, KeyError) as e:
+                    logger.warning(f"Línea inválida en cassette {self.path}:{line_number}: {e}")
+        logger.info(f"📼 Cassette cargado: {self.path} ({len(self._entries)} respuestas)")
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def record(self, key: str, response: Any, latency_ms: float) -> None:
+        entry = {"key": key, "response": response, "latency_ms": round(latency_ms, 1)}
+        with self._lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.recorded += 1
+
+    def replay_delay(self, latency_ms: float) -> float:
+        """Segundos a esperar para reproducir una latencia grabada."""
+        if self.speed <= 0:
+            return 0.0
+        return latency_ms / 1000 / self.speed
+
+    async def wait(self, latency_ms: float) -> None:
+        delay = self.replay_delay(latency_ms)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+        }
@@ -0,0 +1,186 @@
+"""
+Modelos de chat offline (sustitutos de ChatVertexAI).
+
+- FakeChatModel: determinista. Para prompts que piden JSON de clasificación
+  responde con intención/estilo calculados por el léxico; para el resto, un
+  texto de venta armado a partir de un hash del prompt.
+- RecordingChatModel: envuelve el modelo real y graba respuestas + tiempos.
+- ReplayChatModel: reproduce el cassette (con FakeChatModel si falta una entrada).
+"""
+import hashlib
+import json
+import re
+import time
+from typing import Any, AsyncIterator, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from loguru import logger
+
+from backend.llm.cache import make_cache_key
+from backend.nlp.lexicon import get_lexicon
+from backend.offline.cassette import Cassette
+from backend.offline.latency import LatencyModel
+
+_QUERY_RE = re.compile(r'Query del usuario: "(.*)"')
+
+_REPLIES = [
+    "¡Claro! Tengo varias opciones que te pueden gustar. ¿Para qué actividad las necesitas?",
+    "Buena elección. Ese modelo es muy cómodo y tenemos tallas disponibles. ¿Te lo separo?",
+    "Te entiendo. Por la calidad y la garantía vale la pena. ¿Quieres que te muestre alternativas?",
+    "Con gusto te ayudo. Hacemos envíos a todo el país y puedes pagar con tarjeta o transferencia.",
+]
+
+
+def _message_text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+class FakeChatModel:
+    """Chat model determinista con latencia configurable."""
+
+    def __init__(
+        self,
+        model_name: str = "fake-chat",
+        temperature: Optional[float] = 0.0,
+        latency: Optional[LatencyModel] = None,
+        chunk_latency: Optional[LatencyModel] = None,
+    ):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.latency = latency or LatencyModel()
+        self.chunk_latency = chunk_latency or LatencyModel()
+        self.calls = 0
+
+    def bind_tools(self, tools: list) -> "FakeChatModel":
+        return self
+
+    async def ainvoke(self, messages: Sequence[BaseMessage], **kwargs: Any) -> AIMessage:
+        self.calls += 1
+        await self.latency.wait()
+        return AIMessage(content=self.respond(messages))
+
+    async def astream(
+        self, messages: Sequence[BaseMessage], **kwargs: Any
+    ) -> AsyncIterator[AIMessageChunk]:
+        self.calls += 1
+        await self.latency.wait()  # Latencia hasta el primer fragmento
+        for index, word in enumerate(self.respond(messages).split(" ")):
+            if index:
+                await self.chunk_latency.wait()
+            yield AIMessageChunk(content=word if index == 0 else f" {word}")
+
+    def respond(self, messages: Sequence[BaseMessage]) -> str:
+        """Respuesta determinista para un prompt."""
+        system = " ".join(_message_text(m) for m in messages if m.type == "system")
+        human = " ".join(_message_text(m) for m in messages if m.type == "human")
+        if "JSON" in system:
+            return json.dumps(self._classification(human), ensure_ascii=False)
+
+        digest = hashlib.sha256((system + human).encode("utf-8")).digest()
+        return _REPLIES[digest[0] % len(_REPLIES)]
+
+    def _classification(self, human: str) -> dict:
+        match = _QUERY_RE.search(human)
+        scan = get_lexicon().scan(match.group(1) if match else human)
+
+        intent_scores = scan.scores("intent.")
+        intent = max(intent_scores, key=intent_scores.get) if intent_scores else "intent.search"
+        intent = intent.split(".", 1)[1]
+        if intent not in ("search", "persuasion", "checkout", "info"):
+            intent = "persuasion"
+
+        style_scores = scan.scores("style.")
+        style = max(style_scores, key=style_scores.get).split(".", 1)[1] if style_scores else "neutral"
+
+        return {
+            "intent": intent,
+            "confidence": 0.9,
+            "intent_confidence": 0.9,
+            "style": style,
+            "style_confidence": 0.9,
+            "stop_intent": scan.has("stop"),
+        }
+
+
+class RecordingChatModel:
+    """Envuelve un modelo real y graba cada respuesta (y su timing) en el cassette."""
+
+    def __init__(self, inner: Any, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self.model_name = getattr(inner, "model_name", "unknown")
+        self.temperature = getattr(inner, "temperature", None)
+
+    def bind_tools(self, tools: list) -> Any:
+        return self.inner.bind_tools(tools)
+
+    def _key(self, messages: Sequence[BaseMessage]) -> str:
+        return make_cache_key(self.model_name, self.temperature, messages)
+
+    async def ainvoke(self, messages: Sequence[BaseMessage], **kwargs: Any) -> BaseMessage:
+        started = time.perf_counter()
+        response = await self.inner.ainvoke(messages, **kwargs)
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.cassette.record(self._key(messages), {"content": response.content}, latency_ms)
+        return response
+
+    async def astream(
+        self, messages: Sequence[BaseMessage], **kwargs: Any
+    ) -> AsyncIterator[BaseMessage]:
+        started = time.perf_counter()
+        chunks: List[List[Any]] = []
+        async for chunk in self.inner.astream(messages, **kwargs):
+            offset_ms = (time.perf_counter() - started) * 1000
+            if isinstance(chunk.content, str):
+                chunks.append([round(offset_ms, 1), chunk.content])
+            yield chunk
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.cassette.record(
+            self._key(messages),
+            {"content": "".join(text for _, text in chunks), "chunks": chunks},
+            latency_ms,
+        )
+
+
+class ReplayChatModel:
+    """Reproduce respuestas grabadas; las que faltan las genera el fallback."""
+
+    def __init__(self, cassette: Cassette, fallback: FakeChatModel):
+        self.cassette = cassette
+        self.fallback = fallback
+        self.model_name = fallback.model_name
+        self.temperature = fallback.temperature
+
+    def bind_tools(self, tools: list) -> "ReplayChatModel":
+        return self
+
+    def _lookup(self, messages: Sequence[BaseMessage]) -> Optional[dict]:
+        entry = self.cassette.lookup(make_cache_key(self.model_name, self.temperature, messages))
+        if entry is None:
+            logger.warning(f"📼 Prompt sin grabar en {self.cassette.path}, usando modelo fake")
+        return entry
+
+    async def ainvoke(self, messages: Sequence[BaseMessage], **kwargs: Any) -> BaseMessage:
+        entry = self._lookup(messages)
+        if entry is None:
+            return await self.fallback.ainvoke(messages)
+        await self.cassette.wait(entry["latency_ms"])
+        return AIMessage(content=entry["response"]["content"])
+
+    async def astream(
+        self, messages: Sequence[BaseMessage], **kwargs: Any
+    ) -> AsyncIterator[BaseMessage]:
+        entry = self._lookup(messages)
+        if entry is None:
+            async for chunk in self.fallback.astream(messages):
+                yield chunk
+            return
+
+        response = entry["response"]
+        # Una respuesta grabada con ainvoke se reproduce como un único fragmento
+        chunks = response.get("chunks") or [[entry["latency_ms"], response["content"]]]
+        elapsed_ms = 0.0
+        for offset_ms, text in chunks:
+            await self.cassette.wait(offset_ms - elapsed_ms)
+            elapsed_ms = offset_ms
+            yield AIMessageChunk(content=text)
@@ -0,0 +1,136 @@
+"""
+Embeddings offline (sustitutos de VertexAIEmbeddings).
+
+- HashingEmbeddings: feature hashing de palabras y trigramas de caracteres,
+  normalizado L2. Determinista y sin red; textos parecidos quedan cerca.
+- RecordingEmbeddings / ReplayEmbeddings: record/replay por texto.
+"""
+import hashlib
+import time
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+from backend.nlp.lexicon import normalize_text
+from backend.offline.cassette import Cassette, cassette_key
+from backend.offline.latency import LatencyModel
+
+
+class HashingEmbeddings(Embeddings):
+    """Embeddings por feature hashing (misma dimensión que text-embedding-004)."""
+
+    def __init__(self, dimensions: int = 768, latency: Optional[LatencyModel] = None):
+        self.dimensions = dimensions
+        self.latency = latency or LatencyModel()
+
+    def _features(self, text: str) -> List[str]:
+        normalized = normalize_text(text)
+        words = normalized.split()
+        grams = [
+            f"#{word[i:i + 3]}"
+            for word in (f" {w} " for w in words)
+            for i in range(len(word) - 2)
+        ]
+        return words + grams
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.latency.wait_sync()
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.latency.wait_sync()
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await self.latency.wait()
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await self.latency.wait()
+        return self._embed(text)
+
+
+class RecordingEmbeddings(Embeddings):
+    """Envuelve el modelo real y graba cada vector con su latencia."""
+
+    def __init__(self, inner: Embeddings, cassette: Cassette, model_name: str):
+        self.inner = inner
+        self.cassette = cassette
+        self.model_name = model_name
+
+    def _record(self, texts: List[str], vectors: List[List[float]], latency_ms: float) -> None:
+        per_text = latency_ms / max(1, len(texts))
+        for text, vector in zip(texts, vectors):
+            self.cassette.record(cassette_key("embed", self.model_name, text), vector, per_text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        started = time.perf_counter()
+        vectors = self.inner.embed_documents(texts)
+        self._record(texts, vectors, (time.perf_counter() - started) * 1000)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        started = time.perf_counter()
+        vectors = await self.inner.aembed_documents(texts)
+        self._record(texts, vectors, (time.perf_counter() - started) * 1000)
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class ReplayEmbeddings(Embeddings):
+    """Reproduce vectores grabados; los textos sin grabar usan HashingEmbeddings."""
+
+    def __init__(self, cassette: Cassette, model_name: str, fallback: HashingEmbeddings):
+        self.cassette = cassette
+        self.model_name = model_name
+        self.fallback = fallback
+
+    def _replay(self, texts: List[str]) -> tuple[List[List[float]], float]:
+        vectors: List[List[float]] = []
+        latency_ms = 0.0
+        for text in texts:
+            entry = self.cassette.lookup(cassette_key("embed", self.model_name, text))
+            if entry is None:
+                logger.debug("📼 Texto sin embedding grabado, usando hashing")
+                vectors.append(self.fallback._embed(text))
+            else:
+                vectors.append(entry["response"])
+                latency_ms += entry["latency_ms"]
+        return vectors, latency_ms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors, latency_ms = self._replay(texts)
+        delay = self.cassette.replay_delay(latency_ms)
+        if delay > 0:
+            time.sleep(delay)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors, latency_ms = self._replay(texts)
+        await self.cassette.wait(latency_ms)
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
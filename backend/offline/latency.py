@@ -0,0 +1,70 @@
+"""
+Distribuciones de latencia simuladas para los backends offline.
+
+Config (dict, p. ej. desde FAKE_LLM_LATENCY):
+    {"kind": "lognormal", "mean_ms": 600, "stddev_ms": 250, "max_ms": 3000}
+
+kind: fixed | uniform | normal | lognormal
+"""
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+
+@dataclass
+class LatencyModel:
+    """Muestrea latencias en ms según una distribución simple."""
+
+    kind: str = "fixed"
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: Optional[float] = None
+    seed: Optional[int] = None
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Distribución de latencia desconocida: {self.kind}")
+        self._rng = random.Random(self.seed)
+
+    @classmethod
+    def from_config(cls, config: Optional[Mapping[str, Any]]) -> "LatencyModel":
+        return cls(**dict(config or {}))
+
+    def sample_ms(self) -> float:
+        if self.kind == "fixed" or self.mean_ms <= 0:
+            value = self.mean_ms
+        elif self.kind == "uniform":
+            # mean ± stddev·√3 (misma desviación estándar que el resto)
+            spread = self.stddev_ms * math.sqrt(3)
+            value = self._rng.uniform(self.mean_ms - spread, self.mean_ms + spread)
+        elif self.kind == "normal":
+            value = self._rng.gauss(self.mean_ms, self.stddev_ms)
+        else:
+            # Parámetros de la lognormal a partir de media y desviación deseadas
+            sigma2 = math.log(1 + (self.stddev_ms / self.mean_ms) ** 2)
+            mu = math.log(self.mean_ms) - sigma2 / 2
+            value = self._rng.lognormvariate(mu, math.sqrt(sigma2))
+
+        value = max(self.min_ms, value)
+        if self.max_ms is not None:
+            value = min(self.max_ms, value)
+        return value
+
+    async def wait(self) -> float:
+        """Espera (sin bloquear el event loop) una latencia muestreada."""
+        delay_ms = self.sample_ms()
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        return delay_ms
+
+    def wait_sync(self) -> float:
+        """Versión bloqueante (para APIs síncronas, igual que el cliente real)."""
+        delay_ms = self.sample_ms()
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        return delay_ms
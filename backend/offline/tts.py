@@ -0,0 +1,102 @@
+"""
+TTS offline (sustituto de ElevenLabsService).
+
+Misma interfaz que ElevenLabsService (text_to_speech, audio_to_data_url,
+get_available_voices) sin llamar a la API:
+
+- FakeTTSService: devuelve audio de tamaño fijo tras una latencia simulada.
+- RecordingTTSService / ReplayTTSService: record/replay del audio real.
+"""
+import base64
+import hashlib
+import time
+from typing import Optional
+
+from loguru import logger
+
+from backend.offline.cassette import Cassette, cassette_key
+from backend.offline.latency import LatencyModel
+from backend.services.elevenlabs_service import ElevenLabsService
+
+
+class FakeTTSService(ElevenLabsService):
+    """TTS determinista: bytes de relleno de tamaño fijo (no es audio reproducible)."""
+
+    def __init__(self, audio_bytes: int = 32_000, latency: Optional[LatencyModel] = None):
+        # No se llama a super().__init__: no hay cliente ni API key
+        self.api_key = None
+        self.client = None
+        self.enabled = True
+        self.default_voice_id = "fake-voice"
+        self.audio_size = audio_bytes
+        self.latency = latency or LatencyModel()
+
+    async def text_to_speech(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model_id: str = "eleven_multilingual_v2",
+        output_format: str = "mp3_44100_128",
+    ) -> Optional[bytes]:
+        await self.latency.wait()
+        seed = hashlib.sha256(text.encode("utf-8")).digest()
+        return (seed * (self.audio_size // len(seed) + 1))[: self.audio_size]
+
+    async def get_available_voices(self) -> list[dict]:
+        return [{
+            "voice_id": self.default_voice_id,
+            "name": "Fake",
+            "category": "offline",
+            "description": "Voz simulada (TTS_BACKEND=fake)",
+        }]
+
+
+class RecordingTTSService(ElevenLabsService):
+    """ElevenLabs real que además graba el audio y su latencia."""
+
+    def __init__(self, cassette: Cassette, api_key: Optional[str] = None):
+        super().__init__(api_key=api_key)
+        self.cassette = cassette
+
+    async def text_to_speech(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model_id: str = "eleven_multilingual_v2",
+        output_format: str = "mp3_44100_128",
+    ) -> Optional[bytes]:
+        started = time.perf_counter()
+        audio = await super().text_to_speech(text, voice_id, model_id, output_format)
+        if audio:
+            self.cassette.record(
+                cassette_key("tts", voice_id or self.default_voice_id, model_id, output_format, text),
+                base64.b64encode(audio).decode("ascii"),
+                (time.perf_counter() - started) * 1000,
+            )
+        return audio
+
+
+class ReplayTTSService(FakeTTSService):
+    """Reproduce audio grabado; los textos sin grabar usan el audio fake."""
+
+    def __init__(self, cassette: Cassette, voice_id: str, audio_bytes: int = 32_000,
+                 latency: Optional[LatencyModel] = None):
+        super().__init__(audio_bytes=audio_bytes, latency=latency)
+        self.cassette = cassette
+        self.default_voice_id = voice_id
+
+    async def text_to_speech(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model_id: str = "eleven_multilingual_v2",
+        output_format: str = "mp3_44100_128",
+    ) -> Optional[bytes]:
+        entry = self.cassette.lookup(
+            cassette_key("tts", voice_id or self.default_voice_id, model_id, output_format, text)
+        )
+        if entry is None:
+            logger.debug("📼 Texto sin audio grabado, usando TTS fake")
+            return await super().text_to_speech(text, voice_id, model_id, output_format)
+        await self.cassette.wait(entry["latency_ms"])
+        return base64.b64decode(entry["response"])
@@ -0,0 +1,376 @@
+"""
+Motor de búsqueda de catálogo en memoria.
+
+Para unos cientos/miles de productos no hace falta ir a Postgres en cada
+turno: el catálogo activo se carga al arrancar en registros con __slots__ y
+se indexa con BM25 (backend/nlp/bm25.py: tokens sin tildes, sin stopwords).
+Nombre y marca pesan más que categoría y SKU, igual que en
+ProductService.search_terms.
+
+Frescura:
+- LISTEN product_stocks_changed: el trigger de migrate_db_add_catalog_notify.py
+  notifica el id de cada fila modificada y se recargan solo esas filas.
+- Polling: cada `refresh_interval` s se compara un md5 de la tabla; si cambió
+  (o no hay trigger / se perdió una notificación) se recarga todo.
+
+Cada recarga arma un snapshot nuevo y lo publica con una sola asignación: las
+búsquedas en curso siguen usando el anterior.
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.database.models import ProductStock
+from backend.domain.product_schemas import ProductSearchFilters
+from backend.nlp.bm25 import BM25Index
+from backend.nlp.lexicon import fold_accents, normalize_text
+from backend.nlp.query_parser import color_aliases, color_sku_code
+
+CATALOG_CHANNEL = "product_stocks_changed"
+
+# Huella de toda la tabla (cualquier cambio en cualquier columna la altera)
+CATALOG_VERSION_SQL = text(
+    "SELECT md5(coalesce(string_agg(t::text, ',' ORDER BY t.id), '')) "
+    "FROM public.product_stocks t"
+)
+
+# Repeticiones de cada campo en el texto indexado (peso en BM25)
+FIELD_WEIGHTS = (
+    ("product_name", 3),
+    ("brand", 2),
+    ("category", 1),
+    ("product_sku", 1),
+)
+
+
+class CatalogProduct:
+    """Copia liviana de ProductStock para búsquedas (sin sesión ni ORM)."""
+
+    __slots__ = (
+        "id",
+        "product_name",
+        "product_sku",
+        "barcode",
+        "brand",
+        "category",
+        "quantity_available",
+        "unit_cost",
+        "original_price",
+        "discount_percent",
+        "discount_amount",
+        "is_on_sale",
+        "promotion_description",
+        "promotion_valid_until",
+        "shelf_location",
+        "warehouse_location",
+    )
+
+    id: UUID
+    product_name: str
+    product_sku: Optional[str]
+    barcode: Optional[str]
+    brand: Optional[str]
+    category: Optional[str]
+    quantity_available: int
+    unit_cost: Decimal
+    original_price: Optional[Decimal]
+    discount_percent: Optional[Decimal]
+    discount_amount: Optional[Decimal]
+    is_on_sale: bool
+    promotion_description: Optional[str]
+    promotion_valid_until: Optional[date]
+    shelf_location: Optional[str]
+    warehouse_location: str
+
+    # Mismos cálculos que el modelo (precio con descuento y ahorro)
+    final_price = ProductStock.final_price
+    savings_amount = ProductStock.savings_amount
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field))
+
+    @classmethod
+    def from_model(cls, product: ProductStock) -> "CatalogProduct":
+        return cls(**{field: getattr(product, field) for field in cls.__slots__})
+
+    def search_text(self) -> str:
+        return " ".join(
+            " ".join([getattr(self, field) or ""] * weight)
+            for field, weight in FIELD_WEIGHTS
+        )
+
+    def __repr__(self) -> str:
+        return f"CatalogProduct({self.product_name!r}, stock={self.quantity_available})"
+
+
+@dataclass(frozen=True)
+class _CatalogSnapshot:
+    products: List[CatalogProduct]
+    index: BM25Index
+    version: Optional[str]
+
+
+def _same(value: Optional[str], expected: str) -> bool:
+    return fold_accents((value or "").lower()) == fold_accents(expected.lower())
+
+
+def _has_color(product: CatalogProduct, color: str) -> bool:
+    """Mismo criterio que el SQL: alias como palabra completa o código como sufijo del SKU."""
+    words = set(normalize_text(
+        f"{product.product_name} {product.product_sku or ''} {product.shelf_location or ''}"
+    ).split())
+    if words.intersection(color_aliases(color)):
+        return True
+    code = color_sku_code(color)
+    return bool(code and (product.product_sku or "").upper().endswith(f"-{code}"))
+
+
+class CatalogSearchEngine:
+    """Índice invertido BM25 del catálogo activo, refrescado desde Postgres."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        refresh_interval: float = 30.0,
+        listen: bool = True,
+    ):
+        """
+        Args:
+            session_factory: Fábrica de sesiones de la DB
+            refresh_interval: Segundos entre comparaciones de versión (polling)
+            listen: Escuchar NOTIFY de Postgres para refrescos por fila
+        """
+        self.session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self.listen = listen
+        self._snapshot: Optional[_CatalogSnapshot] = None
+        self._pending: Set[str] = set()
+        self._changed = asyncio.Event()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+        self.reloads = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def __len__(self) -> int:
+        return len(self._snapshot.products) if self._snapshot else 0
+
+    def vocabulary(self) -> Tuple[List[str], List[str]]:
+        """Marcas y categorías distintas del snapshot vigente."""
+        products = self._snapshot.products if self._snapshot else []
+        brands = sorted({p.brand for p in products if p.brand})
+        categories = sorted({p.category for p in products if p.category})
+        return brands, categories
+
+    # Búsqueda
+
+    def search(
+        self,
+        terms: Union[str, Iterable[str]],
+        filters: Optional[ProductSearchFilters] = None,
+        limit: int = 10,
+    ) -> List[CatalogProduct]:
+        """
+        Productos ordenados por BM25 (vacío si el catálogo no está cargado).
+
+        Args:
+            terms: Query o lista de términos
+            filters: Filtros opcionales (categoría, marca, precio, stock, oferta)
+            limit: Número máximo de productos a retornar
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+
+        query = terms if isinstance(terms, str) else " ".join(terms)
+        if query.strip():
+            ranked = snapshot.index.search(query, k=len(snapshot.products))
+            # Empate de score → orden alfabético, como en SQL
+            ranked.sort(key=lambda hit: (-hit[1], snapshot.products[hit[0]].product_name))
+        else:
+            # Solo filtros
+            ranked = sorted(
+                ((position, 0.0) for position in range(len(snapshot.products))),
+                key=lambda hit: snapshot.products[hit[0]].product_name,
+            )
+
+        results = []
+        for position, _ in ranked:
+            product = snapshot.products[position]
+            if self._matches(product, filters):
+                results.append(product)
+                if len(results) >= limit:
+                    break
+        return results
+
+    @staticmethod
+    def _matches(product: CatalogProduct, filters: Optional[ProductSearchFilters]) -> bool:
+        if filters is None:
+            return True
+        if filters.category and not _same(product.category, filters.category):
+            return False
+        if filters.brand and not _same(product.brand, filters.brand):
+            return False
+        if filters.brands and not any(_same(product.brand, brand) for brand in filters.brands):
+            return False
+        if filters.color and not _has_color(product, filters.color):
+            return False
+        if filters.min_price is not None and product.final_price < filters.min_price:
+            return False
+        if filters.max_price is not None and product.final_price > filters.max_price:
+            return False
+        if filters.in_stock_only and product.quantity_available <= 0:
+            return False
+        if filters.on_sale_only and not product.is_on_sale:
+            return False
+        return True
+
+    # Carga y refresco
+
+    async def load(self) -> int:
+        """Carga (o recarga) todo el catálogo activo. Retorna la cantidad de productos."""
+        async with self._refresh_lock:
+            async with self.session_factory() as session:
+                version = await self._fetch_version(session)
+                result = await session.execute(
+                    select(ProductStock).where(ProductStock.is_active == True)
+                )
+                products = [CatalogProduct.from_model(p) for p in result.scalars().all()]
+
+            self._publish(products, version)
+            logger.info(f"🗂️ Catálogo en memoria: {len(products)} productos indexados")
+            return len(products)
+
+    async def refresh(self, product_ids: Iterable[str]) -> None:
+        """Recarga solo los productos indicados (altas, cambios de stock/precio, bajas)."""
+        ids = {str(product_id) for product_id in product_ids}
+        if not ids or self._snapshot is None:
+            return
+
+        async with self._refresh_lock:
+            async with self.session_factory() as session:
+                version = await self._fetch_version(session)
+                result = await session.execute(
+                    select(ProductStock).where(ProductStock.id.in_([UUID(i) for i in ids]))
+                )
+                changed = {str(p.id): p for p in result.scalars().all()}
+
+            products: Dict[str, CatalogProduct] = {
+                str(p.id): p for p in self._snapshot.products if str(p.id) not in ids
+            }
+            for product_id, product in changed.items():
+                if product.is_active:
+                    products[product_id] = CatalogProduct.from_model(product)
+
+            self._publish(list(products.values()), version)
+            logger.info(f"🗂️ Catálogo en memoria: {len(ids)} productos actualizados")
+
+    def _publish(self, products: List[CatalogProduct], version: Optional[str]) -> None:
+        index = BM25Index([product.search_text() for product in products])
+        self._snapshot = _CatalogSnapshot(products=products, index=index, version=version)
+        self.reloads += 1
+
+    @staticmethod
+    async def _fetch_version(session: AsyncSession) -> Optional[str]:
+        result = await session.execute(CATALOG_VERSION_SQL)
+        return result.scalar()
+
+    async def _has_changed(self) -> bool:
+        async with self.session_factory() as session:
+            version = await self._fetch_version(session)
+        return self._snapshot is None or version != self._snapshot.version
+
+    # Vigilancia
+
+    def start(self) -> asyncio.Task:
+        """Carga el catálogo en segundo plano y lo mantiene actualizado."""
+        self._watch_task = asyncio.create_task(self._watch())
+        return self._watch_task
+
+    async def stop(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    def notify(self, product_id: str) -> None:
+        """Encola un producto modificado (callback de LISTEN o llamado directo)."""
+        self._pending.add(product_id)
+        self._changed.set()
+
+    async def _watch(self) -> None:
+        listener = None
+        try:
+            while not self.ready:
+                try:
+                    await self.load()
+                except Exception as e:
+                    logger.error(f"❌ No se pudo cargar el catálogo en memoria: {e}")
+                    await asyncio.sleep(self.refresh_interval)
+
+            if self.listen:
+                listener = await self._start_listener()
+
+            while True:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=self.refresh_interval)
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    await self._refresh_pending()
+                except Exception as e:
+                    logger.error(f"❌ Error refrescando el catálogo en memoria: {e}")
+        finally:
+            if listener is not None:
+                await listener.close()
+
+    async def _refresh_pending(self) -> None:
+        if self._changed.is_set():
+            self._changed.clear()
+            pending, self._pending = self._pending, set()
+            await self.refresh(pending)
+        elif await self._has_changed():
+            # Sin trigger o con notificaciones perdidas: recarga completa
+            await self.load()
+
+    async def _start_listener(self):
+        """LISTEN sobre una conexión dedicada (solo asyncpg). None si no se puede."""
+        engine = self.session_factory.kw.get("bind")
+        connection = None
+        try:
+            connection = await engine.connect()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.add_listener(
+                CATALOG_CHANNEL, lambda *args: self.notify(args[-1])
+            )
+        except Exception as e:
+            if connection is not None:
+                await connection.close()
+            logger.warning(
+                f"🗂️ LISTEN {CATALOG_CHANNEL} no disponible, solo polling "
+                f"cada {self.refresh_interval}s: {e}"
+            )
+            return None
+        logger.info(f"🗂️ Escuchando cambios de catálogo ({CATALOG_CHANNEL})")
+        return connection
+
+    def get_stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": len(self),
+            "reloads": self.reloads,
+            "version": self._snapshot.version if self._snapshot else None,
+        }
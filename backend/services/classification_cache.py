@@ -0,0 +1,217 @@
+"""
+Caché de clasificaciones de intención.
+
+Los clientes repiten mucho los mismos arranques ("busco unos Nike",
+"cuánto cuesta el envío"), y cada uno costaba una llamada LLM. Niveles:
+
+1. Exacto: query normalizada (sin tildes/puntuación) en un LRU en proceso,
+   respaldado por Redis con TTL (compartido entre réplicas).
+2. Semántico (opcional): embedding de la query contra las clasificaciones
+   ya guardadas; si la similitud coseno supera el umbral se reutiliza.
+
+La key incluye una firma del contexto (si ya hay productos vistos y si hay
+historial), porque "sí, esos" no significa lo mismo en cada caso.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import redis.asyncio as redis
+from loguru import logger
+
+from backend.domain.agent_schemas import AgentState, IntentClassification
+from backend.nlp.lexicon import normalize_text
+
+EmbedFn = Callable[[str], Awaitable[Sequence[float]]]
+
+# Solo se cachean clasificaciones producidas por el LLM
+CACHEABLE_SOURCES = {"llm", "turn_analysis"}
+
+
+class ClassificationCache:
+    """Caché de dos niveles (LRU + Redis) con lookup semántico opcional."""
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        max_entries: int = 1024,
+        ttl_seconds: int = 86400,
+        key_prefix: str = "intent_cache",
+        min_confidence: float = 0.6,
+        embed_fn: Optional[EmbedFn] = None,
+        similarity_threshold: float = 0.92,
+    ):
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.min_confidence = min_confidence
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+
+        self._memory: "OrderedDict[str, IntentClassification]" = OrderedDict()
+        # Índice semántico por firma de contexto: [(vector normalizado, clasificación)]
+        self._vectors: Dict[str, List[Tuple[np.ndarray, IntentClassification]]] = {}
+        # Embeddings calculados en un miss, reutilizados por put()
+        self._pending_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        logger.info(
+            f"ClassificationCache inicializado (max={max_entries}, TTL={ttl_seconds}s, "
+            f"redis={'sí' if redis_client is not None else 'no'}, "
+            f"semántico={'sí' if embed_fn is not None else 'no'})"
+        )
+
+    # Keys
+
+    @staticmethod
+    def context_signature(state: AgentState) -> str:
+        """Firma del contexto que cambia el significado de la query."""
+        has_results = int(bool(state.search_results))
+        has_history = int(bool(state.conversation_history))
+        return f"r{has_results}h{has_history}"
+
+    def _make_key(self, state: AgentState) -> Optional[str]:
+        normalized = normalize_text(state.user_query)
+        if not normalized:
+            return None
+        return f"{self.context_signature(state)}:{normalized}"
+
+    def _redis_key(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    # API
+
+    async def get(self, state: AgentState) -> Optional[IntentClassification]:
+        """Busca una clasificación reutilizable para el query del estado."""
+        key = self._make_key(state)
+        if key is None:
+            return None
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return self._as_hit(cached)
+
+        cached = await self._redis_get(key)
+        if cached is not None:
+            self._remember(key, cached)
+            self.redis_hits += 1
+            return self._as_hit(cached)
+
+        if self.embed_fn is not None:
+            cached = await self._semantic_lookup(key, state)
+            if cached is not None:
+                self.semantic_hits += 1
+                return self._as_hit(cached)
+
+        self.misses += 1
+        return None
+
+    async def put(self, state: AgentState, classification: IntentClassification) -> None:
+        """Guarda una clasificación del LLM (las de baja confianza no se cachean)."""
+        if classification.source not in CACHEABLE_SOURCES:
+            return
+        if classification.confidence < self.min_confidence:
+            return
+
+        key = self._make_key(state)
+        if key is None:
+            return
+
+        self._remember(key, classification)
+
+        if self.redis is not None:
+            try:
+                await self.redis.setex(
+                    self._redis_key(key),
+                    self.ttl_seconds,
+                    classification.model_dump_json(),
+                )
+            except redis.RedisError as e:
+                logger.warning(f"No se pudo guardar clasificación en Redis: {e}")
+
+        vector = self._pending_vectors.pop(key, None)
+        if vector is not None:
+            bucket = self._vectors.setdefault(key.split(":", 1)[0], [])
+            bucket.append((vector, classification))
+            if len(bucket) > self.max_entries:
+                del bucket[0]
+
+    def get_stats(self) -> Dict[str, object]:
+        """Contadores de hits/misses por nivel."""
+        hits = self.memory_hits + self.redis_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+            "memory_entries": len(self._memory),
+            "semantic_entries": sum(len(bucket) for bucket in self._vectors.values()),
+        }
+
+    # Internos
+
+    def _as_hit(self, classification: IntentClassification) -> IntentClassification:
+        return classification.model_copy(update={"source": "cache"})
+
+    def _remember(self, key: str, classification: IntentClassification) -> None:
+        self._memory[key] = classification
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> Optional[IntentClassification]:
+        if self.redis is None:
+            return None
+        try:
+            data = await self.redis.get(self._redis_key(key))
+        except redis.RedisError as e:
+            logger.warning(f"Error de Redis leyendo caché de clasificación: {e}")
+            return None
+        if data is None:
+            return None
+        try:
+            return IntentClassification(**json.loads(data))
+        except Exception as e:
+            logger.warning(f"Entrada de caché de clasificación inválida: {e}")
+            return None
+
+    async def _semantic_lookup(
+        self, key: str, state: AgentState
+    ) -> Optional[IntentClassification]:
+        try:
+            vector = np.asarray(await self.embed_fn(state.user_query), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"No se pudo calcular embedding para caché semántico: {e}")
+            return None
+
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        vector /= norm
+
+        self._pending_vectors[key] = vector
+        while len(self._pending_vectors) > self.max_entries:
+            self._pending_vectors.popitem(last=False)
+
+        bucket = self._vectors.get(self.context_signature(state))
+        if not bucket:
+            return None
+
+        matrix = np.stack([stored for stored, _ in bucket])
+        similarities = matrix @ vector
+        best = int(similarities.argmax())
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return bucket[best][1]
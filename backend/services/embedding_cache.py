@@ -0,0 +1,125 @@
+"""
+Caché de embeddings de queries.
+
+Cada búsqueda RAG re-embebía la query (round trip a Vertex AI) aunque la
+pregunta fuera la misma ("horario de atención"). Niveles:
+
+1. LRU en proceso (vectores numpy float32).
+2. Redis con TTL, compartido entre réplicas. El vector se guarda como bytes
+   float32 en base64 (el cliente usa decode_responses=True).
+
+La key es (modelo de embeddings, query normalizada sin tildes/puntuación).
+"""
+import base64
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import redis.asyncio as redis
+from loguru import logger
+
+from backend.nlp.lexicon import normalize_text
+
+
+class EmbeddingCache:
+    """Caché de dos niveles (LRU + Redis) para vectores de queries."""
+
+    def __init__(
+        self,
+        model_id: str,
+        redis_client: Optional[redis.Redis] = None,
+        max_entries: int = 2048,
+        ttl_seconds: int = 604800,
+        key_prefix: str = "emb_cache",
+    ):
+        self.model_id = model_id
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _make_key(self, text: str) -> Optional[str]:
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+        digest = hashlib.sha1(f"{self.model_id}:{normalized}".encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    async def get(self, text: str) -> Optional[np.ndarray]:
+        """Vector cacheado de la query, o None."""
+        key = self._make_key(text)
+        if key is None:
+            return None
+
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return vector
+
+        vector = await self._redis_get(key)
+        if vector is not None:
+            self._remember(key, vector)
+            self.redis_hits += 1
+            return vector
+
+        self.misses += 1
+        return None
+
+    async def put(self, text: str, vector: Sequence[float]) -> None:
+        key = self._make_key(text)
+        if key is None:
+            return
+
+        array = np.asarray(vector, dtype=np.float32)
+        self._remember(key, array)
+
+        if self.redis is not None:
+            try:
+                payload = base64.b64encode(array.tobytes()).decode("ascii")
+                await self.redis.setex(key, self.ttl_seconds, payload)
+            except redis.RedisError as e:
+                logger.warning(f"No se pudo guardar embedding en Redis: {e}")
+
+    def get_stats(self) -> Dict[str, object]:
+        hits = self.memory_hits + self.redis_hits
+        total = hits + self.misses
+        return {
+            "model": self.model_id,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+            "memory_entries": len(self._memory),
+        }
+
+    # Internos
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> Optional[np.ndarray]:
+        if self.redis is None:
+            return None
+        try:
+            data = await self.redis.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Error de Redis leyendo caché de embeddings: {e}")
+            return None
+        if data is None:
+            return None
+        try:
+            return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Entrada de caché de embeddings inválida: {e}")
+            return None
@@ -0,0 +1,157 @@
+"""
+Compactación del historial de conversación.
+
+`AgentState.conversation_history` crecía sin límite: se re-serializaba
+completo a Redis en cada turno. El manager mantiene el historial acotado:
+
+- Tope duro de mensajes crudos y presupuesto aproximado de tokens.
+- Al pasarse, los mensajes más antiguos se pliegan en `conversation_summary`
+  (resumen extractivo, o con el LLM si se configura un summarizer).
+- Se recorta hasta `keep_recent` mensajes (histéresis): la compactación ocurre
+  cada varios turnos, no en todos.
+"""
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from loguru import logger
+
+from backend.domain.agent_schemas import AgentState
+
+Message = Dict[str, str]
+Summarizer = Callable[[Optional[str], List[Message]], Awaitable[str]]
+
+# Overhead aproximado por mensaje (rol + separadores en el prompt)
+MESSAGE_OVERHEAD_TOKENS = 4
+ROLE_LABELS = {"user": "Cliente", "assistant": "Alex"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimación barata de tokens (~4 caracteres por token en español)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def history_tokens(history: List[Message]) -> int:
+    """Tokens aproximados de una lista de mensajes."""
+    return sum(
+        estimate_tokens(msg.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+        for msg in history
+    )
+
+
+class ConversationHistoryManager:
+    """Mantiene el historial dentro de un presupuesto de mensajes y tokens."""
+
+    def __init__(
+        self,
+        max_messages: int = 12,
+        token_budget: int = 1500,
+        keep_recent: int = 6,
+        summary_token_budget: int = 300,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.max_messages = max_messages
+        self.token_budget = token_budget
+        self.keep_recent = max(1, min(keep_recent, max_messages))
+        self.summary_token_budget = summary_token_budget
+        self.summarizer = summarizer
+
+        self.compactions = 0
+        self.evicted_messages = 0
+        self.summarizer_failures = 0
+
+    def needs_compaction(self, state: AgentState) -> bool:
+        history = state.conversation_history
+        return (
+            len(history) > self.max_messages
+            or history_tokens(history) > self.token_budget
+        )
+
+    async def compact(self, state: AgentState) -> AgentState:
+        """Pliega los mensajes antiguos en el resumen si el historial se pasó del presupuesto."""
+        if not self.needs_compaction(state):
+            return state
+
+        history = state.conversation_history
+        split = max(0, len(history) - self.keep_recent)
+        # Si los recientes aún no caben en el presupuesto, se pliegan más (queda al menos 1)
+        while split < len(history) - 1 and history_tokens(history[split:]) > self.token_budget:
+            split += 1
+
+        evicted, kept = history[:split], history[split:]
+        if not evicted:
+            return state
+
+        state.conversation_summary = await self._summarize(state.conversation_summary, evicted)
+        state.conversation_history = kept
+
+        self.compactions += 1
+        self.evicted_messages += len(evicted)
+        logger.debug(
+            f"Historial compactado: {len(evicted)} mensajes al resumen, "
+            f"{len(kept)} mensajes crudos (~{history_tokens(kept)} tokens)"
+        )
+        return state
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "compactions": self.compactions,
+            "evicted_messages": self.evicted_messages,
+            "summarizer_failures": self.summarizer_failures,
+        }
+
+    # Internos
+
+    async def _summarize(self, previous: Optional[str], evicted: List[Message]) -> str:
+        if self.summarizer is not None:
+            try:
+                summary = (await self.summarizer(previous, evicted)).strip()
+                if summary:
+                    return self._fit_summary(summary.splitlines())
+            except Exception as e:
+                self.summarizer_failures += 1
+                logger.warning(f"No se pudo resumir el historial con el LLM: {e}")
+        return self._extractive_summary(previous, evicted)
+
+    def _extractive_summary(self, previous: Optional[str], evicted: List[Message]) -> str:
+        """Una línea recortada por mensaje; se descartan las más antiguas si no caben."""
+        lines = previous.splitlines() if previous else []
+        for msg in evicted:
+            label = ROLE_LABELS.get(msg.get("role", ""), msg.get("role", ""))
+            content = " ".join(msg.get("content", "").split())
+            if len(content) > 160:
+                content = content[:157].rstrip() + "..."
+            lines.append(f"- {label}: {content}")
+        return self._fit_summary(lines)
+
+    def _fit_summary(self, lines: List[str]) -> str:
+        lines = [line for line in lines if line.strip()]
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_token_budget:
+            lines.pop(0)
+        summary = "\n".join(lines)
+        max_chars = self.summary_token_budget * 4
+        return summary[-max_chars:] if len(summary) > max_chars else summary
+
+
+def make_llm_summarizer(llm_provider) -> Summarizer:
+    """Summarizer que usa el perfil "summarize" del LLMProvider."""
+
+    async def summarize(previous: Optional[str], evicted: List[Message]) -> str:
+        transcript = "\n".join(
+            f"{ROLE_LABELS.get(msg.get('role', ''), msg.get('role', ''))}: {msg.get('content', '')}"
+            for msg in evicted
+        )
+        messages = [
+            SystemMessage(content=(
+                "Resume la conversación de venta en viñetas breves (máximo 6). "
+                "Conserva productos, tallas, precios, objeciones y datos que el "
+                "cliente ya dio. No inventes nada."
+            )),
+            HumanMessage(content=(
+                f"RESUMEN ANTERIOR:\n{previous or '(vacío)'}\n\n"
+                f"MENSAJES NUEVOS:\n{transcript}"
+            )),
+        ]
+        response = await llm_provider.ainvoke(messages, call_site="summary")
+        return response.content if isinstance(response.content, str) else ""
+
+    return summarize
@@ -0,0 +1,147 @@
+"""
+Indexado incremental de la base de conocimiento (chunks.csv + faqs.csv).
+
+Cada documento se identifica por el hash de su contenido + metadata, así que
+editar una FAQ equivale a borrar un id y agregar otro: un solo embedding.
+
+El manifest guarda la huella (sha256) de cada CSV y el modelo de embeddings;
+al arrancar, si nada cambió, no se parsean los CSVs ni se consulta el índice.
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+from loguru import logger
+
+
+def document_id(document: Document) -> str:
+    """Id estable derivado del contenido y la metadata del documento."""
+    raw = json.dumps(
+        {"content": document.page_content, "metadata": document.metadata},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+def file_fingerprint(path: Path) -> Optional[str]:
+    """sha256 del archivo (None si no existe)."""
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class IndexPlan:
+    """Cambios necesarios para que el índice refleje los CSVs."""
+
+    to_add: List[Tuple[str, Document]] = field(default_factory=list)
+    to_delete: List[str] = field(default_factory=list)
+    keep: List[str] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> int:
+        return len(self.keep)
+
+    @property
+    def is_noop(self) -> bool:
+        return not self.to_add and not self.to_delete
+
+
+class KnowledgeBaseIndexer:
+    """Calcula el diff entre los CSVs y el índice, y mantiene el manifest."""
+
+    def __init__(self, manifest_path: Path, sources: Sequence[Path], embedding_model: str):
+        self.manifest_path = manifest_path
+        self.sources = list(sources)
+        self.embedding_model = embedding_model
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Manifest del índice ilegible ({e}), se reindexará")
+            return {}
+
+    def _fingerprints(self) -> Dict[str, Optional[str]]:
+        return {path.name: file_fingerprint(path) for path in self.sources}
+
+    @property
+    def active_collection(self) -> Optional[str]:
+        """Colección de Chroma vigente (cada recarga crea una nueva)."""
+        return self._manifest.get("collection")
+
+    @property
+    def model_changed(self) -> bool:
+        model = self._manifest.get("embedding_model")
+        return model is not None and model != self.embedding_model
+
+    def is_up_to_date(self, indexed_count: int) -> bool:
+        """True si los CSVs y el modelo coinciden con el manifest (chequeo barato)."""
+        return (
+            bool(self._manifest)
+            and not self.model_changed
+            and self._manifest.get("sources") == self._fingerprints()
+            and self._manifest.get("document_count") == indexed_count
+        )
+
+    def plan(
+        self,
+        documents: Sequence[Document],
+        current: Sequence[Tuple[str, Document]],
+        full: bool = False,
+    ) -> IndexPlan:
+        """
+        Diff por hash de contenido.
+
+        `current` son los (id en el índice, documento) existentes; los ids
+        antiguos (p. ej. UUIDs de Chroma) se reconocen por su contenido.
+        """
+        desired: Dict[str, Document] = {}
+        for document in documents:
+            desired.setdefault(document_id(document), document)
+
+        plan = IndexPlan()
+        if full or self.model_changed:
+            # Vectores de otro modelo: no son reutilizables
+            plan.to_delete = [store_id for store_id, _ in current]
+            plan.to_add = list(desired.items())
+            return plan
+
+        present = set()
+        for store_id, document in current:
+            content_id = document_id(document)
+            if content_id in desired and content_id not in present:
+                present.add(content_id)
+                plan.keep.append(store_id)
+            else:
+                # Fila borrada/editada, o duplicado
+                plan.to_delete.append(store_id)
+
+        plan.to_add = [(doc_id, doc) for doc_id, doc in desired.items() if doc_id not in present]
+        return plan
+
+    def write_manifest(self, document_count: int, collection: Optional[str] = None) -> None:
+        self._manifest = {
+            "embedding_model": self.embedding_model,
+            "sources": self._fingerprints(),
+            "document_count": document_count,
+            "collection": collection,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._manifest, indent=2), encoding="utf-8")
+        tmp_path.replace(self.manifest_path)
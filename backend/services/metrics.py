@@ -0,0 +1,49 @@
+"""
+Métricas de latencia en memoria.
+
+Ventanas deslizantes simples para reportar p50/p95 sin dependencias externas.
+Se usan en el orquestador y los servicios para medir el costo de cada fase.
+"""
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyTracker:
+    """
+    Registra latencias (en ms) en una ventana deslizante.
+
+    - count/total_ms acumulan desde el arranque
+    - los percentiles se calculan sobre las últimas `window` muestras
+    """
+
+    def __init__(self, window: int = 500):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        """Agrega una muestra de latencia en milisegundos."""
+        self._samples.append(elapsed_ms)
+        self.count += 1
+        self.total_ms += elapsed_ms
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Percentil p (0-100) sobre la ventana actual (nearest-rank)."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered))) - 1))
+        return ordered[rank]
+
+    def snapshot(self) -> Dict[str, float]:
+        """Resumen listo para logs o endpoints de stats."""
+        return {
+            "count": self.count,
+            "avg_ms": round(self.avg_ms, 1),
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+        }
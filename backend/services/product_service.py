@@ -3,15 +3,55 @@ Servicio de Gestión de Productos (Inventario).
 se conecta el Agente con la Base de Datos Real.
 """
 import asyncio
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import case, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from sqlalchemy.exc import SQLAlchemyError, OperationalError, ProgrammingError
 
 from backend.config.logging_config import get_logger
 from backend.database.models import ProductStock
+from backend.domain.product_schemas import ProductSearchFilters
+from backend.services.catalog_search import CatalogSearchEngine
+from backend.nlp.lexicon import tokenize
+from backend.nlp.query_parser import color_aliases, color_sku_code
+
+# Configuración de texto "spanish" + unaccent (creada por migrate_db_add_fulltext_search.py)
+FTS_CONFIG = "public.spanish_unaccent"
+
+# Columna tsvector generada por la migración. No se mapea en ProductStock para
+# que las bases sin migrar sigan funcionando (búsqueda ILIKE).
+SEARCH_VECTOR = literal_column("product_stocks.search_vector")
+
+# Peso de una coincidencia según el campo (búsqueda ILIKE de search_terms);
+# en full-text lo equivalente son los pesos A/B/C del search_vector
+TERM_FIELD_WEIGHTS = (
+    (ProductStock.product_name, 3),
+    (ProductStock.brand, 2),
+    (ProductStock.category, 1),
+    (ProductStock.product_sku, 1),
+)
+
+# Precio final en SQL, mismo cálculo que ProductStock.final_price: los filtros
+# de precio comparan lo que paga el cliente, no unit_cost
+FINAL_PRICE = case(
+    (
+        ProductStock.is_on_sale == True,
+        func.greatest(
+            ProductStock.unit_cost
+            - ProductStock.unit_cost
+            * func.greatest(func.coalesce(ProductStock.discount_percent, 0), 0) / 100
+            - func.greatest(func.coalesce(ProductStock.discount_amount, 0), 0),
+            0,
+        ),
+    ),
+    else_=ProductStock.unit_cost,
+)
+
+# Umbral de pg_trgm para el operador <% (word_similarity), fijado por transacción
+TRGM_THRESHOLD_SETTING = "pg_trgm.word_similarity_threshold"
 
 
 class ProductServiceError(Exception):
@@ -42,9 +82,29 @@ class ProductService:
     Este servicio se mantiene para compatibilidad.
     """
     
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        search_mode: str = "fts",
+        fuzzy_search: bool = True,
+        fuzzy_threshold: float = 0.3,
+        catalog: Optional[CatalogSearchEngine] = None,
+    ) -> None:
+        """
+        Args:
+            session_factory: Fábrica de sesiones de la DB
+            search_mode: "fts" (tsvector + ts_rank, cae a ILIKE si la base no
+                está migrada) o "ilike"
+            fuzzy_search: Habilita search_fuzzy (pg_trgm, tolera errores de tipeo)
+            fuzzy_threshold: Similitud mínima por trigramas (0-1) para search_fuzzy
+            catalog: Catálogo en memoria; si está cargado, search_terms no va a la DB
+        """
         # Inyectamos la fábrica de sesiones para conectar a la DB
         self.session_factory = session_factory
+        self.search_mode = search_mode
+        self.fuzzy_search = fuzzy_search
+        self.fuzzy_threshold = fuzzy_threshold
+        self.catalog = catalog
         self.logger = get_logger("product_service")
 
     async def get_all_products(self, limit: int = 50) -> list[ProductStock]:
@@ -82,11 +142,12 @@ class ProductService:
         """
         Busca productos por nombre o palabras clave con manejo robusto de errores.
 
+        Con search_mode="fts" usa el índice GIN sobre nombre, marca, categoría
+        y SKU, ordenando por ts_rank; si no, un OR de ILIKE por palabra.
+
         Returns:
             Lista de productos encontrados (vacía en caso de error)
         """
-        from sqlalchemy import or_
-
         self.logger.info(
             "product_search_started",
             search_term=name,
@@ -97,25 +158,14 @@ class ProductService:
             async with self.session_factory() as session:
                 # Búsqueda inteligente: dividir el término en palabras y buscar cada una
                 search_words = name.lower().split()
-
-                # Crear condiciones OR para cada palabra
-                conditions = []
-                for word in search_words:
-                    # Buscar en product_name y product_sku
-                    conditions.append(ProductStock.product_name.ilike(f"%{word}%"))
-                    conditions.append(ProductStock.product_sku.ilike(f"%{word}%"))
-
-                query = select(ProductStock).where(
-                    or_(*conditions),
-                    ProductStock.is_active == True
-                ).limit(10)
-
                 self.logger.info(f"🗃️ Palabras de búsqueda: {search_words}")
 
-                # Ejecutar query con timeout
-                result = await asyncio.wait_for(
-                    session.execute(query),
-                    timeout=5.0  # 5 segundos máximo
+                query = self._fulltext_query(name) if self.search_mode == "fts" else None
+                if query is None:
+                    query = self._ilike_query(search_words)
+
+                result = await self._execute_search(
+                    session, query, lambda: self._ilike_query(search_words)
                 )
 
                 products = list(result.scalars().all())
@@ -151,6 +201,402 @@ class ProductService:
             )
             return []
 
+    async def search_terms(
+        self,
+        terms: List[str],
+        filters: Optional[ProductSearchFilters] = None,
+        limit: int = 10,
+    ) -> list[ProductStock]:
+        """
+        Busca varios términos en una sola consulta, sin duplicados y ordenada
+        por relevancia: primero cuántos términos coinciden y luego dónde
+        (nombre y marca pesan más que categoría y SKU).
+
+        Args:
+            terms: Términos de búsqueda (ej. palabras significativas de la query)
+            filters: Filtros opcionales (categoría, marcas, precio, color, stock,
+                oferta). Sin términos, la búsqueda es solo por filtros.
+            limit: Número máximo de productos a retornar
+
+        Con el catálogo en memoria cargado responde desde ahí (CatalogProduct,
+        mismos atributos que ProductStock) sin consultar la DB.
+
+        Returns:
+            Lista de productos encontrados (vacía en caso de error)
+        """
+        terms = [term for term in terms if term.strip()]
+        if not terms and filters is None:
+            return []
+
+        if self.catalog is not None and self.catalog.ready:
+            products = self.catalog.search(terms, filters, limit)
+            self.logger.info(
+                f"🗂️ ProductService: {len(products)} productos para {len(terms)} términos (catálogo en memoria)"
+            )
+            return products
+
+        try:
+            async with self.session_factory() as session:
+                query = (
+                    self._scored_fulltext_query(terms, filters, limit)
+                    if self.search_mode == "fts" else None
+                )
+                if query is None:
+                    query = self._scored_ilike_query(terms, filters, limit)
+
+                result = await self._execute_search(
+                    session, query, lambda: self._scored_ilike_query(terms, filters, limit)
+                )
+
+                products = list(result.scalars().all())
+                self.logger.info(
+                    f"🗃️ ProductService: {len(products)} productos para {len(terms)} términos"
+                )
+                return products
+
+        except asyncio.TimeoutError:
+            self.logger.error(f"⏱️ Timeout buscando productos (>5s): {terms}")
+            return []
+
+        except OperationalError as e:
+            self.logger.error(
+                f"🚨 Base de datos no disponible al buscar {terms}: {str(e)}",
+                exc_info=True
+            )
+            return []
+
+        except SQLAlchemyError as e:
+            self.logger.error(
+                f"❌ Error de BD al buscar {terms}: {str(e)}",
+                exc_info=True
+            )
+            return []
+
+        except Exception as e:
+            self.logger.error(
+                f"💥 Error inesperado buscando {terms}: {str(e)}",
+                exc_info=True
+            )
+            return []
+
+    async def _execute_search(self, session: AsyncSession, query, ilike_query):
+        """
+        Ejecuta la búsqueda con timeout. Si la base no tiene la migración
+        full-text, pasa a search_mode="ilike" y reintenta con `ilike_query()`.
+        """
+        try:
+            return await asyncio.wait_for(
+                session.execute(query),
+                timeout=5.0  # 5 segundos máximo
+            )
+        except ProgrammingError as e:
+            if self.search_mode != "fts":
+                raise
+            # Base sin migrar (falta search_vector o la configuración de texto)
+            self.logger.warning(
+                f"🗃️ Búsqueda full-text no disponible, usando ILIKE "
+                f"(ejecutar migrate_db_add_fulltext_search.py): {e.orig}"
+            )
+            self.search_mode = "ilike"
+            await session.rollback()
+            return await asyncio.wait_for(
+                session.execute(ilike_query()),
+                timeout=5.0
+            )
+
+    @staticmethod
+    def _apply_filters(query, filters: Optional[ProductSearchFilters]):
+        """Agrega a la query las condiciones de ProductSearchFilters."""
+        if filters is None:
+            return query
+        if filters.category:
+            query = query.where(ProductStock.category.ilike(filters.category))
+        if filters.brand:
+            query = query.where(ProductStock.brand.ilike(filters.brand))
+        if filters.brands:
+            query = query.where(
+                func.lower(ProductStock.brand).in_([brand.lower() for brand in filters.brands])
+            )
+        if filters.color:
+            # Sin columna de color: el alias como palabra completa (\m…\M) en
+            # nombre, SKU o descripción ("red" no debe coincidir con "Predator"),
+            # o el código como sufijo del SKU (…-BLK)
+            conditions = [
+                column.op("~*")(rf"\m{alias}\M")
+                for alias in color_aliases(filters.color)
+                for column in (
+                    ProductStock.product_name,
+                    ProductStock.product_sku,
+                    ProductStock.shelf_location,
+                )
+            ]
+            code = color_sku_code(filters.color)
+            if code:
+                conditions.append(ProductStock.product_sku.ilike(f"%-{code}"))
+            query = query.where(or_(*conditions))
+        if filters.min_price is not None:
+            query = query.where(FINAL_PRICE >= filters.min_price)
+        if filters.max_price is not None:
+            query = query.where(FINAL_PRICE <= filters.max_price)
+        if filters.in_stock_only:
+            query = query.where(ProductStock.quantity_available > 0)
+        if filters.on_sale_only:
+            query = query.where(ProductStock.is_on_sale == True)
+        return query
+
+    @classmethod
+    def _scored_ilike_query(
+        cls,
+        terms: List[str],
+        filters: Optional[ProductSearchFilters] = None,
+        limit: int = 10,
+    ):
+        """ILIKE por término en nombre, marca, categoría y SKU, con score por campo."""
+        conditions = []
+        term_hits = []
+        field_scores = []
+        for term in terms:
+            pattern = f"%{term.lower()}%"
+            matches = [column.ilike(pattern) for column, _ in TERM_FIELD_WEIGHTS]
+            conditions.extend(matches)
+            term_hits.append(case((or_(*matches), 1), else_=0))
+            field_scores.extend(
+                case((match, weight), else_=0)
+                for match, (_, weight) in zip(matches, TERM_FIELD_WEIGHTS)
+            )
+
+        query = cls._apply_filters(
+            select(ProductStock).where(ProductStock.is_active == True), filters
+        )
+        if not terms:
+            # Solo filtros (ej. "Nike de menos de 100 dólares")
+            return query.order_by(ProductStock.product_name).limit(limit)
+        return (
+            query.where(or_(*conditions))
+            .order_by(
+                sum(term_hits).desc(),
+                sum(field_scores).desc(),
+                ProductStock.product_name,
+            )
+            .limit(limit)
+        )
+
+    @classmethod
+    def _scored_fulltext_query(
+        cls,
+        terms: List[str],
+        filters: Optional[ProductSearchFilters] = None,
+        limit: int = 10,
+    ):
+        """
+        Full-text con un tsquery por término para contar coincidencias y
+        ts_rank (pesos A/B/C del search_vector) para desempatar.
+        None si ningún término deja palabras indexables.
+        """
+        term_queries = []
+        for term in terms:
+            words = tokenize(term)
+            if words:
+                term_queries.append(" & ".join(f"{word}:*" for word in words))
+        if not term_queries:
+            return None
+
+        def ts_query(expression: str):
+            return func.to_tsquery(literal(FTS_CONFIG, REGCONFIG), expression)
+
+        any_term = ts_query(" | ".join(f"({expression})" for expression in term_queries))
+        term_hits = [
+            case((SEARCH_VECTOR.op("@@")(ts_query(expression)), 1), else_=0)
+            for expression in term_queries
+        ]
+
+        query = select(ProductStock).where(
+            SEARCH_VECTOR.op("@@")(any_term),
+            ProductStock.is_active == True
+        )
+        return (
+            cls._apply_filters(query, filters)
+            .order_by(
+                sum(term_hits).desc(),
+                func.ts_rank(SEARCH_VECTOR, any_term).desc(),
+                ProductStock.product_name,
+            )
+            .limit(limit)
+        )
+
+    @staticmethod
+    def _ilike_query(search_words: List[str]):
+        """OR de ILIKE por palabra en product_name y product_sku (sin ranking)."""
+        conditions = []
+        for word in search_words:
+            conditions.append(ProductStock.product_name.ilike(f"%{word}%"))
+            conditions.append(ProductStock.product_sku.ilike(f"%{word}%"))
+
+        return select(ProductStock).where(
+            or_(*conditions),
+            ProductStock.is_active == True
+        ).limit(10)
+
+    @staticmethod
+    def _fulltext_query(name: str):
+        """
+        Búsqueda full-text ordenada por ts_rank (None si no quedan términos).
+
+        Cada palabra se busca por prefijo ("air" → "air:*") y se combinan con OR,
+        igual que la búsqueda ILIKE: más términos coincidentes = mejor ranking.
+        """
+        words = tokenize(name)
+        if not words:
+            return None
+
+        ts_query = func.to_tsquery(
+            literal(FTS_CONFIG, REGCONFIG),
+            " | ".join(f"{word}:*" for word in words),
+        )
+        rank = func.ts_rank(SEARCH_VECTOR, ts_query)
+        return (
+            select(ProductStock)
+            .where(
+                SEARCH_VECTOR.op("@@")(ts_query),
+                ProductStock.is_active == True
+            )
+            .order_by(rank.desc(), ProductStock.product_name)
+            .limit(10)
+        )
+
+    async def search_fuzzy(
+        self,
+        name: str,
+        limit: int = 10,
+        filters: Optional[ProductSearchFilters] = None,
+    ) -> list[ProductStock]:
+        """
+        Búsqueda tolerante a errores de tipeo ("addidas", "nyke pegasus") con
+        pg_trgm sobre nombre y marca, ordenada por similitud.
+
+        Pensada como respaldo cuando search_by_name no encuentra nada. Si la
+        extensión no está instalada se deshabilita y retorna [].
+
+        Returns:
+            Lista de productos encontrados (vacía en caso de error)
+        """
+        if not self.fuzzy_search:
+            return []
+
+        query = self._fuzzy_query(name, limit, filters)
+        if query is None:
+            return []
+
+        try:
+            async with self.session_factory() as session:
+                try:
+                    # El umbral del operador <% es un parámetro de sesión: se fija
+                    # solo para esta transacción
+                    await session.execute(
+                        select(func.set_config(
+                            TRGM_THRESHOLD_SETTING, str(self.fuzzy_threshold), True
+                        ))
+                    )
+                    result = await asyncio.wait_for(
+                        session.execute(query),
+                        timeout=5.0
+                    )
+                except ProgrammingError as e:
+                    # Falta la extensión pg_trgm (operador <% o word_similarity)
+                    self.logger.warning(
+                        f"🗃️ Búsqueda difusa no disponible, deshabilitada "
+                        f"(ejecutar migrate_db_add_trigram_search.py): {e.orig}"
+                    )
+                    self.fuzzy_search = False
+                    await session.rollback()
+                    return []
+
+                products = list(result.scalars().all())
+                self.logger.info(
+                    f"🔤 ProductService: Búsqueda difusa '{name}' encontró {len(products)} productos"
+                )
+                return products
+
+        except asyncio.TimeoutError:
+            self.logger.error(f"⏱️ Timeout en búsqueda difusa (>5s): '{name}'")
+            return []
+
+        except SQLAlchemyError as e:
+            self.logger.error(
+                f"❌ Error de BD en búsqueda difusa '{name}': {str(e)}",
+                exc_info=True
+            )
+            return []
+
+        except Exception as e:
+            self.logger.error(
+                f"💥 Error inesperado en búsqueda difusa '{name}': {str(e)}",
+                exc_info=True
+            )
+            return []
+
+    @classmethod
+    def _fuzzy_query(
+        cls,
+        name: str,
+        limit: int = 10,
+        filters: Optional[ProductSearchFilters] = None,
+    ):
+        """
+        Productos cuyo nombre o marca contiene una extensión parecida a la query
+        (operador <%, usa los índices GIN gin_trgm_ops), ordenados por
+        word_similarity (None si la query queda vacía).
+        """
+        text = " ".join(name.lower().split())
+        if not text:
+            return None
+
+        term = literal(text)
+        # GREATEST ignora NULL: productos sin marca puntúan solo por nombre
+        similarity = func.greatest(
+            func.word_similarity(term, ProductStock.product_name),
+            func.word_similarity(term, ProductStock.brand),
+        )
+        query = select(ProductStock).where(
+            or_(
+                term.op("<%")(ProductStock.product_name),
+                term.op("<%")(ProductStock.brand),
+            ),
+            ProductStock.is_active == True
+        )
+        return (
+            cls._apply_filters(query, filters)
+            .order_by(similarity.desc(), ProductStock.product_name)
+            .limit(limit)
+        )
+
+    async def get_search_vocabulary(self) -> Tuple[List[str], List[str]]:
+        """
+        Marcas y categorías distintas del catálogo activo (vocabulario de
+        QueryParser).
+
+        Con el catálogo en memoria cargado sale de ahí, sin consultar la DB.
+        Si la DB falla o tarda más de 5s la excepción se propaga para que el
+        llamador reintente.
+        """
+        if self.catalog is not None and self.catalog.ready:
+            return self.catalog.vocabulary()
+
+        async with self.session_factory() as session:
+            vocabulary = []
+            for column in (ProductStock.brand, ProductStock.category):
+                result = await asyncio.wait_for(
+                    session.execute(
+                        select(column)
+                        .where(column.isnot(None), ProductStock.is_active == True)
+                        .distinct()
+                    ),
+                    timeout=5.0
+                )
+                vocabulary.append(sorted(result.scalars().all()))
+
+        return vocabulary[0], vocabulary[1]
+
     async def get_products_by_barcodes(
         self, 
         barcodes: List[str]
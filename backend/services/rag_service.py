@@ -8,28 +8,69 @@ Arquitectura:
 3. Almacena en ChromaDB (base de datos vectorial)
 4. Búsqueda por similitud semántica cuando el usuario pregunta
 5. Retorna documentos relevantes + metadata
+
+La búsqueda no bloquea el event loop: el embedding de la query es async y la
+consulta a Chroma (síncrona) corre en un pool de threads acotado.
+
+Los cambios en los CSVs se aplican en caliente con reload_index(): el índice
+nuevo se arma y valida aparte y recién entonces reemplaza al vigente.
 """
+import asyncio
 import os
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Any, List, Dict, Optional, Tuple
 import pandas as pd
 from loguru import logger
 
 from langchain_chroma import Chroma
 from langchain_google_vertexai import VertexAIEmbeddings
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
 from backend.config import get_business_settings
+from backend.nlp.bm25 import BM25Index, reciprocal_rank_fusion
+from backend.nlp.faq_matcher import FAQMatch, FAQMatcher
+from backend.services.embedding_cache import EmbeddingCache
+from backend.services.kb_indexer import IndexPlan, KnowledgeBaseIndexer, document_id
+from backend.services.metrics import LatencyTracker
+from backend.services.vector_index import VectorIndex
+
+COLLECTION_NAME = "sneakerzone_knowledge"
+
+
+def create_vertex_embeddings() -> VertexAIEmbeddings:
+    """Embeddings de Vertex AI (usa GOOGLE_APPLICATION_CREDENTIALS de env)."""
+    settings = get_business_settings()
+    return VertexAIEmbeddings(
+        model_name="text-embedding-004",
+        project=settings.google_cloud_project,
+        location=settings.google_location,
+    )
 
 
 @dataclass
 class RAGResult:
-    """Resultado de búsqueda semántica."""
+    """
+    Resultado de búsqueda semántica.
+
+    relevance_score está siempre en [0, 1] (1 = máxima relevancia); score_method
+    indica qué ruta lo calculó:
+    - "vector": 1 / (1 + distancia L2) del embedding
+    - "lexical": cobertura BM25 de la query (atajo léxico, sin embedding)
+    - "hybrid": RRF de BM25 + vectores dividido por su máximo (1.0 = primero
+      en ambos rankings)
+    """
     content: str
     category: str
     relevance_score: float
     source: str  # "chunks" o "faqs"
+    response: Optional[str] = None  # Respuesta canónica (solo FAQs)
+    score_method: str = "vector"
 
 
 class RAGService:
@@ -38,57 +79,481 @@ class RAGService:
     
     Features:
     - Embeddings con Vertex AI (text-embedding-004)
-    - Persistencia en ChromaDB
-    - Búsqueda semántica (no regex)
+    - Persistencia en ChromaDB (o índice NumPy en memoria con vector_backend="numpy")
+    - Búsqueda semántica (no regex), opcionalmente híbrida con BM25
     - Metadata enriquecida
     - Logging detallado
     """
     
-    def __init__(self):
-        """Inicializa el servicio RAG."""
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        persist_directory: Optional[Path] = None,
+        max_concurrency: int = 4,
+        search_workers: int = 4,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        vector_backend: str = "chroma",
+        embedding_model: str = "text-embedding-004",
+        index_batch_size: int = 64,
+        drain_timeout: float = 30.0,
+        search_mode: str = "vector",
+        lexical_threshold: float = 0.8,
+        lexical_margin: float = 1.5,
+        hybrid_candidates: int = 10,
+        rrf_k: int = 60,
+        faq_matcher_enabled: bool = True,
+        faq_match_threshold: float = 0.75,
+        background_init: bool = False,
+    ):
+        """
+        Inicializa el servicio RAG.
+
+        Args:
+            embeddings: Modelo de embeddings (default: Vertex AI)
+            persist_directory: Directorio de ChromaDB (cada modelo de embeddings
+                necesita el suyo: los vectores no son intercambiables)
+            max_concurrency: Búsquedas simultáneas (embedding + consulta)
+            search_workers: Threads para las consultas síncronas a Chroma
+            embedding_cache: Caché de embeddings de queries (opcional)
+            vector_backend: "chroma" o "numpy" (matriz en memoria, para corpus chicos)
+            embedding_model: Id del modelo de embeddings (si cambia, se re-embebe todo)
+            index_batch_size: Documentos por llamada de embeddings al indexar
+            drain_timeout: Espera máxima (s) a las búsquedas sobre un índice
+                reemplazado antes de descartarlo
+            search_mode: "vector" o "hybrid" (BM25 + vectores con RRF)
+            lexical_threshold: Cobertura BM25 mínima para responder sin embedding
+            lexical_margin: Ventaja mínima (cociente) del mejor score BM25 sobre el segundo
+            hybrid_candidates: Candidatos por ranking antes de fusionar
+            rrf_k: Constante de la fusión por rango recíproco
+            faq_matcher_enabled: Compilar los patterns de faqs.csv para match_faq()
+            faq_match_threshold: Confianza mínima para responder una FAQ sin búsqueda
+            background_init: No construir el índice en el constructor; el llamador
+                invoca start_background_init() (ver `ready`)
+        """
         logger.info(" Inicializando RAG Service...")
         
-        settings = get_business_settings()
-        
-        # 1. Configurar embeddings de Vertex AI (usa GOOGLE_APPLICATION_CREDENTIALS de env)
-        self.embeddings = VertexAIEmbeddings(
-            model_name="text-embedding-004",
-            project=settings.google_cloud_project,
-            location=settings.google_location,
-        )
+        # 1. Configurar embeddings (Vertex AI salvo que se inyecte otro modelo)
+        self.embeddings = embeddings or create_vertex_embeddings()
+        self.embedding_cache = embedding_cache
+        self.embedding_model = embedding_model
+        self.index_batch_size = index_batch_size
         
         # 2. Rutas a los datos
         self.chunks_path = Path("backend/data/app/chunks.csv")
         self.faqs_path = Path("backend/data/app/faqs.csv")
         
         # 3. Directorio de persistencia para ChromaDB
-        self.persist_directory = Path("backend/data/chromadb")
+        self.persist_directory = persist_directory or Path("backend/data/chromadb")
         self.persist_directory.mkdir(parents=True, exist_ok=True)
         
-        # 4. Inicializar ChromaDB
+        # 4. Concurrencia acotada y métricas por fase
+        self._search_semaphore = asyncio.Semaphore(max_concurrency)
+        self._search_executor = ThreadPoolExecutor(
+            max_workers=search_workers, thread_name_prefix="rag-search"
+        )
+        self.queue_latency = LatencyTracker()
+        self.embed_latency = LatencyTracker()
+        self.search_latency = LatencyTracker()
+        
+        # 5. Índice vigente y recargas (ChromaDB o NumPy)
+        self.vector_backend = vector_backend
         self.vectorstore = None
+        self.vector_index: Optional[VectorIndex] = None
+        self.drain_timeout = drain_timeout
+        self._generation = 0
+        self._in_flight: Counter = Counter()
+        self._reload_lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        
+        # 6. Búsqueda híbrida (índice BM25 ligado a la generación vigente)
+        self.search_mode = search_mode
+        self.lexical_threshold = lexical_threshold
+        self.lexical_margin = lexical_margin
+        self.hybrid_candidates = hybrid_candidates
+        self.rrf_k = rrf_k
+        self._lexical: Optional[Tuple[BM25Index, List[Document]]] = None
+        self.lexical_fast_path = 0
+        self.hybrid_searches = 0
+        
+        # 7. Lookup directo de FAQs (se recompila con cada generación del índice)
+        self.faq_matcher_enabled = faq_matcher_enabled
+        self.faq_match_threshold = faq_match_threshold
+        self.faq_matcher: Optional[FAQMatcher] = None
+        self.faq_hits = 0
+        self.faq_misses = 0
+        
+        # 8. Inicializar el índice (ahora o en segundo plano)
+        self.ready = False
+        self.init_error: Optional[str] = None
+        self.startup_ms: Optional[float] = None
+        self._init_task: Optional[asyncio.Task] = None
+        if background_init:
+            # El lookup de FAQs no necesita el índice: disponible desde el arranque
+            self._refresh_faq_matcher()
+            logger.info(" RAG Service creado, índice pendiente de inicializar")
+        else:
+            self._initialize()
+            logger.info(" RAG Service iniciado correctamente")
+    
+    def _initialize(self) -> None:
+        """Construye el índice, mide el tiempo y marca el servicio como listo."""
+        started = time.perf_counter()
         self._initialize_vectorstore()
+        self.startup_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.ready = True
+        logger.info(f" Índice RAG listo en {self.startup_ms} ms ({self._indexed_count()} documentos)")
+    
+    def start_background_init(
+        self, retry_delay: float = 5.0, max_retry_delay: float = 60.0
+    ) -> asyncio.Task:
+        """
+        Inicializa el índice en un thread sin bloquear el arranque.
         
-        logger.info(" RAG Service iniciado correctamente")
+        Si falla (p. ej. Vertex AI no responde) se reintenta con backoff
+        exponencial; mientras tanto `ready` es False y search() no devuelve nada.
+        """
+        self._init_task = asyncio.create_task(
+            self._background_init(retry_delay, max_retry_delay)
+        )
+        return self._init_task
+    
+    async def _background_init(self, retry_delay: float, max_retry_delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await loop.run_in_executor(None, self._initialize)
+                self.init_error = None
+                logger.info(
+                    f" RAG disponible tras {(time.perf_counter() - started) * 1000:.0f} ms "
+                    f"({attempt} intento/s)"
+                )
+                return
+            except Exception as e:
+                self.init_error = str(e)
+                logger.error(
+                    f" Falló la inicialización del RAG (intento {attempt}): {e}. "
+                    f"Reintento en {retry_delay:.0f}s"
+                )
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, max_retry_delay)
+    
+    async def stop(self) -> None:
+        """Cancela la inicialización en segundo plano y la vigilancia de los CSVs."""
+        for task in (self._init_task, self._watch_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._init_task = None
+        self._watch_task = None
+    
+    def readiness(self) -> Dict[str, Any]:
+        """Estado para /health."""
+        return {
+            "ready": self.ready,
+            "startup_ms": self.startup_ms,
+            "error": self.init_error,
+        }
     
     def _initialize_vectorstore(self):
-        """Carga o crea el vector store de ChromaDB."""
+        """Carga el índice (ChromaDB o NumPy) y lo sincroniza con los CSVs."""
+        if self.vector_backend == "numpy":
+            self._initialize_vector_index()
+        else:
+            # Chroma crea la colección vacía si no existe
+            self.vectorstore = self._open_collection(self._active_collection())
+            logger.info(f" ChromaDB cargado: {self.vectorstore._collection.count()} documentos")
+        
+        self.sync_index()
+        if self._lexical is None:
+            self._refresh_lexical_index()
+        if self.faq_matcher is None:
+            self._refresh_faq_matcher()
+    
+    def _initialize_vector_index(self):
+        """Carga o crea el índice NumPy (reutiliza los vectores de ChromaDB si existen)."""
+        self.vector_index = VectorIndex.load(self._index_directory)
+        if self.vector_index is not None:
+            return
         
-        # Intentar cargar vectorstore existente
         if (self.persist_directory / "chroma.sqlite3").exists():
-            logger.info(" Cargando ChromaDB existente...")
-            self.vectorstore = Chroma(
-                collection_name="sneakerzone_knowledge",
-                embedding_function=self.embeddings,
-                persist_directory=str(self.persist_directory)
+            # Exportar desde Chroma: evita volver a embeber toda la base
+            logger.info(" Exportando vectores de ChromaDB al índice NumPy...")
+            collection = self._open_collection(self._active_collection())._collection
+            data = collection.get(include=["embeddings", "documents", "metadatas"])
+            documents = [
+                Document(page_content=content, metadata=metadata or {})
+                for content, metadata in zip(data["documents"], data["metadatas"])
+            ]
+            self.vector_index = VectorIndex.from_vectors(data["embeddings"], documents, data["ids"])
+            self.vector_index.save(self._index_directory)
+        else:
+            self.vector_index = VectorIndex.empty()
+    
+    @property
+    def _index_directory(self) -> Path:
+        return self.persist_directory / "numpy_index"
+    
+    def _open_collection(self, name: str) -> Chroma:
+        return Chroma(
+            collection_name=name,
+            embedding_function=self.embeddings,
+            persist_directory=str(self.persist_directory)
+        )
+    
+    def _active_collection(self) -> str:
+        return self._indexer("chroma").active_collection or COLLECTION_NAME
+    
+    def _indexer(self, backend: Optional[str] = None) -> KnowledgeBaseIndexer:
+        return KnowledgeBaseIndexer(
+            manifest_path=self.persist_directory / f"manifest_{backend or self.vector_backend}.json",
+            sources=[self.chunks_path, self.faqs_path],
+            embedding_model=self.embedding_model,
+        )
+    
+    def _indexed_documents(self) -> List[Tuple[str, Document]]:
+        """(id, documento) de lo que hoy está en el índice."""
+        if self.vector_index is not None:
+            return list(zip(self.vector_index.ids, self.vector_index.documents))
+        data = self.vectorstore._collection.get(include=["documents", "metadatas"])
+        return [
+            (doc_id, Document(page_content=content, metadata=metadata or {}))
+            for doc_id, content, metadata in zip(data["ids"], data["documents"], data["metadatas"])
+        ]
+    
+    def _indexed_count(self) -> int:
+        if self.vector_index is not None:
+            return len(self.vector_index)
+        return self.vectorstore._collection.count()
+    
+    # Recarga del índice (RCU)
+    #
+    # La generación nueva se arma aparte (copia del índice NumPy o colección
+    # nueva de Chroma), se valida y recién ahí se cambia la referencia que usan
+    # las búsquedas. La anterior se descarta cuando terminan sus búsquedas.
+    
+    def sync_index(self, full: bool = False) -> Optional[IndexPlan]:
+        """
+        Sincroniza el índice con los CSVs embebiendo solo lo nuevo o editado.
+        
+        Versión síncrona para el arranque (sin búsquedas en curso); en caliente
+        usar reload_index().
+        
+        Args:
+            full: Re-embeber todo aunque el contenido no haya cambiado
+        
+        Returns:
+            El plan aplicado, o None si el manifest indica que no hubo cambios
+        """
+        result = self._build_generation(full)
+        if result is None:
+            return None
+        plan, generation = result
+        retired = self._swap_generation(generation)
+        if retired is not None:
+            self._retire_generation(retired[1])
+        return plan
+    
+    async def reload_index(self, full: bool = False) -> Optional[IndexPlan]:
+        """
+        Recarga en caliente: las búsquedas siguen usando el índice vigente
+        mientras se arma y valida el nuevo.
+        
+        Raises:
+            ValueError: Si no hay documentos o el índice nuevo no pasa la validación
+                (el índice vigente queda intacto)
+        """
+        if not self.ready:
+            logger.warning(" Recarga ignorada: el índice RAG aún se está inicializando")
+            return None
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self._build_generation, full)
+            if result is None:
+                return None
+            plan, generation = result
+            retired = self._swap_generation(generation)
+            if retired is not None:
+                await self._drain(retired[0])
+                await loop.run_in_executor(None, self._retire_generation, retired[1])
+            logger.info(
+                f" Índice RAG recargado (generación {self._generation}): "
+                f"+{len(plan.to_add)} / -{len(plan.to_delete)}"
             )
-            logger.info(f" ChromaDB cargado: {self.vectorstore._collection.count()} documentos")
+            return plan
+    
+    def start_watching(self, interval: float) -> asyncio.Task:
+        """Recarga el índice cuando cambian los CSVs (polling cada `interval` s)."""
+        self._watch_task = asyncio.create_task(self._watch_sources(interval))
+        logger.info(f" Vigilando cambios en la base de conocimiento cada {interval}s")
+        return self._watch_task
+    
+    async def _watch_sources(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Sin cambios, reload_index solo compara hashes con el manifest
+                await self.reload_index()
+            except Exception as e:
+                logger.error(f" Error recargando la base de conocimiento: {e}")
+    
+    def _build_generation(self, full: bool) -> Optional[Tuple[IndexPlan, Any]]:
+        """Arma y valida la próxima generación sin tocar la vigente."""
+        indexer = self._indexer()
+        if not full and indexer.is_up_to_date(self._indexed_count()):
+            logger.info(" Base de conocimiento sin cambios, se omite el reindexado")
+            return None
+        
+        documents = self._load_documents()
+        if not documents:
+            logger.error(" No se encontraron documentos para el índice RAG")
+            raise ValueError("No hay documentos para el RAG")
+        
+        plan = indexer.plan(documents, self._indexed_documents(), full=full)
+        if plan.is_noop:
+            return plan, None
+        
+        logger.info(
+            f" Reindexando RAG: +{len(plan.to_add)} / -{len(plan.to_delete)} "
+            f"({plan.unchanged} sin cambios)"
+        )
+        if self.vector_index is not None:
+            generation = self._build_vector_index(plan)
+            self._validate_generation(generation, plan)
+            generation.save(self._index_directory)
+            return plan, generation
+        
+        generation = self._build_collection(plan)
+        try:
+            self._validate_generation(generation, plan)
+        except ValueError:
+            generation.delete_collection()
+            raise
+        return plan, generation
+    
+    def _embed_batches(self, documents: List[Document]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for i in range(0, len(documents), self.index_batch_size):
+            batch = documents[i:i + self.index_batch_size]
+            vectors.extend(self.embeddings.embed_documents([doc.page_content for doc in batch]))
+        return vectors
+    
+    def _build_vector_index(self, plan: IndexPlan) -> VectorIndex:
+        """Copia del índice NumPy con los cambios (copy-on-write)."""
+        documents = [doc for _, doc in plan.to_add]
+        return self.vector_index.with_changes(
+            remove_ids=plan.to_delete,
+            add_ids=[doc_id for doc_id, _ in plan.to_add],
+            add_documents=documents,
+            add_vectors=self._embed_batches(documents),
+        )
+    
+    def _build_collection(self, plan: IndexPlan) -> Chroma:
+        """Colección nueva de Chroma: copia los vectores vigentes y embebe lo nuevo."""
+        store = self._open_collection(f"{COLLECTION_NAME}_{uuid.uuid4().hex[:8]}")
+        try:
+            current = self.vectorstore._collection
+            for i in range(0, len(plan.keep), self.index_batch_size):
+                data = current.get(
+                    ids=plan.keep[i:i + self.index_batch_size],
+                    include=["embeddings", "documents", "metadatas"],
+                )
+                store._collection.add(
+                    ids=data["ids"],
+                    embeddings=data["embeddings"],
+                    documents=data["documents"],
+                    metadatas=data["metadatas"],
+                )
+            
+            documents = [doc for _, doc in plan.to_add]
+            if documents:
+                store._collection.add(
+                    ids=[doc_id for doc_id, _ in plan.to_add],
+                    embeddings=self._embed_batches(documents),
+                    documents=[doc.page_content for doc in documents],
+                    metadatas=[doc.metadata for doc in documents],
+                )
+        except Exception:
+            store.delete_collection()
+            raise
+        return store
+    
+    def _validate_generation(self, generation: Any, plan: IndexPlan) -> None:
+        """Cantidad esperada de documentos y una búsqueda de prueba con un vector propio."""
+        expected = plan.unchanged + len(plan.to_add)
+        if isinstance(generation, VectorIndex):
+            count = len(generation)
+            probe = generation.search(generation.vectors[0], k=1) if count else []
         else:
-            logger.info(" Creando nuevo ChromaDB desde CSVs...")
-            self._build_vectorstore_from_csvs()
+            count = generation._collection.count()
+            sample = generation._collection.get(limit=1, include=["embeddings"])
+            probe = (
+                generation.similarity_search_by_vector(list(sample["embeddings"][0]), k=1)
+                if count else []
+            )
+        
+        if count != expected:
+            raise ValueError(f"Índice RAG inválido: {count} documentos, se esperaban {expected}")
+        if not probe:
+            raise ValueError("Índice RAG inválido: la búsqueda de prueba no devolvió resultados")
     
-    def _build_vectorstore_from_csvs(self):
-        """Construye ChromaDB desde cero leyendo los CSVs."""
+    def _swap_generation(self, generation: Any) -> Optional[Tuple[int, Any]]:
+        """Publica la generación nueva; devuelve (número, índice) de la retirada."""
+        retired = None
+        if generation is not None:
+            retired = (
+                self._generation,
+                self.vector_index if self.vector_index is not None else self.vectorstore,
+            )
+            if isinstance(generation, VectorIndex):
+                self.vector_index = generation
+            else:
+                self.vectorstore = generation
+            self._generation += 1
+            self._refresh_lexical_index()
+            self._refresh_faq_matcher()
+        
+        collection = None if self.vectorstore is None else self.vectorstore._collection.name
+        self._indexer().write_manifest(self._indexed_count(), collection=collection)
+        return retired
+    
+    async def _drain(self, generation: int) -> None:
+        """Espera a que terminen las búsquedas sobre una generación retirada."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        while self._in_flight[generation] > 0 and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        if self._in_flight[generation] > 0:
+            logger.warning(
+                f" {self._in_flight[generation]} búsquedas siguen sobre la generación "
+                f"{generation} tras {self.drain_timeout}s; se descarta igual"
+            )
+        self._in_flight.pop(generation, None)
+    
+    def _refresh_lexical_index(self) -> None:
+        """BM25 sobre los documentos del índice vigente (solo en modo híbrido)."""
+        if self.search_mode != "hybrid":
+            return
+        documents = [doc for _, doc in self._indexed_documents()]
+        self._lexical = (BM25Index([doc.page_content for doc in documents]), documents)
+    
+    def _refresh_faq_matcher(self) -> None:
+        if self.faq_matcher_enabled:
+            self.faq_matcher = FAQMatcher.from_csv(self.faqs_path)
+    
+    def _retire_generation(self, index: Any) -> None:
+        # El índice NumPy viejo lo libera el GC; la colección vieja se borra
+        if isinstance(index, Chroma):
+            index.delete_collection()
+    
+    def _load_documents(self) -> List[Document]:
+        """Lee chunks.csv y faqs.csv como Documents."""
         
         documents = []
         
@@ -141,21 +606,7 @@ class RAGService:
         else:
             logger.warning(f" No se encontró {self.faqs_path}")
         
-        # 3. Crear ChromaDB con todos los documentos
-        if documents:
-            logger.info(f" Generando embeddings para {len(documents)} documentos...")
-            
-            self.vectorstore = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                collection_name="sneakerzone_knowledge",
-                persist_directory=str(self.persist_directory)
-            )
-            
-            logger.info(f" ChromaDB creado con {len(documents)} documentos")
-        else:
-            logger.error(" No se encontraron documentos para crear ChromaDB")
-            raise ValueError("No hay documentos para el RAG")
+        return documents
     
     async def search(self, query: str, k: int = 3) -> List[RAGResult]:
         """
@@ -170,38 +621,158 @@ class RAGService:
         """
         logger.info(f" RAG Search: '{query}' (top-{k})")
         
-        if not self.vectorstore:
-            logger.error(" ChromaDB no inicializado")
+        if not self.ready:
+            logger.warning(" Índice RAG aún inicializando, búsqueda sin resultados")
             return []
         
-        # Búsqueda semántica con scores
-        results_with_scores = self.vectorstore.similarity_search_with_score(
-            query,
-            k=k
-        )
+        if self.search_mode == "hybrid" and self._lexical is not None:
+            results_with_relevance, method = await self._hybrid_search(query, k)
+        else:
+            # Búsqueda semántica con scores (sin bloquear el event loop)
+            results_with_relevance = [
+                (doc, self._relevance(score))
+                for doc, score in await self._similarity_search(query, k)
+            ]
+            method = "vector"
         
         # Convertir a RAGResult
         rag_results = []
-        for doc, score in results_with_scores:
-            # ChromaDB usa distancia L2, menor score = más similar
-            # Convertimos a relevancia (1 - normalizado)
-            relevance = 1.0 / (1.0 + score)  # Score alto = relevante
-            
+        for doc, relevance in results_with_relevance:
             result = RAGResult(
                 content=doc.page_content,
                 category=doc.metadata.get("category", "unknown"),
                 relevance_score=round(relevance, 3),
-                source=doc.metadata.get("source", "unknown")
+                source=doc.metadata.get("source", "unknown"),
+                response=doc.metadata.get("response"),
+                score_method=method,
             )
             rag_results.append(result)
             
             logger.info(
                 f" {result.source}/{result.category} "
-                f"(score: {result.relevance_score})"
+                f"(score {result.score_method}: {result.relevance_score})"
             )
         
         return rag_results
     
+    def match_faq(self, query: str) -> Optional[FAQMatch]:
+        """
+        Respuesta directa desde los patterns de faqs.csv (sin embeddings ni red).
+        
+        Mientras el índice no está listo no hay búsqueda a la cual caer, así que
+        se acepta cualquier coincidencia (incluso por debajo del umbral).
+        
+        Returns:
+            FAQMatch si la confianza supera el umbral; None para caer a search()
+        """
+        if self.faq_matcher is None:
+            return None
+        match = self.faq_matcher.match(query)
+        threshold = self.faq_match_threshold if self.ready else 0.0
+        if match is None or match.confidence < threshold:
+            self.faq_misses += 1
+            return None
+        self.faq_hits += 1
+        return match
+    
+    @staticmethod
+    def _relevance(distance: float) -> float:
+        # ChromaDB usa distancia L2, menor score = más similar
+        return 1.0 / (1.0 + distance)  # Score alto = relevante
+    
+    async def _hybrid_search(
+        self, query: str, k: int
+    ) -> Tuple[List[Tuple[Document, float]], str]:
+        """
+        BM25 + vectores fusionados por rango recíproco.
+        
+        Si BM25 es concluyente (cubre casi todo el peso de la query y le saca
+        ventaja al segundo) se responde sin embeber la query ("lexical", score
+        = cobertura BM25). Si no, el score es el RRF normalizado ("hybrid").
+        """
+        bm25, documents = self._lexical
+        candidates = max(k, self.hybrid_candidates)
+        lexical_hits = bm25.search(query, k=candidates)
+        
+        if lexical_hits:
+            top_score = lexical_hits[0][1]
+            runner_up = lexical_hits[1][1] if len(lexical_hits) > 1 else 0.0
+            confidence = bm25.coverage(query, top_score)
+            if confidence >= self.lexical_threshold and top_score >= self.lexical_margin * runner_up:
+                self.lexical_fast_path += 1
+                logger.info(f" RAG léxico (BM25, confianza {confidence:.2f}): sin embedding")
+                return [
+                    (documents[position], bm25.coverage(query, score))
+                    for position, score in lexical_hits[:k]
+                ], "lexical"
+        
+        self.hybrid_searches += 1
+        vector_hits = await self._similarity_search(query, candidates)
+        
+        # Clave común a ambos rankings: hash de contenido del documento
+        by_key: Dict[str, Document] = {}
+        vector_ranking = []
+        for doc, _ in vector_hits:
+            key = document_id(doc)
+            by_key[key] = doc
+            vector_ranking.append(key)
+        lexical_ranking = []
+        for position, _ in lexical_hits:
+            doc = documents[position]
+            key = document_id(doc)
+            by_key.setdefault(key, doc)
+            lexical_ranking.append(key)
+        
+        rankings = [vector_ranking, lexical_ranking]
+        fused = reciprocal_rank_fusion(rankings, k=self.rrf_k)
+        # Máximo posible: primero en todos los rankings
+        best = len(rankings) / (self.rrf_k + 1)
+        return [(by_key[key], score / best) for key, score in fused[:k]], "hybrid"
+    
+    async def embed_query(self, query: str) -> List[float]:
+        """Embedding de una query (pasando por la caché si está configurada)."""
+        if self.embedding_cache is not None:
+            cached = await self.embedding_cache.get(query)
+            if cached is not None:
+                return cached.tolist()
+
+        vector = await self.embeddings.aembed_query(query)
+        if self.embedding_cache is not None:
+            await self.embedding_cache.put(query, vector)
+        return vector
+    
+    async def _similarity_search(self, query: str, k: int):
+        """Embedding async + consulta (índice NumPy inline, Chroma en el pool de threads)."""
+        queued = time.perf_counter()
+        async with self._search_semaphore:
+            started = time.perf_counter()
+            self.queue_latency.record((started - queued) * 1000)
+
+            query_embedding = await self.embed_query(query)
+            embedded = time.perf_counter()
+            self.embed_latency.record((embedded - started) * 1000)
+
+            # Referencias tomadas una vez: una recarga en curso no afecta esta búsqueda
+            generation = self._generation
+            vector_index, vectorstore = self.vector_index, self.vectorstore
+            self._in_flight[generation] += 1
+            try:
+                if vector_index is not None:
+                    # Sub-milisegundo: no vale la pena el salto a otro thread
+                    results = vector_index.search(query_embedding, k=k)
+                else:
+                    loop = asyncio.get_running_loop()
+                    results = await loop.run_in_executor(
+                        self._search_executor,
+                        lambda: vectorstore.similarity_search_by_vector_with_relevance_scores(
+                            query_embedding, k=k
+                        ),
+                    )
+            finally:
+                self._in_flight[generation] -= 1
+            self.search_latency.record((time.perf_counter() - embedded) * 1000)
+        return results
+    
     async def get_context_for_query(self, query: str, max_results: int = 3) -> str:
         """
         Obtiene contexto relevante formateado para el LLM.
@@ -229,31 +800,48 @@ class RAGService:
         
         return "\n".join(context_parts)
     
-    def rebuild_index(self):
-        """Reconstruye el índice desde cero (útil si los CSVs cambian)."""
-        logger.info(" Reconstruyendo índice RAG...")
-        
-        # Eliminar ChromaDB existente
-        import shutil
-        if self.persist_directory.exists():
-            shutil.rmtree(self.persist_directory)
-            self.persist_directory.mkdir(parents=True, exist_ok=True)
+    def rebuild_index(self, full: bool = False):
+        """
+        Reindexa tras cambios en los CSVs (síncrono; en caliente usar reload_index).
         
-        # Reconstruir
-        self._build_vectorstore_from_csvs()
+        Incremental por defecto (solo se embeben las filas nuevas o editadas);
+        full=True re-embebe toda la base.
+        """
+        logger.info(" Reconstruyendo índice RAG...")
+        self.sync_index(full=full)
         logger.info(" Índice RAG reconstruido")
     
-    def get_stats(self) -> Dict[str, int]:
+    def get_stats(self) -> Dict[str, Any]:
         """Estadísticas del RAG."""
-        if not self.vectorstore:
-            return {"total_documents": 0}
-        
-        count = self.vectorstore._collection.count()
+        if self.vector_index is not None:
+            count = len(self.vector_index)
+        elif self.vectorstore:
+            count = self.vectorstore._collection.count()
+        else:
+            return {"total_documents": 0, **self.readiness()}
         
         return {
             "total_documents": count,
             "chunks_loaded": count // 2,  # Aproximado
             "faqs_loaded": count // 2,
-            "embedding_model": "text-embedding-004",
-            "vectorstore": "ChromaDB"
+            "embedding_model": self.embedding_model,
+            "vectorstore": "NumPy" if self.vector_index is not None else "ChromaDB",
+            "index_generation": self._generation,
+            **self.readiness(),
+            "search_mode": self.search_mode,
+            "lexical_fast_path": self.lexical_fast_path,
+            "hybrid_searches": self.hybrid_searches,
+            "faq_matcher": {
+                "faqs": len(self.faq_matcher) if self.faq_matcher else 0,
+                "hits": self.faq_hits,
+                "misses": self.faq_misses,
+            },
+            "latency": {
+                "queue": self.queue_latency.snapshot(),
+                "embed": self.embed_latency.snapshot(),
+                "search": self.search_latency.snapshot(),
+            },
+            "embedding_cache": (
+                self.embedding_cache.get_stats() if self.embedding_cache else None
+            ),
         }
@@ -3,17 +3,19 @@ El Cerebro del Agente (Search Service).
 Ahora orquesta múltiples agentes especializados a través del AgentOrchestrator.
 """
 from __future__ import annotations
+import json
 from dataclasses import dataclass
-from typing import Optional, Dict, TYPE_CHECKING
+from typing import AsyncIterator, Optional, Dict, TYPE_CHECKING
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from backend.domain.agent_schemas import AgentState
+from backend.domain.agent_schemas import AgentResponse, AgentState, AgentStreamEvent
 
 if TYPE_CHECKING:
     from backend.agents.orchestrator import AgentOrchestrator
     from backend.services.session_service import SessionService
     from backend.services.chat_history_service import ChatHistoryService
+    from backend.services.history_manager import ConversationHistoryManager
 
 
 @dataclass
@@ -41,6 +43,7 @@ class SearchService:
         session_service: Optional[SessionService] = None,
         chat_history_service: Optional['ChatHistoryService'] = None,
         session_factory: Optional[object] = None,
+        history_manager: Optional[ConversationHistoryManager] = None,
     ):
         self.orchestrator = orchestrator
         self.session_service = session_service
@@ -48,6 +51,8 @@ class SearchService:
         self.chat_history_service = chat_history_service
         # Async session factory (async_sessionmaker) to create DB sessions
         self.session_factory = session_factory
+        # Mantiene acotado el historial que se guarda en la sesión
+        self.history_manager = history_manager
 
         # Fallback a memoria si no hay SessionService (desarrollo/testing)
         if self.session_service is None:
@@ -78,6 +83,41 @@ class SearchService:
         """
         logger.info(f"SearchService procesando query: {query[:50]}...")
 
+        session_state = await self._load_session_state(session_id, user_id)
+
+        # Contexto previo al turno (se guarda junto a la etiqueta de intención)
+        had_search_results = bool(session_state and session_state.search_results)
+
+        # Delegar al orquestador
+        response = await self.orchestrator.process_query(query, session_state, user_id=user_id)
+
+        return await self._persist_turn(query, response, session_id, user_id, had_search_results)
+
+    async def semantic_search_stream(
+        self, query: str, session_id: Optional[str] = None, user_id: Optional[str] = None
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """
+        Igual que semantic_search pero emitiendo eventos a medida que se generan.
+
+        La sesión y el historial se persisten cuando llega el evento "done"
+        (antes de reenviarlo); si el stream se corta antes, no se guarda nada.
+        """
+        logger.info(f"SearchService procesando query (stream): {query[:50]}...")
+
+        session_state = await self._load_session_state(session_id, user_id)
+        had_search_results = bool(session_state and session_state.search_results)
+
+        async for event in self.orchestrator.stream_query(query, session_state, user_id=user_id):
+            if event.type == "done" and event.response is not None:
+                await self._persist_turn(
+                    query, event.response, session_id, user_id, had_search_results
+                )
+            yield event
+
+    async def _load_session_state(
+        self, session_id: Optional[str], user_id: Optional[str]
+    ) -> Optional[AgentState]:
+        """Obtiene el estado de sesión (Redis → reconstrucción desde PostgreSQL → memoria)."""
         # Obtener o crear estado de sesión
         session_state = None
         if session_id:
@@ -131,8 +171,20 @@ class SearchService:
                 else:
                     logger.debug(f"Nueva sesión (memoria): {session_id}")
 
-        # Delegar al orquestador
-        response = await self.orchestrator.process_query(query, session_state, user_id=user_id)
+        return session_state
+
+    async def _persist_turn(
+        self,
+        query: str,
+        response: AgentResponse,
+        session_id: Optional[str],
+        user_id: Optional[str],
+        had_search_results: bool,
+    ) -> SearchResult:
+        """Guarda la sesión, persiste el turno en chat_history y arma el SearchResult."""
+        # Compactar historial antes de guardar (payload de Redis acotado)
+        if self.history_manager:
+            await self.history_manager.compact(response.state)
 
         # Guardar estado actualizado
         if session_id:
@@ -168,7 +220,8 @@ class SearchService:
                     session_id=session_id,
                     user_id=user_id,
                     role="USER",
-                    message=query
+                    message=query,
+                    metadata_json=self._intent_label_json(response.state, had_search_results),
                 )
 
                 # Guardar respuesta del agente
@@ -191,6 +244,24 @@ class SearchService:
 
         return result
 
+    @staticmethod
+    def _intent_label_json(state: AgentState, had_search_results: bool) -> Optional[str]:
+        """
+        Etiqueta de intención del turno para el historial.
+
+        Son los datos de entrenamiento del clasificador local
+        (ver train_intent_classifier.py).
+        """
+        intent = state.intent_classification
+        if intent is None:
+            return None
+        return json.dumps({
+            "intent": intent.intent,
+            "intent_confidence": round(intent.confidence, 4),
+            "intent_source": intent.source,
+            "had_search_results": had_search_results,
+        })
+
     async def clear_session(self, session_id: str) -> bool:
         """Limpia una sesión específica."""
         if self.session_service:
@@ -0,0 +1,172 @@
+"""
+Índice vectorial en memoria con NumPy (alternativa a ChromaDB).
+
+La base de conocimiento son unas decenas de documentos: una matriz float32
+contigua (n_docs × dim) con vectores normalizados basta. El top-k sale de un
+producto matriz-vector + argpartition, sin I/O de SQLite por consulta.
+
+Persistencia: vectors.npy (cargado con mmap_mode) + documents.json.
+Los scores se devuelven como distancia L2 al cuadrado (la métrica por defecto
+de Chroma), así RAGService calcula la relevancia igual con ambos backends.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+VECTORS_FILE = "vectors.npy"
+DOCUMENTS_FILE = "documents.json"
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """Top-k por similitud coseno sobre una matriz float32 en memoria."""
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        documents: Sequence[Document],
+        ids: Optional[Sequence[str]] = None,
+    ):
+        if len(vectors) != len(documents):
+            raise ValueError(
+                f"El índice tiene {len(vectors)} vectores y {len(documents)} documentos"
+            )
+        self.vectors = vectors
+        self.documents = list(documents)
+        self.ids = list(ids) if ids is not None else [str(i) for i in range(len(documents))]
+
+    @classmethod
+    def from_vectors(
+        cls,
+        vectors: Iterable[Sequence[float]],
+        documents: Sequence[Document],
+        ids: Optional[Sequence[str]] = None,
+    ) -> "VectorIndex":
+        matrix = np.ascontiguousarray(np.asarray(list(vectors), dtype=np.float32))
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(documents), -1)
+        return cls(_normalize_rows(matrix), documents, ids)
+
+    @classmethod
+    def empty(cls) -> "VectorIndex":
+        return cls(np.zeros((0, 0), dtype=np.float32), [])
+
+    @classmethod
+    def build(
+        cls,
+        documents: Sequence[Document],
+        embeddings: Embeddings,
+        ids: Optional[Sequence[str]] = None,
+    ) -> "VectorIndex":
+        """Embebe los documentos (una sola llamada batch) y arma el índice."""
+        vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+        return cls.from_vectors(vectors, documents, ids)
+
+    def with_changes(
+        self,
+        remove_ids: Iterable[str] = (),
+        add_ids: Sequence[str] = (),
+        add_documents: Sequence[Document] = (),
+        add_vectors: Optional[Sequence[Sequence[float]]] = None,
+    ) -> "VectorIndex":
+        """Nuevo índice con filas borradas/agregadas (el actual no se modifica)."""
+        removed = set(remove_ids)
+        keep = [i for i, doc_id in enumerate(self.ids) if doc_id not in removed]
+
+        vectors = np.asarray(self.vectors[keep], dtype=np.float32)
+        if add_documents:
+            added = _normalize_rows(np.asarray(add_vectors, dtype=np.float32))
+            vectors = added if not len(keep) else np.vstack([vectors, added])
+        return VectorIndex(
+            np.ascontiguousarray(vectors, dtype=np.float32),
+            [self.documents[i] for i in keep] + list(add_documents),
+            [self.ids[i] for i in keep] + list(add_ids),
+        )
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.vectors.shape[1]) if len(self.documents) else 0
+
+    def search(
+        self, query_vector: Sequence[float], k: int = 3
+    ) -> List[Tuple[Document, float]]:
+        """Top-k documentos con su distancia L2² (menor = más similar)."""
+        if not self.documents or k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return []
+        query = query / norm
+
+        similarities = self.vectors @ query
+        k = min(k, len(similarities))
+        if k < len(similarities):
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(len(similarities))
+        top = top[np.argsort(-similarities[top])]
+
+        # Vectores unitarios: ||a - b||² = 2 - 2·cos(a, b)
+        return [
+            (self.documents[i], float(max(0.0, 2.0 - 2.0 * similarities[i])))
+            for i in top
+        ]
+
+    # Persistencia
+
+    def save(self, directory: Path) -> None:
+        """
+        Guarda el índice con escritura atómica (archivo temporal + rename).
+
+        Un índice cargado con mmap sigue leyendo el archivo anterior: sobrescribirlo
+        en el lugar corrompería los vectores que está usando.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        vectors_tmp = directory / f"{VECTORS_FILE}.tmp"
+        with vectors_tmp.open("wb") as handle:
+            np.save(handle, np.ascontiguousarray(self.vectors))
+        payload = [
+            {"id": doc_id, "page_content": doc.page_content, "metadata": doc.metadata}
+            for doc_id, doc in zip(self.ids, self.documents)
+        ]
+        documents_tmp = directory / f"{DOCUMENTS_FILE}.tmp"
+        with documents_tmp.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(vectors_tmp, directory / VECTORS_FILE)
+        os.replace(documents_tmp, directory / DOCUMENTS_FILE)
+        logger.info(f" Índice NumPy guardado en {directory} ({len(self)} documentos)")
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> Optional["VectorIndex"]:
+        """Carga el índice persistido (None si no existe)."""
+        vectors_path = directory / VECTORS_FILE
+        documents_path = directory / DOCUMENTS_FILE
+        if not (vectors_path.exists() and documents_path.exists()):
+            return None
+
+        vectors = np.load(vectors_path, mmap_mode="r" if mmap else None)
+        with documents_path.open(encoding="utf-8") as handle:
+            payload = json.load(handle)
+        documents = [
+            Document(page_content=item["page_content"], metadata=item["metadata"])
+            for item in payload
+        ]
+        ids = [item.get("id", str(i)) for i, item in enumerate(payload)]
+        logger.info(f" Índice NumPy cargado: {len(documents)} documentos")
+        return cls(vectors, documents, ids)
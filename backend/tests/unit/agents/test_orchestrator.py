@@ -0,0 +1,36 @@
+"""
+Tests unitarios para AgentOrchestrator (respuesta de emergencia).
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.agents.orchestrator import AgentOrchestrator
+from backend.domain.agent_schemas import AgentState
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestOrchestratorErrorHandling:
+    """Un error inesperado en el ruteo termina en la respuesta de emergencia."""
+
+    @pytest.fixture
+    def orchestrator(self):
+        return AgentOrchestrator(
+            retriever_agent=MagicMock(),
+            sales_agent=MagicMock(),
+            llm_provider=MagicMock(),
+            use_llm_detection=False,
+            speculative_search=False,
+        )
+
+    async def test_critical_failure_returns_emergency_response(self, orchestrator):
+        orchestrator._route_turn = AsyncMock(side_effect=RuntimeError("router caído"))
+
+        response = await orchestrator.process_query("busco nike", AgentState(user_query=""))
+
+        assert response.agent_name == "orchestrator"
+        assert response.state.user_query == "busco nike"
+        assert response.metadata == {
+            "error": "orchestrator_failure",
+            "error_message": "router caído",
+        }
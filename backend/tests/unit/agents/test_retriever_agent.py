@@ -0,0 +1,61 @@
+"""
+Tests unitarios para RetrieverAgent (vocabulario del parser de búsquedas).
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.agents.retriever_agent import RetrieverAgent
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRetrieverAgentVocabulary:
+    """El vocabulario se carga en segundo plano, con reintentos y refresco."""
+
+    @pytest.fixture
+    def product_service(self):
+        service = MagicMock()
+        service.get_search_vocabulary = AsyncMock()
+        return service
+
+    async def _wait_for_brands(self, agent, brands):
+        for _ in range(100):
+            if agent.query_parser.brands == brands:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"marcas esperadas {brands}, hay {agent.query_parser.brands}")
+
+    async def test_retries_until_database_answers(self, product_service):
+        product_service.get_search_vocabulary.side_effect = [
+            TimeoutError(),
+            (["Nike"], ["running"]),
+        ]
+        agent = RetrieverAgent(product_service, rag_service=None)
+
+        # Sin vocabulario la marca queda como término de texto
+        assert agent.query_parser.parse("nike").filters.brands == []
+
+        task = agent.start_vocabulary_refresh(interval=0, retry_delay=0.01)
+        await asyncio.wait_for(task, timeout=2)
+
+        assert agent.query_parser.parse("nike").filters.brands == ["Nike"]
+        assert product_service.get_search_vocabulary.await_count == 2
+
+    async def test_picks_up_new_brands(self, product_service):
+        product_service.get_search_vocabulary.side_effect = [
+            (["Nike"], ["running"]),
+            (["Nike"], ["running"]),
+            (["Nike", "On"], ["running"]),
+        ] + [(["Nike", "On"], ["running"])] * 100
+        agent = RetrieverAgent(product_service, rag_service=None)
+
+        task = agent.start_vocabulary_refresh(interval=0.01)
+        await self._wait_for_brands(agent, ["Nike"])
+        parser = agent.query_parser
+        await self._wait_for_brands(agent, ["Nike", "On"])
+        task.cancel()
+
+        assert agent.query_parser is not parser
+        assert agent.query_parser.parse("zapatillas on").filters.brands == ["On"]
@@ -0,0 +1,117 @@
+"""
+Tests unitarios para el control de cuota de LLMProvider.
+"""
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.llm.limiter import (
+    LLMOverloadedError,
+    TokenBucket,
+    backoff_delay,
+    is_retryable_error,
+)
+from backend.llm.provider import LLMProvider
+
+
+class ResourceExhausted(Exception):
+    """Imita google.api_core.exceptions.ResourceExhausted (429)."""
+
+
+class ConcurrencyModel:
+    """Modelo falso que registra la concurrencia máxima y falla N veces."""
+
+    model_name = "fake-model"
+    temperature = 0.0
+
+    def __init__(self, delay: float = 0.02, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures > 0:
+                self.failures -= 1
+                raise ResourceExhausted("429 quota exceeded")
+            return AIMessage(content="ok")
+        finally:
+            self.active -= 1
+
+
+def _messages():
+    return [HumanMessage(content="hola")]
+
+
+@pytest.mark.unit
+class TestLimiterHelpers:
+    """Tests para clasificación de errores y backoff."""
+
+    def test_retryable_errors(self):
+        assert is_retryable_error(ResourceExhausted("429"))
+
+        error = RuntimeError("boom")
+        error.code = 503
+        assert is_retryable_error(error)
+
+        assert not is_retryable_error(ValueError("prompt inválido"))
+        assert not is_retryable_error(asyncio.TimeoutError())
+
+    def test_backoff_is_bounded(self):
+        for attempt in range(10):
+            assert 0.0 <= backoff_delay(attempt, base=0.5, maximum=2.0) <= 2.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestProviderLimiter:
+    """Tests para semáforo, token bucket y reintentos."""
+
+    async def test_semaphore_bounds_concurrency(self):
+        model = ConcurrencyModel()
+        provider = LLMProvider(model=model, max_concurrency=2)
+        await asyncio.gather(*[provider.ainvoke(_messages()) for _ in range(6)])
+        assert model.calls == 6
+        assert model.peak == 2
+        assert provider.get_limiter_stats()["queue_wait"]["count"] == 6
+
+    async def test_retries_retryable_errors(self):
+        model = ConcurrencyModel(delay=0, failures=2)
+        provider = LLMProvider(model=model, max_retries=2, retry_base_delay=0.001)
+        response = await provider.ainvoke(_messages())
+        assert response.content == "ok"
+        assert model.calls == 3
+        assert provider.retries == 2
+
+    async def test_gives_up_after_max_retries(self):
+        model = ConcurrencyModel(delay=0, failures=5)
+        provider = LLMProvider(model=model, max_retries=1, retry_base_delay=0.001)
+        with pytest.raises(ResourceExhausted):
+            await provider.ainvoke(_messages())
+        assert model.calls == 2
+
+    async def test_max_queue_wait_rejects(self):
+        model = ConcurrencyModel(delay=0.2)
+        provider = LLMProvider(model=model, max_concurrency=1, max_queue_wait=0.05)
+        results = await asyncio.gather(
+            provider.ainvoke(_messages()),
+            provider.ainvoke(_messages()),
+            return_exceptions=True,
+        )
+        assert isinstance(results[1], LLMOverloadedError)
+        assert provider.rejected == 1
+
+    async def test_token_bucket_waits_when_empty(self):
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 tokens/s
+        await bucket.acquire()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await bucket.acquire()
+        assert loop.time() - started >= 0.08
@@ -0,0 +1,101 @@
+"""
+Tests unitarios para la caché de respuestas de LLMProvider.
+"""
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from backend.llm.cache import MemoryLLMCache, make_cache_key
+from backend.llm.provider import LLMProvider
+
+
+class FakeModel:
+    """Modelo falso que cuenta llamadas."""
+
+    model_name = "fake-model"
+    temperature = 0.7
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return AIMessage(content=f"respuesta {self.calls}")
+
+
+def _messages(text="busco nike"):
+    return [SystemMessage(content="clasifica"), HumanMessage(content=text)]
+
+
+@pytest.mark.unit
+class TestCacheKey:
+    """Tests para la key de caché."""
+
+    def test_same_prompt_same_key(self):
+        assert make_cache_key("m", 0.7, _messages()) == make_cache_key("m", 0.7, _messages())
+
+    def test_key_depends_on_model_temperature_and_messages(self):
+        base = make_cache_key("m", 0.7, _messages())
+        assert base != make_cache_key("otro", 0.7, _messages())
+        assert base != make_cache_key("m", 0.0, _messages())
+        assert base != make_cache_key("m", 0.7, _messages("busco adidas"))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestLLMProviderCache:
+    """Tests para memoización, TTL por call site y stampede protection."""
+
+    async def test_without_cache_always_calls_model(self):
+        model = FakeModel()
+        provider = LLMProvider(model=model)
+        await provider.ainvoke(_messages())
+        await provider.ainvoke(_messages())
+        assert model.calls == 2
+
+    async def test_memory_cache_hit(self):
+        model = FakeModel()
+        provider = LLMProvider(model=model, cache=MemoryLLMCache())
+        first = await provider.ainvoke(_messages(), call_site="intent")
+        second = await provider.ainvoke(_messages(), call_site="intent")
+        assert model.calls == 1
+        assert second.content == first.content
+        assert provider.get_cache_stats()["hits"] == 1
+
+    async def test_bypass_and_zero_ttl(self):
+        model = FakeModel()
+        provider = LLMProvider(
+            model=model, cache=MemoryLLMCache(), call_site_ttls={"general": 0}
+        )
+        await provider.ainvoke(_messages(), call_site="intent")
+        await provider.ainvoke(_messages(), call_site="intent", use_cache=False)
+        await provider.ainvoke(_messages(), call_site="general")
+        await provider.ainvoke(_messages(), call_site="general")
+        assert model.calls == 4
+
+    async def test_concurrent_identical_prompts_share_one_call(self):
+        model = FakeModel(delay=0.05)
+        provider = LLMProvider(model=model, cache=MemoryLLMCache())
+        results = await asyncio.gather(
+            *[provider.ainvoke(_messages(), call_site="intent") for _ in range(5)]
+        )
+        assert model.calls == 1
+        assert {r.content for r in results} == {"respuesta 1"}
+        assert provider.get_cache_stats()["inflight_shared"] == 4
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        model = FakeModel(delay=0.05)
+        provider = LLMProvider(model=model, cache=MemoryLLMCache())
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(provider.ainvoke(_messages(), call_site="intent"), 0.01)
+        result = await provider.ainvoke(_messages(), call_site="intent")
+        assert result.content == "respuesta 1"
+        assert model.calls == 1
+
+    async def test_memory_cache_expires(self):
+        cache = MemoryLLMCache()
+        await cache.set("k", "v", ttl_seconds=-1)
+        assert await cache.get("k") is None
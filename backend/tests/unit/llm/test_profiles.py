@@ -0,0 +1,53 @@
+"""
+Tests unitarios para los perfiles de generación por tarea.
+"""
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.llm.profiles import DEFAULT_PROFILES, build_profiles
+from backend.llm.provider import LLMProvider
+
+
+class SlowModel:
+    model_name = "fake-model"
+    temperature = 0.0
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(0.2)
+        return AIMessage(content="{}")
+
+
+@pytest.mark.unit
+class TestProfiles:
+    """Tests para presets, overrides y enrutamiento por call site."""
+
+    def test_classification_profile_is_cheap_and_deterministic(self):
+        classify = DEFAULT_PROFILES["classify"]
+        assert classify.temperature == 0.0
+        assert classify.max_output_tokens is not None
+        assert classify.response_mime_type == "application/json"
+
+    def test_overrides_are_partial(self):
+        profiles = build_profiles({"classify": {"model": "otro-modelo"}, "nuevo": {"timeout": 3}})
+        assert profiles["classify"].model == "otro-modelo"
+        assert profiles["classify"].temperature == 0.0
+        assert profiles["nuevo"].timeout == 3
+        assert profiles["nuevo"].model == DEFAULT_PROFILES["default"].model
+
+    def test_call_sites_route_to_profiles(self):
+        provider = LLMProvider(model=SlowModel())
+        assert provider.profile_for("intent").name == "classify"
+        assert provider.profile_for("turn_analysis").name == "classify"
+        assert provider.profile_for("style").name == "style"
+        assert provider.profile_for("guion").name == "persuade"
+        assert provider.profile_for("desconocido").name == "default"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_profile_timeout_applies_to_call():
+    provider = LLMProvider(model=SlowModel(), profiles={"classify": {"timeout": 0.05}})
+    with pytest.raises(asyncio.TimeoutError):
+        await provider.ainvoke([HumanMessage(content="hola")], call_site="intent")
@@ -0,0 +1,47 @@
+"""
+Tests unitarios para BM25 y la fusión por rango recíproco.
+"""
+import pytest
+
+from backend.nlp.bm25 import BM25Index, analyze, reciprocal_rank_fusion
+
+TEXTS = [
+    "Programa de membresía VIP: descuentos y acceso anticipado a drops",
+    "Garantía de 6 meses por defectos de fábrica",
+    "Aceptamos tarjeta de crédito y transferencia bancaria",
+    "Envíos a todo el país en 48 horas",
+]
+
+
+@pytest.mark.unit
+class TestBM25Index:
+    """Tests para el índice invertido."""
+
+    def test_analyze_folds_accents_stopwords_and_plurals(self):
+        assert analyze("Los envíos de las zapatillas") == ["envio", "zapatilla"]
+
+    def test_exact_business_terms_rank_first(self):
+        index = BM25Index(TEXTS)
+        assert index.search("membresía vip")[0][0] == 0
+        assert index.search("garantia")[0][0] == 1
+        assert index.search("pago por transferencia")[0][0] == 2
+
+    def test_unknown_terms_return_nothing(self):
+        assert BM25Index(TEXTS).search("bitcoin") == []
+
+    def test_coverage_penalizes_unmatched_terms(self):
+        index = BM25Index(TEXTS)
+        position, score = index.search("garantía")[0]
+        assert index.coverage("garantía", score) == pytest.approx(1.0, abs=0.2)
+
+        _, partial = index.search("garantía para bitcoin")[0]
+        assert index.coverage("garantía para bitcoin", partial) < 0.5
+
+
+@pytest.mark.unit
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]], k=60)
+    keys = [key for key, _ in fused]
+    assert set(keys[:2]) == {"a", "b"}
+    assert keys[-1] in {"c", "d"}
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
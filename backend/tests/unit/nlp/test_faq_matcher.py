@@ -0,0 +1,92 @@
+"""
+Tests unitarios para el matcher de FAQs compilado desde faqs.csv.
+"""
+import pytest
+
+from backend.nlp.faq_matcher import FAQMatcher
+
+FAQS = [
+    {
+        "type": "greeting",
+        "category": "greeting",
+        "patterns": r"^(hola|buenos dias|buenas tardes)(\s|!|\.|\?)*$",
+        "response": "¡Hola! Soy Alex.",
+    },
+    {
+        "type": "faq",
+        "category": "hours",
+        "patterns": ".*cuál.*horario.*;;;.*qué hora.*abr.*;;;.*horario.*atención.*",
+        "response": "Atendemos de 10:00 a 20:00.",
+    },
+    {
+        "type": "faq",
+        "category": "payment",
+        "patterns": ".*método.*pago.*;;;.*aceptan.*tarjeta.*",
+        "response": "Aceptamos tarjetas y transferencias.",
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return FAQMatcher(FAQS)
+
+
+@pytest.mark.unit
+class TestFAQMatcher:
+    """Tests para el lookup exacto y difuso."""
+
+    def test_exact_match_ignores_accents_and_case(self, matcher):
+        match = matcher.match("¿A QUE hora abren?")
+        assert match.category == "hours"
+        assert match.response == "Atendemos de 10:00 a 20:00."
+        assert match.method == "exact"
+        assert match.confidence == 1.0
+
+    def test_fuzzy_match_tolerates_typos(self, matcher):
+        match = matcher.match("horaio de atencon")
+        assert match.category == "hours"
+        assert match.method == "fuzzy"
+        assert 0.75 <= match.confidence < 1.0
+
+    def test_anchored_patterns_require_whole_query(self, matcher):
+        assert matcher.match("buenas tardes!").category == "greeting"
+        assert matcher.match("hola, busco unas jordan") is None
+
+    def test_miss_returns_none(self, matcher):
+        assert matcher.match("precio de las nike air max") is None
+        assert matcher.match("   ") is None
+
+    def test_several_faqs_fall_below_threshold(self):
+        matcher = FAQMatcher(FAQS + [
+            {
+                "type": "faq",
+                "category": "products",
+                "patterns": ".*qué.*tienen.*;;;.*tienen.*(sneaker|zapatilla|nike|adidas|jordan).*",
+                "response": "Tenemos Nike, Adidas y Jordan.",
+            },
+            {
+                "type": "faq",
+                "category": "warranty",
+                "patterns": ".*garantía.*;;;.*roto.*",
+                "response": "Todos los productos tienen garantía.",
+            },
+        ])
+
+        assert matcher.match("tienen garantía?").confidence == 1.0
+        # Productos y garantía: ambigua, no supera el umbral de RAGService (0.75)
+        match = matcher.match("tienen garantia las nike?")
+        assert match.method == "exact"
+        assert match.confidence < 0.75
+
+    def test_invalid_patterns_are_skipped(self):
+        matcher = FAQMatcher([dict(FAQS[2], patterns="(roto;;;.*aceptan.*tarjeta.*")])
+        assert matcher.match("aceptan tarjeta?").category == "payment"
+
+    def test_from_csv(self, tmp_path):
+        import pandas as pd
+
+        path = tmp_path / "faqs.csv"
+        pd.DataFrame(FAQS).to_csv(path, index=False)
+        assert FAQMatcher.from_csv(path).match("método de pago").category == "payment"
+        assert len(FAQMatcher.from_csv(tmp_path / "missing.csv")) == 0
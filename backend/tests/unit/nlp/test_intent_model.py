@@ -0,0 +1,66 @@
+"""
+Tests unitarios para el clasificador de intención local.
+"""
+import pytest
+
+from backend.nlp import intent_model
+from backend.nlp.intent_model import (
+    IntentSample,
+    LocalIntentClassifier,
+    featurize,
+    train_intent_classifier,
+)
+
+_SEARCH = ["busco nike", "tienes adidas talla 42", "muestrame zapatillas", "hay puma negras",
+           "quiero ver modelos de running", "busco zapatos blancos"]
+_INFO = ["que horarios tienen", "hacen envios a quito", "donde estan ubicados",
+         "cual es la politica de devolucion", "aceptan tarjeta", "tienen garantia"]
+_CHECKOUT = ["los quiero", "damelos", "confirmo el pedido", "procede con la compra",
+             "lo compro", "si me los llevo"]
+
+
+def _samples():
+    samples = [IntentSample(text=t, intent="search") for t in _SEARCH]
+    samples += [IntentSample(text=t, intent="info") for t in _INFO]
+    samples += [IntentSample(text=t, intent="checkout", has_search_results=True) for t in _CHECKOUT]
+    return samples
+
+
+@pytest.mark.unit
+class TestLocalIntentClassifier:
+    """Tests para entrenamiento, predicción y artefacto versionado."""
+
+    def test_featurize_adds_context_token(self):
+        assert featurize("¿Dónde?", False) != featurize("¿Dónde?", True)
+        assert featurize("¿Dónde?", False).endswith("donde")
+
+    def test_train_and_predict(self):
+        model, report = train_intent_classifier(_samples())
+        intent, confidence = model.predict("busco nike talla 40")
+        assert intent == "search"
+        assert 0.0 < confidence <= 1.0
+        assert report["samples"] == 18
+        assert set(model.labels) == {"search", "info", "checkout"}
+
+    def test_requires_two_labels(self):
+        with pytest.raises(ValueError):
+            train_intent_classifier([IntentSample(text="busco nike", intent="search")])
+
+    def test_save_and_load_latest_version(self, tmp_path):
+        model, _ = train_intent_classifier(_samples())
+        path = model.save(tmp_path)
+        assert path.name == f"intent_classifier_{model.version}.joblib"
+
+        loaded = LocalIntentClassifier.load(tmp_path)
+        assert loaded is not None
+        assert loaded.version == model.version
+        assert loaded.predict("donde estan")[0] == model.predict("donde estan")[0]
+
+    def test_load_rejects_other_feature_schema(self, tmp_path, monkeypatch):
+        model, _ = train_intent_classifier(_samples())
+        model.save(tmp_path)
+        monkeypatch.setattr(intent_model, "FEATURE_SCHEMA_VERSION", 999)
+        assert LocalIntentClassifier.load(tmp_path) is None
+
+    def test_load_missing_path(self, tmp_path):
+        assert LocalIntentClassifier.load(tmp_path / "no-existe") is None
@@ -0,0 +1,71 @@
+"""
+Tests unitarios para el léxico compilado (Aho-Corasick).
+"""
+import pytest
+
+from backend.nlp.lexicon import Lexicon, get_lexicon, normalize_text
+
+
+@pytest.mark.unit
+class TestNormalizeText:
+    """Tests para la normalización de texto."""
+
+    def test_folds_accents_and_punctuation(self):
+        assert normalize_text("¿Cuál es el HORARIO, señor?") == "cual es el horario senor"
+
+    def test_collapses_whitespace(self):
+        assert normalize_text("  hola\n\tmundo  ") == "hola mundo"
+
+
+@pytest.mark.unit
+class TestLexicon:
+    """Tests para el escaneo de categorías."""
+
+    def test_word_boundaries(self):
+        lexicon = Lexicon({"juvenil": ["che", "re"]})
+        assert not lexicon.scan("buenas noches, quiero algo").has("juvenil")
+        assert lexicon.scan("che, re lindo").score("juvenil") == 2
+
+    def test_prefix_patterns(self):
+        lexicon = Lexicon({"info": ["horario*"]})
+        assert lexicon.scan("¿Qué horarios tienen?").has("info")
+        assert not lexicon.scan("hora").has("info")
+
+    def test_overlapping_phrases_are_all_reported(self):
+        lexicon = Lexicon({"checkout": ["quiero", "los quiero"]})
+        scan = lexicon.scan("Los quiero ya")
+        assert sorted(scan.matched("checkout")) == ["los quiero", "quiero"]
+
+    def test_accent_insensitive_terms(self):
+        lexicon = Lexicon({"stop": ["adiós", "déjalo"]})
+        assert lexicon.scan("adios").has("stop")
+        assert lexicon.scan("DÉJALO así").has("stop")
+
+    def test_single_scan_returns_all_categories(self):
+        scan = get_lexicon().scan("Busco zapatillas, ¿cuál es el precio con descuento?")
+        scores = scan.scores("intent.")
+        assert scores["intent.search"] >= 1
+        assert scores["intent.persuasion"] >= 2
+
+
+@pytest.mark.unit
+class TestGlobalVocabularies:
+    """Tests de regresión sobre los vocabularios del sistema."""
+
+    def test_stop_intent(self):
+        lexicon = get_lexicon()
+        assert lexicon.scan("Mejor no, gracias").has("stop")
+        assert lexicon.scan("ok, después veo").has("stop")
+        assert not lexicon.scan("no tienen talla 42?").has("stop")
+
+    def test_reply_approval_vs_rejection(self):
+        lexicon = get_lexicon()
+        bueno = lexicon.scan("bueno, me gustan")
+        assert bueno.has("reply.approval")
+        assert not bueno.has("reply.rejection")
+        assert lexicon.scan("no, muéstrame otra").has("reply.rejection")
+
+    def test_faq_detection(self):
+        lexicon = get_lexicon()
+        assert lexicon.scan("¿Dónde están ubicados?").has("retriever.faq")
+        assert not lexicon.scan("zapatillas nike running").has("retriever.faq")
@@ -0,0 +1,102 @@
+"""
+Tests unitarios para el parser de búsquedas de producto (filtros sin LLM).
+"""
+from decimal import Decimal
+
+import pytest
+
+from backend.nlp.query_parser import QueryParser
+
+BRANDS = ["Nike", "Adidas", "New Balance", "Puma"]
+CATEGORIES = ["running", "lifestyle", "training", "basketball", "outdoor", "accesorios"]
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return QueryParser(brands=BRANDS, categories=CATEGORIES)
+
+
+@pytest.mark.unit
+class TestQueryParser:
+    """Tests para la extracción de filtros estructurados."""
+
+    def test_brand_category_price_and_size(self, parser):
+        parsed = parser.parse("Nike para correr de menos de 100 dólares talla 42")
+
+        assert parsed.terms == []
+        assert parsed.filters.brands == ["Nike"]
+        assert parsed.filters.category == "running"
+        assert parsed.filters.max_price == Decimal("100")
+        assert parsed.filters.size == "42"
+
+    def test_price_range_multiword_brand_and_color(self, parser):
+        parsed = parser.parse("zapatillas New Balance negras entre 120 y 80 usd")
+
+        assert parsed.terms == []
+        assert parsed.filters.brands == ["New Balance"]
+        assert parsed.filters.color == "negro"
+        assert (parsed.filters.min_price, parsed.filters.max_price) == (Decimal("80"), Decimal("120"))
+
+    @pytest.mark.parametrize(
+        "query, min_price, max_price",
+        [
+            ("adidas desde 50", Decimal("50"), None),
+            ("algo de $89.90", None, Decimal("89.90")),
+            ("puma hasta 60 dolares", None, Decimal("60")),
+            ("nike de 70 a 90", Decimal("70"), Decimal("90")),
+            ("nike de 100", None, Decimal("100")),
+        ],
+    )
+    def test_price_expressions(self, parser, query, min_price, max_price):
+        parsed = parser.parse(query)
+
+        assert (parsed.filters.min_price, parsed.filters.max_price) == (min_price, max_price)
+        # El monto es filtro, no término de búsqueda
+        assert not any(term[0].isdigit() for term in parsed.terms)
+
+    def test_model_numbers_stay_as_terms(self, parser):
+        parsed = parser.parse("Air Max 90 en oferta talla 9.5")
+
+        assert parsed.terms == ["air", "max", "90"]
+        assert parsed.filters.on_sale_only is True
+        assert parsed.filters.size == "9.5"
+        assert parsed.filters.max_price is None
+
+    def test_sku_color_codes_are_not_query_colors(self, parser):
+        parsed = parser.parse("pegasus blk")
+
+        assert parsed.filters.color is None
+        assert parsed.terms == ["pegasus", "blk"]
+
+    def test_several_brands_and_synonyms(self, parser):
+        parsed = parser.parse("adidas o puma para el gimnasio")
+
+        assert parsed.filters.brands == ["Adidas", "Puma"]
+        assert parsed.filters.category == "training"
+
+    def test_plain_query_has_no_filters(self, parser):
+        parsed = parser.parse("quiero ver las pegasus")
+
+        assert parsed.terms == ["pegasus"]
+        assert not parsed.has_filters
+
+    @pytest.mark.parametrize(
+        "query, filters",
+        [
+            ("quiero unos nike rojos", {"brands": ["Nike"], "color": "rojo"}),
+            ("hay modelos de la marca puma", {"brands": ["Puma"]}),
+            ("busco algo para correr", {"category": "running"}),
+        ],
+    )
+    def test_filler_words_are_not_terms(self, parser, query, filters):
+        parsed = parser.parse(query)
+
+        # Cada término es obligatorio en la búsqueda: el relleno no debe quedar
+        assert parsed.terms == []
+        assert parsed.filters.model_dump(exclude_defaults=True) == filters
+
+    def test_unknown_brands_are_text_terms(self):
+        parsed = QueryParser().parse("nike pegasus")
+
+        assert parsed.terms == ["nike", "pegasus"]
+        assert not parsed.has_filters
@@ -0,0 +1,133 @@
+"""
+Tests unitarios para los backends offline (fake, hashing, record/replay).
+"""
+import json
+
+import numpy as np
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from backend.offline.cassette import Cassette
+from backend.offline.chat import FakeChatModel, RecordingChatModel, ReplayChatModel
+from backend.offline.embeddings import HashingEmbeddings, RecordingEmbeddings, ReplayEmbeddings
+from backend.offline.latency import LatencyModel
+from backend.offline.tts import FakeTTSService
+
+
+def _classification_prompt(query: str):
+    return [
+        SystemMessage(content="Responde SOLO con un JSON válido"),
+        HumanMessage(content=f'Query del usuario: "{query}"'),
+    ]
+
+
+@pytest.mark.unit
+class TestLatencyModel:
+    """Tests para las distribuciones de latencia."""
+
+    @pytest.mark.parametrize("kind", ["fixed", "uniform", "normal", "lognormal"])
+    def test_samples_respect_bounds(self, kind):
+        model = LatencyModel(kind=kind, mean_ms=100, stddev_ms=50, min_ms=10, max_ms=300, seed=1)
+        samples = [model.sample_ms() for _ in range(500)]
+        assert min(samples) >= 10
+        assert max(samples) <= 300
+        assert 60 < sum(samples) / len(samples) < 140
+
+    def test_seed_is_reproducible(self):
+        first = LatencyModel(kind="lognormal", mean_ms=100, stddev_ms=50, seed=7)
+        second = LatencyModel(kind="lognormal", mean_ms=100, stddev_ms=50, seed=7)
+        assert [first.sample_ms() for _ in range(5)] == [second.sample_ms() for _ in range(5)]
+
+    def test_unknown_kind_fails(self):
+        with pytest.raises(ValueError):
+            LatencyModel(kind="pareto")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFakeChatModel:
+    """Tests para el chat model determinista."""
+
+    async def test_classification_prompts_get_valid_json(self):
+        model = FakeChatModel()
+        response = await model.ainvoke(_classification_prompt("che bro, cuanto cuesta el envío?"))
+        result = json.loads(response.content)
+        assert result["intent"] in {"search", "persuasion", "checkout", "info"}
+        assert result["style"] == "juvenil"
+        assert result["stop_intent"] is False
+
+    async def test_free_text_is_deterministic_and_streams(self):
+        model = FakeChatModel()
+        messages = [HumanMessage(content="¿qué me recomiendas?")]
+        first = await model.ainvoke(messages)
+        chunks = [chunk.content async for chunk in model.astream(messages)]
+        assert "".join(chunks) == first.content
+        assert len(chunks) > 1
+
+
+@pytest.mark.unit
+class TestHashingEmbeddings:
+    """Tests para los embeddings por feature hashing."""
+
+    def test_deterministic_and_normalized(self):
+        embeddings = HashingEmbeddings(dimensions=256)
+        vector = embeddings.embed_query("zapatillas para correr")
+        assert vector == embeddings.embed_query("zapatillas para correr")
+        assert len(vector) == 256
+        assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-5)
+
+    def test_similar_texts_are_closer(self):
+        embeddings = HashingEmbeddings()
+        base, similar, other = embeddings.embed_documents(
+            ["zapatillas para correr", "zapatilla para correr rápido", "horario de la tienda"]
+        )
+        assert np.dot(base, similar) > np.dot(base, other)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRecordReplay:
+    """Tests para grabar y reproducir cassettes."""
+
+    async def test_chat_round_trip(self, tmp_path):
+        path = tmp_path / "llm.jsonl"
+        inner = FakeChatModel(model_name="gemini", temperature=0.7)
+        recorder = RecordingChatModel(inner, Cassette(path))
+        messages = [HumanMessage(content="hola")]
+        recorded = await recorder.ainvoke(messages)
+
+        fallback = FakeChatModel(model_name="gemini", temperature=0.7)
+        cassette = Cassette(path, speed=0)
+        replay = ReplayChatModel(cassette, fallback)
+        replayed = await replay.ainvoke(messages)
+
+        assert replayed.content == recorded.content
+        assert fallback.calls == 0
+        assert cassette.get_stats()["hits"] == 1
+
+        await replay.ainvoke([HumanMessage(content="no grabado")])
+        assert fallback.calls == 1
+
+    async def test_stream_chunks_are_replayed(self, tmp_path):
+        path = tmp_path / "llm.jsonl"
+        recorder = RecordingChatModel(FakeChatModel(), Cassette(path))
+        messages = [HumanMessage(content="recomiéndame algo")]
+        recorded = [chunk.content async for chunk in recorder.astream(messages)]
+
+        replay = ReplayChatModel(Cassette(path, speed=0), FakeChatModel())
+        replayed = [chunk.content async for chunk in replay.astream(messages)]
+        assert replayed == recorded
+
+    async def test_embeddings_round_trip(self, tmp_path):
+        path = tmp_path / "embeddings.jsonl"
+        recorder = RecordingEmbeddings(HashingEmbeddings(dimensions=32), Cassette(path), "m")
+        vector = await recorder.aembed_query("envíos")
+
+        replay = ReplayEmbeddings(Cassette(path, speed=0), "m", HashingEmbeddings(dimensions=32))
+        assert await replay.aembed_query("envíos") == vector
+
+    async def test_fake_tts_returns_fixed_size_audio(self):
+        tts = FakeTTSService(audio_bytes=1000)
+        audio = await tts.text_to_speech("hola")
+        assert len(audio) == 1000
+        assert tts.audio_to_data_url(audio).startswith("data:audio/mpeg;base64,")
@@ -0,0 +1,241 @@
+"""
+Tests unitarios para el catálogo en memoria (CatalogSearchEngine).
+"""
+import uuid
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.dialects import postgresql
+
+from backend.database.models import ProductStock
+from backend.domain.product_schemas import ProductSearchFilters
+from backend.nlp.query_parser import QueryParser
+from backend.services.catalog_search import CatalogProduct, CatalogSearchEngine
+from backend.services.product_service import ProductService
+
+
+def _product(name, brand, category, price="100", stock=5, **extra):
+    return ProductStock(
+        id=uuid.uuid4(),
+        product_name=name,
+        product_sku=extra.pop("sku", None),
+        brand=brand,
+        category=category,
+        unit_cost=Decimal(price),
+        quantity_available=stock,
+        is_on_sale=extra.pop("is_on_sale", False),
+        is_active=extra.pop("is_active", True),
+        warehouse_location="CUENCA-MAIN",
+        **extra,
+    )
+
+
+class _FakeResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar(self):
+        return self._value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._value
+
+
+class _FakeDatabase:
+    """Tabla product_stocks en memoria; registra cada consulta ejecutada."""
+
+    def __init__(self, products):
+        self.catalog = products
+        self.products = {p.id: p for p in products}
+        self.version = "v1"
+        self.queries = []
+
+    def __call__(self):
+        return _FakeSession(self)
+
+
+class _FakeSession:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query):
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        self.db.queries.append(sql)
+        if "md5" in sql:
+            return _FakeResult(self.db.version)
+        params = query.compile().params
+        ids = next((value for value in params.values() if isinstance(value, list)), None)
+        if ids is not None:
+            return _FakeResult([p for p in self.db.products.values() if p.id in ids])
+        return _FakeResult([p for p in self.db.products.values() if p.is_active])
+
+
+@pytest.fixture
+def database():
+    return _FakeDatabase([
+        _product("Nike Air Zoom Pegasus 40", "Nike", "Running", price="120", sku="NIKE-PEGASUS-40-BLK"),
+        _product("Adidas Ultraboost Light", "Adidas", "Running", price="180", is_on_sale=True),
+        _product("Zapatillas Básicas Urbanas", "Genérica", "Urbano", price="45", stock=0),
+        _product("Nike Court Vision", "Nike", "Urbano", price="75"),
+    ])
+
+
+@pytest_asyncio.fixture
+async def engine(database):
+    catalog = CatalogSearchEngine(database, listen=False)
+    await catalog.load()
+    return catalog
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCatalogSearchEngine:
+    """Búsqueda BM25 sobre el catálogo cargado en memoria."""
+
+    async def test_ranks_name_and_brand_matches(self, engine):
+        results = engine.search(["nike", "pegasus"])
+
+        assert [p.product_name for p in results][:2] == [
+            "Nike Air Zoom Pegasus 40",
+            "Nike Court Vision",
+        ]
+        assert isinstance(results[0], CatalogProduct)
+        assert not hasattr(results[0], "__dict__")
+
+    async def test_accents_and_plurals_are_folded(self, engine):
+        results = engine.search("zapatilla basica")
+
+        assert results[0].product_name == "Zapatillas Básicas Urbanas"
+
+    async def test_filters(self, engine):
+        filters = ProductSearchFilters(category="running", max_price=Decimal("150"))
+        assert [p.brand for p in engine.search("nike adidas", filters)] == ["Nike"]
+
+        assert engine.search("zapatillas", ProductSearchFilters(in_stock_only=True)) == []
+        on_sale = engine.search("running", ProductSearchFilters(on_sale_only=True))
+        assert [p.brand for p in on_sale] == ["Adidas"]
+
+    async def test_price_filters_use_final_price(self, engine, database):
+        ultraboost = database.catalog[1]
+        ultraboost.discount_percent = Decimal("25")
+        await engine.refresh([str(ultraboost.id)])
+
+        # 180 con 25% de descuento = 135
+        filters = ProductSearchFilters(min_price=Decimal("130"), max_price=Decimal("150"))
+        assert [p.product_name for p in engine.search([], filters)] == ["Adidas Ultraboost Light"]
+        assert engine.search("ultraboost")[0].savings_amount == Decimal("45")
+
+    async def test_filters_without_terms(self, engine):
+        filters = ProductSearchFilters(brands=["nike", "Adidas"], max_price=Decimal("150"))
+        assert [p.product_name for p in engine.search([], filters)] == [
+            "Nike Air Zoom Pegasus 40",
+            "Nike Court Vision",
+        ]
+
+        black = engine.search([], ProductSearchFilters(color="negro"))
+        assert [p.product_sku for p in black] == ["NIKE-PEGASUS-40-BLK"]
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("quiero unos nike negros", ["Nike Air Zoom Pegasus 40"]),
+            ("hay modelos de la marca adidas", ["Adidas Ultraboost Light"]),
+            ("busco algo para correr", ["Adidas Ultraboost Light", "Nike Air Zoom Pegasus 40"]),
+        ],
+    )
+    async def test_parsed_queries_with_filler_words(self, engine, query, expected):
+        brands, categories = engine.vocabulary()
+        parsed = QueryParser(brands=brands, categories=categories).parse(query)
+
+        results = engine.search(parsed.terms, parsed.filters)
+
+        assert [p.product_name for p in results] == expected
+
+    async def test_color_matches_whole_words_and_sku_suffix(self):
+        database = _FakeDatabase([
+            _product("Adidas Predator Accuracy", "Adidas", "Futbol", sku="ADIDAS-PREDATOR"),
+            _product("Nike Blucher Grey", "Nike", "Urbano", sku="NIKE-BLUCHER"),
+            _product("Puma Suede Red", "Puma", "Urbano", sku="PUMA-SUEDE"),
+            _product("Nike Air Max 90", "Nike", "Urbano", sku="NIKE-MAX-90-BLU"),
+        ])
+        catalog = CatalogSearchEngine(database, listen=False)
+        await catalog.load()
+
+        red = catalog.search([], ProductSearchFilters(color="rojo"))
+        blue = catalog.search([], ProductSearchFilters(color="azul"))
+
+        assert [p.product_name for p in red] == ["Puma Suede Red"]
+        assert [p.product_name for p in blue] == ["Nike Air Max 90"]
+
+    async def test_refresh_updates_only_changed_rows(self, engine, database):
+        pegasus, ultraboost = database.catalog[0], database.catalog[1]
+        pegasus.quantity_available = 0
+        ultraboost.is_active = False
+
+        await engine.refresh([str(pegasus.id), str(ultraboost.id)])
+
+        assert engine.search("pegasus")[0].quantity_available == 0
+        assert engine.search("ultraboost") == []
+        assert len(engine) == 3
+
+    async def test_polling_reloads_only_when_version_changes(self, engine, database):
+        reloads = engine.reloads
+
+        await engine._refresh_pending()
+        assert engine.reloads == reloads
+
+        database.version = "v2"
+        await engine._refresh_pending()
+        assert engine.reloads == reloads + 1
+        assert engine.get_stats()["version"] == "v2"
+
+    async def test_notifications_trigger_partial_refresh(self, engine, database):
+        engine.notify(str(database.catalog[3].id))
+        database.queries.clear()
+
+        await engine._refresh_pending()
+
+        # Una consulta de versión y otra solo por el producto notificado
+        assert len(database.queries) == 2 and "IN" in database.queries[1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestProductServiceWithCatalog:
+    """ProductService responde desde el catálogo cuando está cargado."""
+
+    async def test_search_terms_skips_database(self, engine, database):
+        service = ProductService(database, catalog=engine)
+        database.queries.clear()
+
+        products = await service.search_terms(["nike", "court"])
+
+        assert products[0].product_name == "Nike Court Vision"
+        assert database.queries == []
+
+    async def test_vocabulary_comes_from_catalog(self, engine, database):
+        service = ProductService(database, catalog=engine)
+        database.queries.clear()
+
+        brands, categories = await service.get_search_vocabulary()
+
+        assert brands == ["Adidas", "Genérica", "Nike"]
+        assert categories == ["Running", "Urbano"]
+        assert database.queries == []
+
+    async def test_search_terms_uses_database_until_loaded(self, database):
+        service = ProductService(database, search_mode="ilike", catalog=CatalogSearchEngine(database))
+
+        await service.search_terms(["nike"])
+
+        assert len(database.queries) == 1 and "ILIKE" in database.queries[0]
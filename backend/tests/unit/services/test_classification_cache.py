@@ -0,0 +1,97 @@
+"""
+Tests unitarios para ClassificationCache.
+"""
+import pytest
+
+from backend.domain.agent_schemas import AgentState, IntentClassification
+from backend.services.classification_cache import ClassificationCache
+
+
+class FakeRedis:
+    """Redis mínimo en memoria (get/setex)."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+def _intent(intent="search", source="llm", confidence=0.9):
+    return IntentClassification(
+        intent=intent,
+        confidence=confidence,
+        suggested_agent="retriever" if intent == "search" else "sales",
+        source=source,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestClassificationCache:
+    """Tests para la caché de clasificaciones."""
+
+    async def test_exact_hit_on_normalized_query(self):
+        cache = ClassificationCache()
+        await cache.put(AgentState(user_query="Busco unos Nike"), _intent())
+
+        hit = await cache.get(AgentState(user_query="¡busco unos nike!"))
+        assert hit is not None
+        assert hit.intent == "search"
+        assert hit.source == "cache"
+        assert cache.get_stats()["memory_hits"] == 1
+
+    async def test_context_signature_prevents_reuse(self):
+        cache = ClassificationCache()
+        await cache.put(AgentState(user_query="sí, esos"), _intent("persuasion"))
+
+        with_results = AgentState(user_query="sí, esos", search_results=[{"id": "1"}])
+        assert await cache.get(with_results) is None
+        assert cache.get_stats()["misses"] == 1
+
+    async def test_only_confident_llm_results_are_cached(self):
+        cache = ClassificationCache()
+        await cache.put(AgentState(user_query="hola"), _intent(source="keywords"))
+        await cache.put(AgentState(user_query="hola"), _intent(confidence=0.3))
+        assert await cache.get(AgentState(user_query="hola")) is None
+
+    async def test_redis_level_shared_between_instances(self):
+        redis_client = FakeRedis()
+        await ClassificationCache(redis_client=redis_client).put(
+            AgentState(user_query="cuánto cuesta el envío"), _intent("info")
+        )
+
+        other = ClassificationCache(redis_client=redis_client)
+        hit = await other.get(AgentState(user_query="cuanto cuesta el envio"))
+        assert hit is not None and hit.intent == "info"
+        assert other.get_stats()["redis_hits"] == 1
+
+    async def test_lru_eviction(self):
+        cache = ClassificationCache(max_entries=2)
+        for query in ["uno", "dos", "tres"]:
+            await cache.put(AgentState(user_query=query), _intent())
+        assert await cache.get(AgentState(user_query="uno")) is None
+        assert await cache.get(AgentState(user_query="tres")) is not None
+
+    async def test_semantic_near_duplicate(self):
+        vectors = {
+            "busco unos nike": [1.0, 0.0, 0.1],
+            "busco nikes": [0.99, 0.0, 0.12],
+            "horario de atencion": [0.0, 1.0, 0.0],
+        }
+
+        async def embed(text):
+            return vectors[text.lower()]
+
+        cache = ClassificationCache(embed_fn=embed, similarity_threshold=0.95)
+        state = AgentState(user_query="busco unos nike")
+        assert await cache.get(state) is None
+        await cache.put(state, _intent())
+
+        hit = await cache.get(AgentState(user_query="busco nikes"))
+        assert hit is not None and hit.intent == "search"
+        assert await cache.get(AgentState(user_query="horario de atencion")) is None
+        assert cache.get_stats()["semantic_hits"] == 1
@@ -0,0 +1,56 @@
+"""
+Tests unitarios para EmbeddingCache.
+"""
+import numpy as np
+import pytest
+
+from backend.services.embedding_cache import EmbeddingCache
+
+
+class FakeRedis:
+    """Redis mínimo en memoria (get/setex), con strings como decode_responses=True."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        assert isinstance(value, str)
+        self.data[key] = value
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestEmbeddingCache:
+    """Tests para la caché de embeddings de queries."""
+
+    async def test_memory_hit_on_normalized_text(self):
+        cache = EmbeddingCache(model_id="m")
+        await cache.put("Horario de atención?", [0.1, 0.2, 0.3])
+        vector = await cache.get("horario de atencion")
+        assert vector.dtype == np.float32
+        assert np.allclose(vector, [0.1, 0.2, 0.3])
+        assert cache.get_stats()["memory_hits"] == 1
+
+    async def test_redis_shared_between_instances(self):
+        redis = FakeRedis()
+        await EmbeddingCache(model_id="m", redis_client=redis).put("envíos", [1.0, -2.5])
+
+        other = EmbeddingCache(model_id="m", redis_client=redis)
+        vector = await other.get("envios")
+        assert np.allclose(vector, [1.0, -2.5])
+        assert other.get_stats()["redis_hits"] == 1
+
+    async def test_model_id_is_part_of_key(self):
+        redis = FakeRedis()
+        await EmbeddingCache(model_id="a", redis_client=redis).put("envíos", [1.0])
+        assert await EmbeddingCache(model_id="b", redis_client=redis).get("envíos") is None
+
+    async def test_lru_eviction(self):
+        cache = EmbeddingCache(model_id="m", max_entries=2)
+        for text in ("uno", "dos", "tres"):
+            await cache.put(text, [1.0])
+        assert await cache.get("uno") is None
+        assert await cache.get("tres") is not None
@@ -0,0 +1,83 @@
+"""
+Tests unitarios para ConversationHistoryManager.
+"""
+import json
+
+import pytest
+
+from backend.domain.agent_schemas import AgentState
+from backend.services.history_manager import (
+    ConversationHistoryManager,
+    history_tokens,
+)
+
+
+def _state_with_turns(turns: int, text: str = "busco zapatillas para correr") -> AgentState:
+    state = AgentState(user_query="hola")
+    for i in range(turns):
+        state.conversation_history.append({"role": "user", "content": f"{text} {i}"})
+        state.conversation_history.append({"role": "assistant", "content": f"respuesta {i}"})
+    return state
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestConversationHistoryManager:
+    """Tests para el tope de mensajes, presupuesto de tokens y resumen."""
+
+    async def test_short_history_is_untouched(self):
+        manager = ConversationHistoryManager(max_messages=12)
+        state = _state_with_turns(3)
+        await manager.compact(state)
+        assert len(state.conversation_history) == 6
+        assert state.conversation_summary is None
+        assert manager.compactions == 0
+
+    async def test_compacts_to_keep_recent_and_summarizes(self):
+        manager = ConversationHistoryManager(max_messages=8, keep_recent=4)
+        state = _state_with_turns(5)
+        await manager.compact(state)
+        assert len(state.conversation_history) == 4
+        assert state.conversation_history[-1]["content"] == "respuesta 4"
+        assert "Cliente: busco zapatillas para correr 0" in state.conversation_summary
+        assert manager.evicted_messages == 6
+
+    async def test_payload_stays_flat_over_long_sessions(self):
+        manager = ConversationHistoryManager(
+            max_messages=10, keep_recent=4, token_budget=200, summary_token_budget=80
+        )
+        state = AgentState(user_query="hola")
+        sizes = []
+        for i in range(200):
+            state.conversation_history.append({"role": "user", "content": f"quiero ver modelo {i} " * 5})
+            state.conversation_history.append({"role": "assistant", "content": f"te muestro el {i} " * 5})
+            await manager.compact(state)
+            sizes.append(len(json.dumps(state.model_dump(), default=str)))
+        assert len(state.conversation_history) <= 10
+        assert history_tokens(state.conversation_history) <= 200
+        assert max(sizes[100:]) <= max(sizes[:20]) * 1.5
+
+    async def test_token_budget_evicts_long_messages(self):
+        manager = ConversationHistoryManager(max_messages=50, keep_recent=10, token_budget=100)
+        state = _state_with_turns(3, text="x" * 400)
+        await manager.compact(state)
+        assert history_tokens(state.conversation_history) <= 100
+        assert len(state.conversation_history) >= 1
+
+    async def test_llm_summarizer_and_fallback(self):
+        async def summarizer(previous, evicted):
+            return f"- {len(evicted)} mensajes resumidos"
+
+        manager = ConversationHistoryManager(max_messages=4, keep_recent=2, summarizer=summarizer)
+        state = _state_with_turns(3)
+        await manager.compact(state)
+        assert state.conversation_summary == "- 4 mensajes resumidos"
+
+        async def broken(previous, evicted):
+            raise RuntimeError("LLM caído")
+
+        manager = ConversationHistoryManager(max_messages=4, keep_recent=2, summarizer=broken)
+        state = _state_with_turns(3)
+        await manager.compact(state)
+        assert state.conversation_summary.startswith("- Cliente:")
+        assert manager.summarizer_failures == 1
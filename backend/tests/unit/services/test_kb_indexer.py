@@ -0,0 +1,204 @@
+"""
+Tests unitarios para el indexado incremental y la recarga en caliente del RAG.
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from backend.offline.embeddings import HashingEmbeddings
+from backend.services.rag_service import RAGService
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """HashingEmbeddings que cuenta los textos embebidos al indexar."""
+
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.embedded_texts = []
+
+    def embed_documents(self, texts):
+        self.embedded_texts.extend(texts)
+        return super().embed_documents(texts)
+
+
+FAQS = [
+    {"patterns": "horario de atención", "response": "De 9 a 18 hs", "category": "horarios"},
+    {"patterns": "hacen envíos", "response": "Sí, a todo el país", "category": "envios"},
+    {"patterns": "medios de pago", "response": "Tarjeta y transferencia", "category": "pagos"},
+]
+
+
+def _write_kb(root, faqs):
+    data_dir = root / "backend" / "data" / "app"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        [{"text": "SneakerZone vende zapatillas originales", "category": "empresa"}]
+    ).to_csv(data_dir / "chunks.csv", index=False)
+    pd.DataFrame(faqs).to_csv(data_dir / "faqs.csv", index=False)
+
+
+@pytest.fixture
+def kb_dir(tmp_path, monkeypatch):
+    # RAGService lee los CSVs con rutas relativas al directorio de trabajo
+    monkeypatch.chdir(tmp_path)
+    _write_kb(tmp_path, FAQS)
+    return tmp_path
+
+
+def _service(kb_dir, backend, embeddings):
+    return RAGService(
+        embeddings=embeddings,
+        persist_directory=kb_dir / "index",
+        vector_backend=backend,
+        embedding_model="hashing-64",
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", ["chroma", "numpy"])
+class TestIncrementalIndexing:
+    """El reindexado solo embebe filas nuevas o editadas."""
+
+    def test_editing_one_faq_embeds_one_document(self, kb_dir, backend):
+        embeddings = CountingEmbeddings()
+        service = _service(kb_dir, backend, embeddings)
+        assert len(embeddings.embedded_texts) == 4
+
+        edited = [dict(FAQS[0], response="De 10 a 20 hs")] + FAQS[1:]
+        _write_kb(kb_dir, edited)
+        embeddings.embedded_texts.clear()
+        plan = service.sync_index()
+
+        assert len(embeddings.embedded_texts) == 1
+        assert "De 10 a 20 hs" in embeddings.embedded_texts[0]
+        assert len(plan.to_delete) == 1
+        assert plan.unchanged == 3
+        assert service.get_stats()["total_documents"] == 4
+
+    def test_removed_rows_are_deleted(self, kb_dir, backend):
+        embeddings = CountingEmbeddings()
+        service = _service(kb_dir, backend, embeddings)
+
+        _write_kb(kb_dir, FAQS[:1])
+        embeddings.embedded_texts.clear()
+        plan = service.sync_index()
+
+        assert embeddings.embedded_texts == []
+        assert len(plan.to_delete) == 2
+        assert service.get_stats()["total_documents"] == 2
+
+    def test_restart_without_changes_skips_indexing(self, kb_dir, backend):
+        _service(kb_dir, backend, CountingEmbeddings())
+
+        embeddings = CountingEmbeddings()
+        service = _service(kb_dir, backend, embeddings)
+
+        assert embeddings.embedded_texts == []
+        assert service.sync_index() is None
+        assert service.get_stats()["total_documents"] == 4
+
+    def test_model_change_reembeds_everything(self, kb_dir, backend):
+        _service(kb_dir, backend, CountingEmbeddings())
+
+        embeddings = CountingEmbeddings()
+        service = RAGService(
+            embeddings=embeddings,
+            persist_directory=kb_dir / "index",
+            vector_backend=backend,
+            embedding_model="hashing-64-v2",
+        )
+
+        assert len(embeddings.embedded_texts) == 4
+        assert service.get_stats()["total_documents"] == 4
+
+
+class FailingEmbeddings(CountingEmbeddings):
+    """Falla al indexar después de la primera construcción."""
+
+    fail = False
+
+    def embed_documents(self, texts):
+        if self.fail:
+            raise RuntimeError("Vertex AI no disponible")
+        return super().embed_documents(texts)
+
+
+def _edit_first_faq(kb_dir, response="De 10 a 20 hs"):
+    _write_kb(kb_dir, [dict(FAQS[0], response=response)] + FAQS[1:])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["chroma", "numpy"])
+class TestHotReload:
+    """Recarga RCU: el índice vigente sigue atendiendo mientras se arma el nuevo."""
+
+    async def test_searches_keep_working_during_reload(self, kb_dir, backend):
+        service = _service(kb_dir, backend, CountingEmbeddings())
+        _edit_first_faq(kb_dir)
+
+        async def search_loop():
+            counts = []
+            for _ in range(20):
+                counts.append(len(await service.search("horario de atención", k=2)))
+                await asyncio.sleep(0)
+            return counts
+
+        counts, plan = await asyncio.gather(search_loop(), service.reload_index())
+
+        assert all(count == 2 for count in counts)
+        assert len(plan.to_add) == 1
+        assert service.get_stats()["index_generation"] == 2
+        results = await service.search("horario de atención", k=1)
+        assert "De 10 a 20 hs" in results[0].content
+
+    async def test_failed_reload_keeps_current_index(self, kb_dir, backend):
+        embeddings = FailingEmbeddings()
+        service = _service(kb_dir, backend, embeddings)
+        generation = service.get_stats()["index_generation"]
+
+        _edit_first_faq(kb_dir)
+        embeddings.fail = True
+        with pytest.raises(RuntimeError):
+            await service.reload_index()
+
+        assert service.get_stats()["index_generation"] == generation
+        results = await service.search("horario de atención", k=1)
+        assert "De 9 a 18 hs" in results[0].content
+        if backend == "chroma":
+            # La colección a medio armar se descarta
+            assert len(service.vectorstore._client.list_collections()) == 1
+
+    async def test_old_index_retired_after_in_flight_searches(self, kb_dir, backend):
+        service = _service(kb_dir, backend, CountingEmbeddings())
+        old_generation = service.get_stats()["index_generation"]
+        service._in_flight[old_generation] += 1  # búsqueda en curso simulada
+
+        _edit_first_faq(kb_dir)
+        reload_task = asyncio.create_task(service.reload_index())
+        for _ in range(100):
+            if service.get_stats()["index_generation"] != old_generation:
+                break
+            await asyncio.sleep(0.05)
+        # Las búsquedas nuevas ya usan la generación publicada, la vieja sigue viva
+        assert service.get_stats()["index_generation"] == old_generation + 1
+        await asyncio.sleep(0.1)
+        assert not reload_task.done()
+
+        service._in_flight[old_generation] -= 1
+        await asyncio.wait_for(reload_task, timeout=2)
+        if backend == "chroma":
+            assert len(service.vectorstore._client.list_collections()) == 1
+
+    async def test_reload_after_restart_uses_active_collection(self, kb_dir, backend):
+        service = _service(kb_dir, backend, CountingEmbeddings())
+        _edit_first_faq(kb_dir)
+        await service.reload_index()
+
+        embeddings = CountingEmbeddings()
+        restarted = _service(kb_dir, backend, embeddings)
+
+        assert embeddings.embedded_texts == []
+        results = await restarted.search("horario de atención", k=1)
+        assert "De 10 a 20 hs" in results[0].content
@@ -5,9 +5,11 @@ import uuid
 from decimal import Decimal
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database.models import ProductStock
+from backend.domain.product_schemas import ProductSearchFilters
 from backend.services.product_service import ProductService
 
 
@@ -212,3 +214,177 @@ class TestProductServiceProcessOrder:
         # Verificar que se creó el pedido (si la función lo soporta)
         if "order_id" in result:
             assert result["order_id"] is not None
+
+
+class _FakeResult:
+    def __init__(self, products):
+        self._products = products
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._products
+
+
+class _FakeSession:
+    """Sesión que falla con ProgrammingError si la query usa `fail_on` (base sin migrar)."""
+
+    def __init__(self, log, fail_on="search_vector"):
+        self.log = log
+        self.fail_on = fail_on
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query):
+        from sqlalchemy.exc import ProgrammingError
+
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        self.log.append(sql)
+        if self.fail_on in sql:
+            raise ProgrammingError(sql, {}, Exception(f"{self.fail_on} does not exist"))
+        return _FakeResult(["producto"])
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestProductServiceFullTextSearch:
+    """Tests para la búsqueda full-text (sin base de datos)."""
+
+    def test_fulltext_query_ranks_prefix_terms(self):
+        query = ProductService._fulltext_query("Zapatillas Nike Air!")
+        compiled = query.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        assert "product_stocks.search_vector @@ to_tsquery" in sql
+        assert "ORDER BY ts_rank(" in sql
+        assert "zapatillas:* | nike:* | air:*" in compiled.params.values()
+
+    def test_fulltext_query_without_terms(self):
+        assert ProductService._fulltext_query("¿?") is None
+
+    async def test_falls_back_to_ilike_when_not_migrated(self):
+        log = []
+        service = ProductService(lambda: _FakeSession(log), search_mode="fts")
+
+        assert await service.search_by_name("Nike Air") == ["producto"]
+        assert service.search_mode == "ilike"
+        assert "search_vector" in log[0] and "ILIKE" in log[1]
+
+        # Las búsquedas siguientes van directo a ILIKE
+        await service.search_by_name("Adidas")
+        assert len(log) == 3 and "ILIKE" in log[2]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestProductServiceFuzzySearch:
+    """Tests para la búsqueda difusa con pg_trgm (sin base de datos)."""
+
+    def test_fuzzy_query_ranks_by_word_similarity(self):
+        query = ProductService._fuzzy_query("  Nyke  Pegasus ")
+        compiled = query.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        assert sql.count("<%") == 2
+        assert "product_stocks.brand" in sql
+        assert "ORDER BY greatest(word_similarity(" in sql
+        assert "nyke pegasus" in compiled.params.values()
+
+    def test_fuzzy_query_without_terms(self):
+        assert ProductService._fuzzy_query("   ") is None
+
+    async def test_sets_threshold_before_searching(self):
+        log = []
+        service = ProductService(lambda: _FakeSession(log), fuzzy_threshold=0.4)
+
+        assert await service.search_fuzzy("addidas") == ["producto"]
+        assert "set_config" in log[0] and "<%" in log[1]
+
+    async def test_disabled_when_pg_trgm_missing(self):
+        log = []
+        service = ProductService(lambda: _FakeSession(log, fail_on="<%"))
+
+        assert await service.search_fuzzy("addidas") == []
+        assert service.fuzzy_search is False
+
+        # Sin la extensión no se vuelve a consultar
+        assert await service.search_fuzzy("nyke") == []
+        assert len(log) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestProductServiceSearchTerms:
+    """Tests para la búsqueda multi-término en una sola consulta (sin base de datos)."""
+
+    def test_fulltext_query_counts_term_hits(self):
+        query = ProductService._scored_fulltext_query(["Nike", "air-max", "¿?"])
+        compiled = query.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        assert "ORDER BY" in sql and sql.count("CASE WHEN") == 2
+        assert "(nike:*) | (air:* & max:*)" in compiled.params.values()
+        assert "air:* & max:*" in compiled.params.values()
+
+    def test_ilike_query_weights_fields(self):
+        query = ProductService._scored_ilike_query(["nike", "running"])
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        # Un CASE por término (¿coincide?) y uno por término y campo (¿dónde?)
+        assert sql.count("CASE WHEN") == 2 + 2 * 4
+        assert "product_stocks.category ILIKE" in sql
+
+    def test_filters_are_applied(self):
+        filters = ProductSearchFilters(
+            brand="Nike", max_price=Decimal("120"), in_stock_only=True
+        )
+        query = ProductService._scored_ilike_query(["air"], filters, limit=5)
+        compiled = query.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        # Se compara el precio final (con descuentos), no unit_cost
+        assert "greatest(" in sql and "END <=" in sql
+        assert "product_stocks.unit_cost <=" not in sql
+        assert "product_stocks.quantity_available >" in sql
+        assert "Nike" in compiled.params.values()
+
+    def test_parsed_filters_without_terms(self):
+        filters = ProductSearchFilters(
+            brands=["Nike", "New Balance"], color="negro", max_price=Decimal("100")
+        )
+        query = ProductService._scored_ilike_query([], filters)
+        compiled = query.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        assert "lower(public.product_stocks.brand) IN" in sql
+        # Sin CASE de score por término; el único es el del precio final
+        assert sql.count("CASE WHEN") == 1
+        # Alias como palabra completa y código solo como sufijo del SKU
+        assert "product_stocks.product_name ~*" in sql
+        assert r"\mblack\M" in compiled.params.values()
+        assert "%-BLK" in compiled.params.values()
+        assert "%blk%" not in compiled.params.values()
+        assert ["nike", "new balance"] in compiled.params.values()
+
+    async def test_single_query_with_ilike_fallback(self):
+        log = []
+        service = ProductService(lambda: _FakeSession(log), search_mode="fts")
+
+        assert await service.search_terms(["zapatillas", "nike", "air"]) == ["producto"]
+        assert len(log) == 2 and "ILIKE" in log[1]
+        assert service.search_mode == "ilike"
+
+    async def test_empty_terms_skip_database(self):
+        log = []
+        service = ProductService(lambda: _FakeSession(log))
+
+        assert await service.search_terms(["", "  "]) == []
+        assert log == []
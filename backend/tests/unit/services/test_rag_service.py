@@ -0,0 +1,249 @@
+"""
+Tests unitarios para la búsqueda no bloqueante de RAGService.
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.offline.embeddings import HashingEmbeddings
+from backend.services.embedding_cache import EmbeddingCache
+from backend.services.rag_service import RAGService
+
+
+class SlowVectorstore:
+    """Vectorstore síncrono y lento (como Chroma bajo carga)."""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    def similarity_search_by_vector_with_relevance_scores(self, embedding, k=3):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        self.active -= 1
+        return []
+
+
+@pytest.fixture(scope="module")
+def rag_service(tmp_path_factory):
+    return RAGService(
+        embeddings=HashingEmbeddings(),
+        persist_directory=tmp_path_factory.mktemp("chromadb"),
+        max_concurrency=2,
+        search_workers=4,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRAGServiceSearch:
+    """Tests para la búsqueda async con métricas por fase."""
+
+    async def test_search_returns_results_and_records_phases(self, rag_service):
+        results = await rag_service.search("hacen envíos a domicilio?", k=2)
+        assert len(results) == 2
+        assert all(0 < r.relevance_score <= 1 for r in results)
+        assert all(r.score_method == "vector" for r in results)
+
+        latency = rag_service.get_stats()["latency"]
+        assert latency["embed"]["count"] >= 1
+        assert latency["search"]["count"] >= 1
+
+    async def test_search_does_not_block_event_loop(self, rag_service, monkeypatch):
+        monkeypatch.setattr(rag_service, "vectorstore", SlowVectorstore(delay=0.2))
+        gaps = []
+
+        async def ticker():
+            loop = asyncio.get_running_loop()
+            last = loop.time()
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                gaps.append(loop.time() - last)
+                last = loop.time()
+
+        await asyncio.gather(rag_service.search("garantía"), ticker())
+        # Si la consulta bloqueara el loop, un tick tardaría ~200ms
+        assert max(gaps) < 0.1
+
+    async def test_concurrency_is_bounded(self, rag_service, monkeypatch):
+        store = SlowVectorstore(delay=0.05)
+        monkeypatch.setattr(rag_service, "vectorstore", store)
+        await asyncio.gather(*[rag_service.search(f"consulta {i}") for i in range(6)])
+        assert store.peak == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_repeated_queries_skip_embedding(tmp_path):
+    class CountingEmbeddings(HashingEmbeddings):
+        calls = 0
+
+        async def aembed_query(self, text):
+            CountingEmbeddings.calls += 1
+            return await super().aembed_query(text)
+
+    rag = RAGService(
+        embeddings=CountingEmbeddings(),
+        persist_directory=tmp_path,
+        embedding_cache=EmbeddingCache(model_id="hashing-768"),
+    )
+    first = await rag.search("horario de atención", k=1)
+    second = await rag.search("Horario de atencion?", k=1)
+    assert CountingEmbeddings.calls == 1
+    assert first[0].content == second[0].content
+    assert rag.get_stats()["embedding_cache"]["memory_hits"] == 1
+
+
+class CountingQueryEmbeddings(HashingEmbeddings):
+    """HashingEmbeddings que cuenta los embeddings de queries."""
+
+    def __init__(self):
+        super().__init__()
+        self.queries = 0
+
+    async def aembed_query(self, text):
+        self.queries += 1
+        return await super().aembed_query(text)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRAGServiceHybridSearch:
+    """Tests para la recuperación híbrida BM25 + vectores."""
+
+    @pytest.fixture
+    def hybrid_service(self, tmp_path):
+        return RAGService(
+            embeddings=CountingQueryEmbeddings(),
+            persist_directory=tmp_path,
+            vector_backend="numpy",
+            search_mode="hybrid",
+        )
+
+    async def test_conclusive_lexical_match_skips_embedding(self, hybrid_service):
+        results = await hybrid_service.search("horario de atención", k=2)
+
+        assert results[0].category == "hours"
+        assert results[0].score_method == "lexical"
+        assert 0 < results[0].relevance_score <= 1
+        assert hybrid_service.embeddings.queries == 0
+        assert hybrid_service.get_stats()["lexical_fast_path"] == 1
+
+    async def test_ambiguous_query_fuses_with_vectors(self, hybrid_service):
+        results = await hybrid_service.search("hacen envíos a Quito?", k=3)
+
+        assert len(results) == 3
+        assert hybrid_service.embeddings.queries == 1
+        assert hybrid_service.get_stats()["hybrid_searches"] == 1
+        assert {r.category for r in results} & {"delivery", "delivery_online"}
+        # Un solo score normalizado (RRF / máximo), no distancias ni BM25 crudos
+        assert all(r.score_method == "hybrid" for r in results)
+        assert all(0 < r.relevance_score <= 1 for r in results)
+        scores = [r.relevance_score for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRAGServiceFAQLookup:
+    """Tests para el lookup directo de FAQs."""
+
+    async def test_match_faq_answers_without_embedding(self, tmp_path):
+        embeddings = CountingQueryEmbeddings()
+        service = RAGService(
+            embeddings=embeddings, persist_directory=tmp_path, vector_backend="numpy"
+        )
+
+        match = service.match_faq("¿Cuál es su horario de atención?")
+
+        assert match.category == "hours"
+        assert match.response
+        assert embeddings.queries == 0
+        assert service.match_faq("precio de las jordan 4") is None
+        assert service.get_stats()["faq_matcher"]["hits"] == 1
+
+    async def test_faq_results_carry_canonical_response(self, rag_service):
+        results = await rag_service.search("formas de pago con tarjeta", k=3)
+        faq_results = [r for r in results if r.source == "faqs"]
+        assert faq_results
+        assert all(r.response and "Respuesta:" not in r.response for r in faq_results)
+
+
+class FlakyEmbeddings(HashingEmbeddings):
+    """Falla la primera vez que se indexa (como un corte de Vertex AI)."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    def embed_documents(self, texts):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("503 Service Unavailable")
+        return super().embed_documents(texts)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRAGServiceBackgroundInit:
+    """Tests para la inicialización en segundo plano."""
+
+    async def test_not_ready_until_index_is_built(self, tmp_path):
+        service = RAGService(
+            embeddings=HashingEmbeddings(),
+            persist_directory=tmp_path,
+            vector_backend="numpy",
+            background_init=True,
+        )
+
+        assert service.readiness()["ready"] is False
+        assert await service.search("hacen envíos?") == []
+        # El lookup léxico de FAQs ya responde
+        assert service.match_faq("horario de atención").category == "hours"
+
+        await service.start_background_init()
+
+        readiness = service.readiness()
+        assert readiness["ready"] is True
+        assert readiness["startup_ms"] > 0
+        assert len(await service.search("hacen envíos?", k=2)) == 2
+
+    async def test_failed_init_is_retried(self, tmp_path):
+        service = RAGService(
+            embeddings=FlakyEmbeddings(),
+            persist_directory=tmp_path,
+            vector_backend="numpy",
+            background_init=True,
+        )
+
+        task = service.start_background_init(retry_delay=0.05)
+        for _ in range(40):
+            if service.init_error:
+                break
+            await asyncio.sleep(0.01)
+        assert not service.ready
+        assert "503" in service.readiness()["error"]
+
+        await asyncio.wait_for(task, timeout=5)
+        assert service.ready
+        assert service.readiness()["error"] is None
+
+    async def test_stop_cancels_background_tasks(self, tmp_path):
+        embeddings = FlakyEmbeddings()
+        embeddings.failures = 100
+        service = RAGService(
+            embeddings=embeddings,
+            persist_directory=tmp_path,
+            vector_backend="numpy",
+            background_init=True,
+        )
+        init_task = service.start_background_init(retry_delay=0.05)
+        watch_task = service.start_watching(interval=60)
+
+        await service.stop()
+
+        assert init_task.cancelled() and watch_task.cancelled()
+        assert not service.ready
@@ -0,0 +1,88 @@
+"""
+Tests unitarios para VectorIndex y el backend NumPy de RAGService.
+"""
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from backend.offline.embeddings import HashingEmbeddings
+from backend.services.rag_service import RAGService
+from backend.services.vector_index import VectorIndex
+
+
+def _random_index(n=50, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim))
+    documents = [Document(page_content=f"doc {i}", metadata={"i": i}) for i in range(n)]
+    return VectorIndex.from_vectors(vectors, documents), vectors
+
+
+@pytest.mark.unit
+class TestVectorIndex:
+    """Tests para el top-k y la persistencia."""
+
+    def test_top_k_matches_brute_force(self):
+        index, vectors = _random_index()
+        query = np.random.default_rng(1).normal(size=16)
+
+        results = index.search(query, k=5)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [doc.metadata["i"] for doc, _ in results] == expected.tolist()
+        distances = [score for _, score in results]
+        assert distances == sorted(distances)
+
+    def test_distance_is_squared_l2_of_unit_vectors(self):
+        docs = [Document(page_content="a"), Document(page_content="b")]
+        index = VectorIndex.from_vectors([[1.0, 0.0], [0.0, 1.0]], docs)
+        (best, d_best), (other, d_other) = index.search([2.0, 0.0], k=5)
+        assert best.page_content == "a"
+        assert d_best == pytest.approx(0.0)
+        assert d_other == pytest.approx(2.0)
+
+    def test_save_and_load_with_mmap(self, tmp_path):
+        index, _ = _random_index()
+        index.save(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path)
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.vectors.dtype == np.float32
+        query = np.ones(16)
+        assert [d.metadata for d, _ in loaded.search(query, 3)] == [
+            d.metadata for d, _ in index.search(query, 3)
+        ]
+
+    def test_load_missing_returns_none(self, tmp_path):
+        assert VectorIndex.load(tmp_path / "nada") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_numpy_backend_matches_chroma(tmp_path):
+    embeddings = HashingEmbeddings()
+    chroma = RAGService(embeddings=embeddings, persist_directory=tmp_path)
+    # Reutiliza los vectores de Chroma (sin volver a embeber)
+    numpy_rag = RAGService(
+        embeddings=embeddings, persist_directory=tmp_path, vector_backend="numpy"
+    )
+    assert numpy_rag.get_stats()["vectorstore"] == "NumPy"
+    assert numpy_rag.get_stats()["total_documents"] == chroma.get_stats()["total_documents"]
+
+    for query in ("hacen envíos?", "política de devoluciones", "horario de atención"):
+        expected = await chroma.search(query, k=3)
+        results = await numpy_rag.search(query, k=3)
+        assert [r.content for r in results] == [r.content for r in expected]
+        assert [r.relevance_score for r in results] == pytest.approx(
+            [r.relevance_score for r in expected], abs=0.01
+        )
+
+
+@pytest.mark.unit
+def test_numpy_backend_builds_and_persists_from_csvs(tmp_path):
+    rag = RAGService(
+        embeddings=HashingEmbeddings(), persist_directory=tmp_path, vector_backend="numpy"
+    )
+    assert rag.vectorstore is None
+    assert (tmp_path / "numpy_index" / "vectors.npy").exists()
+    assert rag.get_stats()["total_documents"] > 0
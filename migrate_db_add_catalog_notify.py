@@ -0,0 +1,70 @@
+"""
+Script de migración para el catálogo en memoria (PRODUCT_CATALOG_ENGINE).
+
+Este script agrega:
+- Función notify_product_stocks_changed(): pg_notify con el id de la fila
+- Trigger AFTER INSERT/UPDATE/DELETE sobre product_stocks
+
+CatalogSearchEngine escucha el canal y recarga solo los productos
+modificados (stock, precio, promociones). Sin esta migración el catálogo se
+mantiene al día igual, por polling.
+
+Ejecutar: python migrate_db_add_catalog_notify.py
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.config import get_business_settings
+from backend.services.catalog_search import CATALOG_CHANNEL
+
+
+MIGRATION_STATEMENTS = [
+    f"""
+    CREATE OR REPLACE FUNCTION public.notify_product_stocks_changed()
+    RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('{CATALOG_CHANNEL}', COALESCE(NEW.id, OLD.id)::text);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS product_stocks_changed ON public.product_stocks",
+    """
+    CREATE TRIGGER product_stocks_changed
+    AFTER INSERT OR UPDATE OR DELETE ON public.product_stocks
+    FOR EACH ROW EXECUTE FUNCTION public.notify_product_stocks_changed()
+    """,
+]
+
+
+async def migrate():
+    """Crea la función y el trigger de notificación."""
+
+    settings = get_business_settings()
+    engine = create_async_engine(str(settings.pg_url), echo=False)
+
+    async with engine.begin() as conn:
+        for statement in MIGRATION_STATEMENTS:
+            await conn.execute(text(statement))
+            print(f"✅ {' '.join(statement.split())[:70]}...")
+
+    # Verificación: el trigger quedó registrado
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("""
+                SELECT tgname FROM pg_trigger
+                WHERE tgrelid = 'public.product_stocks'::regclass
+                  AND tgname = 'product_stocks_changed'
+            """)
+        )
+        print(f"\n📋 Trigger registrado: {result.scalar() is not None}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando migración de notificaciones de catálogo...")
+    asyncio.run(migrate())
+    print("✅ Migración completada")
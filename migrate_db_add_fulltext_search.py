@@ -0,0 +1,97 @@
+"""
+Script de migración para la búsqueda full-text de productos.
+
+Este script agrega:
+- Extensión unaccent y la configuración de texto public.spanish_unaccent
+  (stemming en español + sin tildes: "Zapatillas Básicas" ≈ "zapatilla basica")
+- Columna generada search_vector (tsvector) sobre nombre, marca, categoría y SKU
+- Índice GIN sobre search_vector
+
+ProductService.search_by_name la usa automáticamente (ordenando por ts_rank);
+sin esta migración sigue funcionando con ILIKE.
+
+Ejecutar: python migrate_db_add_fulltext_search.py
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.config import get_business_settings
+from backend.services.product_service import FTS_CONFIG
+
+
+# Cada sentencia va por separado: el bloque DO contiene ';'
+MIGRATION_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() no es IMMUTABLE y no puede ir en una columna generada;
+    # como diccionario dentro de una configuración de texto sí
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_ts_config c
+            JOIN pg_namespace n ON n.oid = c.cfgnamespace
+            WHERE n.nspname || '.' || c.cfgname = '{FTS_CONFIG}'
+        ) THEN
+            CREATE TEXT SEARCH CONFIGURATION {FTS_CONFIG} (COPY = pg_catalog.spanish);
+            ALTER TEXT SEARCH CONFIGURATION {FTS_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word
+                WITH public.unaccent, pg_catalog.spanish_stem;
+        END IF;
+    END
+    $$
+    """,
+    # Nombre y marca pesan más que categoría, y categoría más que SKU
+    f"""
+    ALTER TABLE public.product_stocks
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{FTS_CONFIG}', coalesce(product_name, '')), 'A') ||
+        setweight(to_tsvector('{FTS_CONFIG}', coalesce(brand, '')), 'A') ||
+        setweight(to_tsvector('{FTS_CONFIG}', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('{FTS_CONFIG}', coalesce(product_sku, '')), 'C')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_product_stocks_search_vector
+    ON public.product_stocks USING GIN (search_vector)
+    """,
+]
+
+
+async def migrate():
+    """Crea la columna search_vector y su índice GIN."""
+
+    settings = get_business_settings()
+    engine = create_async_engine(str(settings.pg_url), echo=False)
+
+    async with engine.begin() as conn:
+        for statement in MIGRATION_STATEMENTS:
+            await conn.execute(text(statement))
+            print(f"✅ {' '.join(statement.split())[:70]}...")
+
+    # Verificación: una búsqueda con ranking
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(f"""
+                SELECT product_name,
+                       ts_rank(search_vector, to_tsquery('{FTS_CONFIG}', 'zapatilla:* | nike:*')) AS rank
+                FROM public.product_stocks
+                WHERE search_vector @@ to_tsquery('{FTS_CONFIG}', 'zapatilla:* | nike:*')
+                ORDER BY rank DESC
+                LIMIT 5
+            """)
+        )
+        rows = result.fetchall()
+        print(f"\n📋 Prueba 'zapatilla | nike': {len(rows)} resultados")
+        for row in rows:
+            print(f"   - {row.product_name} (rank {row.rank:.3f})")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando migración de búsqueda full-text...")
+    asyncio.run(migrate())
+    print("✅ Migración completada")
@@ -0,0 +1,69 @@
+"""
+Script de migración para la búsqueda difusa de productos (pg_trgm).
+
+Este script agrega:
+- Extensión pg_trgm (similitud por trigramas)
+- Índices GIN gin_trgm_ops sobre product_name y brand
+
+ProductService.search_fuzzy la usa cuando la búsqueda normal no encuentra
+nada ("addidas", "nyke pegasus"); sin esta migración simplemente retorna [].
+
+Ejecutar: python migrate_db_add_trigram_search.py
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.config import get_business_settings
+
+
+MIGRATION_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS idx_product_stocks_name_trgm
+    ON public.product_stocks USING GIN (product_name gin_trgm_ops)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_product_stocks_brand_trgm
+    ON public.product_stocks USING GIN (brand gin_trgm_ops)
+    """,
+]
+
+
+async def migrate():
+    """Instala pg_trgm y crea los índices de trigramas."""
+
+    settings = get_business_settings()
+    engine = create_async_engine(str(settings.pg_url), echo=False)
+
+    async with engine.begin() as conn:
+        for statement in MIGRATION_STATEMENTS:
+            await conn.execute(text(statement))
+            print(f"✅ {' '.join(statement.split())[:70]}...")
+
+    # Verificación: una marca mal escrita
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("""
+                SELECT product_name, brand,
+                       GREATEST(word_similarity('nyke', product_name),
+                                word_similarity('nyke', brand)) AS score
+                FROM public.product_stocks
+                WHERE 'nyke' <% product_name OR 'nyke' <% brand
+                ORDER BY score DESC
+                LIMIT 5
+            """)
+        )
+        rows = result.fetchall()
+        print(f"\n📋 Prueba 'nyke': {len(rows)} resultados")
+        for row in rows:
+            print(f"   - {row.product_name} [{row.brand}] (similitud {row.score:.2f})")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando migración de búsqueda difusa (pg_trgm)...")
+    asyncio.run(migrate())
+    print("✅ Migración completada")
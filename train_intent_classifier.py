@@ -0,0 +1,97 @@
+"""
+Entrena y exporta el clasificador de intención local.
+
+Usa como datos los mensajes USER de chat_history cuya intención ya fue
+etiquetada por el LLM (metadata_json con intent / intent_source), y exporta
+un artefacto versionado que el orquestador carga al arrancar.
+
+Ejecutar con:
+    python train_intent_classifier.py
+    python train_intent_classifier.py --min-confidence 0.8 --output-dir backend/data/models
+"""
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.config import get_business_settings
+from backend.nlp.intent_model import IntentSample, train_intent_classifier
+from backend.nlp.lexicon import normalize_text
+
+# Solo se confía en etiquetas producidas por el LLM (no keywords ni el propio modelo)
+TRUSTED_SOURCES = {"llm", "turn_analysis"}
+VALID_INTENTS = {"search", "persuasion", "checkout", "info"}
+
+
+async def load_samples(min_confidence: float) -> list[IntentSample]:
+    """Lee los mensajes etiquetados desde PostgreSQL."""
+    settings = get_business_settings()
+    engine = create_async_engine(str(settings.pg_url))
+
+    async with engine.connect() as conn:
+        result = await conn.execute(text(
+            """
+            SELECT message, metadata_json
+            FROM public.chat_history
+            WHERE role = 'USER' AND metadata_json IS NOT NULL
+            """
+        ))
+        rows = result.fetchall()
+    await engine.dispose()
+
+    samples: list[IntentSample] = []
+    seen: set[tuple[str, bool]] = set()
+    for message, metadata_json in rows:
+        try:
+            metadata = json.loads(metadata_json)
+        except (TypeError, json.JSONDecodeError):
+            continue
+
+        intent = metadata.get("intent")
+        if intent not in VALID_INTENTS:
+            continue
+        if metadata.get("intent_source") not in TRUSTED_SOURCES:
+            continue
+        if float(metadata.get("intent_confidence") or 0.0) < min_confidence:
+            continue
+
+        has_results = bool(metadata.get("had_search_results"))
+        key = (normalize_text(message), has_results)
+        if not key[0] or key in seen:
+            continue
+        seen.add(key)
+        samples.append(IntentSample(text=message, intent=intent, has_search_results=has_results))
+
+    return samples
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Entrena el clasificador de intención local")
+    parser.add_argument("--min-confidence", type=float, default=0.7)
+    parser.add_argument("--min-samples", type=int, default=50)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--output-dir", default=get_business_settings().intent_model_path)
+    args = parser.parse_args()
+
+    samples = await load_samples(args.min_confidence)
+    print(f"📚 {len(samples)} ejemplos etiquetados encontrados")
+    if len(samples) < args.min_samples:
+        print(f"⚠️  Se necesitan al menos {args.min_samples} ejemplos, no se exporta modelo")
+        return
+
+    model, report = train_intent_classifier(samples, test_size=args.test_size)
+    print(f"📊 Distribución: {report['label_distribution']}")
+    if "holdout_accuracy" in report:
+        print(
+            f"📊 Accuracy hold-out: {report['holdout_accuracy']:.2%} "
+            f"({report['holdout_samples']} ejemplos)"
+        )
+
+    path = model.save(args.output_dir)
+    print(f"✅ Modelo v{model.version} exportado en {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())